@@ -0,0 +1,3 @@
+"""
+Benchmarks da Árvore Rubro-Negra. Cada módulo pode ser executado a partir da raiz do projeto com 'python -m benchmarks.<módulo>'.
+"""
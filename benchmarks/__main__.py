@@ -0,0 +1,47 @@
+"""
+Benchmark reproduzível das operações da Árvore Rubro-Negra.
+
+Mede a vazão e as latências p50/p99 de inserção, remoção, busca e varredura de intervalo, além do pico de memória
+da construção, para as distribuições random, sorted, reverse, zipfian e churn (inserções e remoções intercaladas),
+comparando a RedBlackTree com a CompactRedBlackTree, uma lista ordenada com bisect e um dict.
+
+Uso:
+    python -m benchmarks run --sizes 1000 10000 100000 --output resultados.json
+    python -m benchmarks compare antes.json depois.json
+"""
+import argparse  # Importa o argparse para ler os argumentos da linha de comando
+
+from .suite import compare, run  # Importa a execução e a comparação dos resultados
+from .workloads import DISTRIBUTIONS, TARGETS  # Importa as distribuições e as estruturas disponíveis
+
+
+def main(argv=None):
+    """
+    Lê os argumentos da linha de comando e executa o subcomando pedido.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="executa os cenários e grava os resultados")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                            help="quantidades de chaves (de 1e3 a 1e7)")
+    run_parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS),
+                            help="distribuições de chaves")
+    run_parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS),
+                            help="estruturas comparadas")
+    run_parser.add_argument("--seed", type=int, default=0, help="semente do gerador de chaves")
+    run_parser.add_argument("--max-queries", type=int, default=100_000, help="número máximo de buscas por cenário")
+    run_parser.add_argument("--no-memory", action="store_true", help="não mede o pico de memória (mais rápido)")
+    run_parser.add_argument("--output", help="arquivo JSON onde os resultados serão gravados")
+    compare_parser = commands.add_parser("compare", help="compara dois arquivos de resultados")
+    compare_parser.add_argument("old", help="resultados de referência")
+    compare_parser.add_argument("new", help="resultados novos")
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args.old, args.new)
+
+
+if __name__ == "__main__":
+    main()
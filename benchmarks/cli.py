@@ -0,0 +1,92 @@
+"""
+Mede o tempo de importação de main.py e a vazão do modo de script (python main.py --script), em operações por
+segundo, para scripts gerados com inserções, remoções, buscas e varreduras de intervalo.
+
+Uso: python -m benchmarks.cli --lines 1000000 [--repeat 5] [--output resultados.json]
+"""
+import argparse  # Importa o argparse para ler os argumentos da linha de comando
+import json  # Importa o json para gravar os resultados
+import os  # Importa o os para localizar main.py
+import random  # Importa o random para gerar as operações
+import statistics  # Importa o statistics para a mediana dos tempos de importação
+import subprocess  # Importa o subprocess para executar o Python em processos novos
+import sys  # Importa o sys para localizar o interpretador
+import tempfile  # Importa o tempfile para criar o arquivo de operações
+import time  # Importa o time para medir os tempos
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Raiz do projeto, onde está main.py
+IMPORT_PROBE = ("import sys, time; start = time.perf_counter(); import main; "
+                "print(time.perf_counter() - start, 'matplotlib' in sys.modules)")  # Mede a importação em um processo novo
+
+
+def import_time(repeat):
+    """
+    Retorna a mediana do tempo de 'import main' em 'repeat' processos novos e se o Matplotlib foi importado.
+    """
+    times = []  # Tempo de cada importação
+    loaded = False  # Indica se alguma importação carregou o Matplotlib
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+        elapsed, matplotlib = output.stdout.split()
+        times.append(float(elapsed))
+        loaded = loaded or matplotlib == "True"
+    return statistics.median(times), loaded
+
+
+def write_script(path, lines, seed=0):
+    """
+    Grava em 'path' um script com 'lines' operações: 50% de inserções, 20% de remoções, 25% de buscas
+    e 5% de varreduras de intervalos curtos, sobre chaves aleatórias.
+    """
+    rng = random.Random(seed)  # Gerador com semente fixa, para resultados reproduzíveis
+    universe = max(lines, 10)  # Intervalo das chaves
+    with open(path, "w") as f:
+        for _ in range(lines):
+            r = rng.random()
+            key = rng.randrange(universe)
+            if r < 0.50:
+                f.write(f"insert {key}\n")
+            elif r < 0.70:
+                f.write(f"remove {key}\n")
+            elif r < 0.95:
+                f.write(f"search {key}\n")
+            else:
+                f.write(f"range {key} {key + 20}\n")
+
+
+def script_time(path):
+    """
+    Executa 'python main.py --script path' com a saída descartada e retorna o tempo total, incluindo a inicialização.
+    """
+    start = time.perf_counter()  # Marca o início
+    subprocess.run([sys.executable, "main.py", "--script", path], cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start  # Retorna o tempo gasto
+
+
+def main(argv=None):
+    """
+    Executa as medições e imprime (ou grava) os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1_000_000], help="quantidades de operações dos scripts")
+    parser.add_argument("--repeat", type=int, default=5, help="quantidade de importações medidas")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador de operações")
+    parser.add_argument("--output", help="arquivo JSON onde os resultados serão gravados")
+    args = parser.parse_args(argv)
+    elapsed, loaded = import_time(args.repeat)  # Tempo de importação
+    print(f"import main: {elapsed * 1000:.1f} ms  (Matplotlib importado: {loaded})")
+    results = {"import_s": elapsed, "import_loads_matplotlib": loaded, "scripts": []}
+    with tempfile.TemporaryDirectory() as directory:  # Diretório temporário para os scripts
+        for lines in args.lines:
+            path = os.path.join(directory, f"ops-{lines}.txt")
+            write_script(path, lines, args.seed)
+            seconds = script_time(path)
+            results["scripts"].append({"lines": lines, "seconds": seconds, "ops_per_s": lines / seconds})
+            print(f"script com {lines:>9} linhas: {seconds:.2f}s  ({lines / seconds:,.0f} operações/s)")
+    if args.output:  # Grava os resultados em JSON, se solicitado
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Mede a vazão de leituras concorrentes durante escritas contínuas, variando a quantidade de threads leitoras.
+Compara a ConcurrentRedBlackTree, cujas leituras usam snapshots sem trava, com uma RedBlackTree protegida por
+uma trava global, em que cada leitura espera as escritas em andamento.
+
+No CPython com GIL as threads não executam bytecode em paralelo, então a vazão total não cresce com o número de
+leitoras; o benchmark mostra quanto as leituras deixam de esperar as escritas. Em um interpretador sem GIL
+(free-threaded), as leituras sobre snapshots também escalam com os núcleos.
+
+Uso: python -m benchmarks.concurrency --size 100000 --readers 1 2 4 8 --writers 1 --duration 2 [--output resultados.json]
+"""
+import argparse  # Importa o argparse para ler os argumentos da linha de comando
+import json  # Importa o json para gravar os resultados
+import random  # Importa o random para gerar as chaves
+import threading  # Importa o threading para as threads leitoras e escritoras
+import time  # Importa o time para medir a duração
+
+from main import ConcurrentRedBlackTree, RedBlackTree  # Importa as árvores a serem medidas
+
+
+class LockedTree:
+    """
+    RedBlackTree protegida por uma trava global, como um serviço faria sem o modo concorrente.
+    """
+
+    def __init__(self, keys):
+        self.tree = RedBlackTree.from_iterable(keys)  # Árvore compartilhada
+        self.lock = threading.Lock()  # Trava usada por leituras e escritas
+
+    def read(self, key, span):
+        with self.lock:  # A leitura espera as escritas em andamento
+            found = self.tree.search(key) != self.tree.nil
+            return found, sum(1 for _ in self.tree.iter_range(key, key + span))
+
+    def insert(self, key):
+        with self.lock:
+            if self.tree.search(key) == self.tree.nil:
+                self.tree._insert_key(key)
+
+    def remove(self, key):
+        with self.lock:
+            self.tree.remove(key)
+
+
+class SnapshotTree:
+    """
+    ConcurrentRedBlackTree com leituras sobre snapshots, sem trava.
+    """
+
+    def __init__(self, keys):
+        self.tree = ConcurrentRedBlackTree.from_iterable(keys)  # Árvore compartilhada
+
+    def read(self, key, span):
+        snapshot = self.tree.snapshot()  # Versão imutável, obtida sem trava
+        return key in snapshot, sum(1 for _ in snapshot.iter_range(key, key + span))
+
+    def insert(self, key):
+        self.tree.insert(key)
+
+    def remove(self, key):
+        self.tree.remove(key)
+
+
+TARGETS = {"snapshot": SnapshotTree, "locked": LockedTree}  # Implementações comparadas
+
+
+def run(target, size, readers, writers, duration, span, seed=0):
+    """
+    Executa 'readers' threads leitoras (uma busca e uma varredura de 'span' chaves por leitura) e 'writers' threads
+    escritoras (inserções e remoções alternadas) sobre 'size' chaves durante 'duration' segundos.
+    """
+    keys = list(range(0, 2 * size, 2))  # Chaves pares, sempre presentes
+    tree = TARGETS[target](keys)  # Árvore compartilhada
+    stop = threading.Event()  # Sinaliza o fim da medição
+    reads = [0] * readers  # Leituras feitas por cada leitora
+    writes = [0] * writers  # Escritas feitas por cada escritora
+
+    def reader(i):
+        rng = random.Random(seed + i)  # Gerador próprio de cada thread
+        n = 0
+        while not stop.is_set():
+            tree.read(rng.randrange(2 * size), span)
+            n += 1
+        reads[i] = n
+
+    def writer(i):
+        rng = random.Random(seed - 1 - i)  # Gerador próprio de cada thread
+        n = 0
+        while not stop.is_set():
+            key = rng.randrange(1, 2 * size, 2)  # As escritas alteram apenas as chaves ímpares
+            if n % 2 == 0:
+                tree.insert(key)
+            else:
+                tree.remove(key)
+            n += 1
+        writes[i] = n
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)  # Mede durante o tempo informado
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "target": target,
+        "size": size,
+        "readers": readers,
+        "writers": writers,
+        "reads_per_s": sum(reads) / duration,
+        "writes_per_s": sum(writes) / duration,
+    }
+
+
+def main(argv=None):
+    """
+    Executa o benchmark para cada implementação e quantidade de leitoras e imprime (ou grava) os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="quantidade de chaves")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8], help="quantidades de threads leitoras")
+    parser.add_argument("--writers", type=int, default=1, help="quantidade de threads escritoras")
+    parser.add_argument("--duration", type=float, default=2.0, help="duração de cada medição, em segundos")
+    parser.add_argument("--span", type=int, default=20, help="largura do intervalo varrido em cada leitura")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=sorted(TARGETS), help="implementações medidas")
+    parser.add_argument("--seed", type=int, default=0, help="semente dos geradores de chaves")
+    parser.add_argument("--output", help="arquivo JSON onde os resultados serão gravados")
+    args = parser.parse_args(argv)
+    results = []  # Resultados de cada medição
+    for target in args.targets:
+        for readers in args.readers:
+            result = run(target, args.size, readers, args.writers, args.duration, args.span, args.seed)
+            results.append(result)
+            print(f"{target:>8}  leitoras={readers:>3}  leituras/s={result['reads_per_s']:>12,.0f}  "
+                  f"escritas/s={result['writes_per_s']:>10,.0f}")
+    if args.output:  # Grava os resultados em JSON, se solicitado
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Mede o custo do journal de RedBlackTree: a vazão de escritas (inserções e remoções) com cada política de gravação
+e latência de commit em grupo, comparada à árvore sem journal, e o tempo de recuperação em função da quantidade de
+operações registradas depois do último checkpoint.
+
+Uso: python -m benchmarks.journal --writes 100000 --records 10000 100000 1000000 [--output resultados.json]
+"""
+import argparse  # Importa o argparse para ler os argumentos da linha de comando
+import json  # Importa o json para gravar os resultados
+import random  # Importa o random para gerar as operações
+import tempfile  # Importa o tempfile para criar os diretórios do journal
+import time  # Importa o time para medir os tempos
+
+from main import Journal, RedBlackTree  # Importa a árvore e o journal a serem medidos
+
+POLICIES = [("sem journal", None, None), ("always", "always", None), ("group", "group", 0.001),
+            ("group", "group", 0.010), ("never", "never", 0.010)]  # (rótulo, política, latência) medidos
+
+
+def operations(count, seed=0):
+    """
+    Retorna 'count' operações (True para inserção, False para remoção) sobre chaves aleatórias: 70% de inserções.
+    """
+    rng = random.Random(seed)  # Gerador com semente fixa, para resultados reproduzíveis
+    universe = max(count, 10)  # Intervalo das chaves
+    return [(rng.random() < 0.7, rng.randrange(universe)) for _ in range(count)]
+
+
+def apply(tree, ops):
+    """
+    Aplica as operações 'ops' à árvore, sem mensagens para chaves duplicadas.
+    """
+    nil = tree.nil  # Referência local para o nó nil
+    for insert, key in ops:
+        if insert:
+            if tree.search(key) == nil:
+                tree._insert_key(key)
+        else:
+            tree.remove(key)
+
+
+def write_throughput(ops, sync, latency, directory):
+    """
+    Retorna as operações por segundo ao aplicar 'ops' a uma árvore com journal na política 'sync'
+    (ou sem journal, se 'sync' for None), incluindo a gravação das operações pendentes ao final.
+    """
+    tree = RedBlackTree()  # Árvore vazia
+    if sync is not None:
+        tree.enable_journal(directory, sync=sync, latency=latency)
+    start = time.perf_counter()  # Marca o início
+    apply(tree, ops)
+    if sync is not None:
+        tree.journal.flush()  # As operações só contam quando gravadas
+    elapsed = time.perf_counter() - start  # Tempo gasto
+    if sync is not None:
+        tree.disable_journal()
+    return len(ops) / elapsed
+
+
+def recovery_time(records, directory, seed=0):
+    """
+    Registra 'records' operações sem compactação e retorna o tempo de Journal.replay e de RedBlackTree.recover.
+    """
+    tree = RedBlackTree()  # Árvore vazia
+    tree.enable_journal(directory, sync="never", compact_segments=None)  # Sem compactação: todo o log é aplicado
+    apply(tree, operations(records, seed))
+    tree.disable_journal()
+    start = time.perf_counter()
+    Journal.replay(directory)  # Apenas o conjunto de chaves
+    replay = time.perf_counter() - start
+    start = time.perf_counter()
+    recovered = RedBlackTree.recover(directory)  # Conjunto de chaves e construção da árvore
+    recover = time.perf_counter() - start
+    recovered.disable_journal()
+    return replay, recover, len(recovered)
+
+
+def main(argv=None):
+    """
+    Executa as medições e imprime (ou grava) os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=100_000, help="quantidade de operações da medição de vazão")
+    parser.add_argument("--records", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="quantidades de operações registradas na medição de recuperação")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador de operações")
+    parser.add_argument("--output", help="arquivo JSON onde os resultados serão gravados")
+    args = parser.parse_args(argv)
+    results = {"writes": [], "recovery": []}  # Resultados de cada medição
+    ops = operations(args.writes, args.seed)  # Mesmas operações para todas as políticas
+    for label, sync, latency in POLICIES:
+        with tempfile.TemporaryDirectory() as directory:
+            # A política "always" faz um fsync por operação, então é medida com menos operações
+            sample = ops if sync != "always" else ops[:max(len(ops) // 20, 1)]
+            rate = write_throughput(sample, sync, latency, directory)
+        results["writes"].append({"policy": label, "latency_s": latency, "ops_per_s": rate})
+        suffix = f" ({latency * 1000:g} ms)" if latency is not None else ""
+        print(f"{label + suffix:>16}: {rate:>12,.0f} operações/s")
+    for records in args.records:
+        with tempfile.TemporaryDirectory() as directory:
+            replay, recover, size = recovery_time(records, directory, args.seed)
+        results["recovery"].append({"records": records, "keys": size, "replay_s": replay, "recover_s": recover})
+        print(f"recuperação de {records:>9} operações ({size} chaves): replay {replay:.3f}s, recover {recover:.3f}s")
+    if args.output:  # Grava os resultados em JSON, se solicitado
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compara o tempo de carga de um snapshot binário (RedBlackTree.save / RedBlackTree.load) com a reconstrução da árvore
+por inserções individuais e por bulk_load.
+
+Uso: python -m benchmarks.snapshot --sizes 10000 100000 1000000 [--output resultados.json]
+"""
+import argparse  # Importa o argparse para ler os argumentos da linha de comando
+import json  # Importa o json para gravar os resultados
+import os  # Importa o os para medir o tamanho dos arquivos
+import random  # Importa o random para gerar as chaves
+import tempfile  # Importa o tempfile para criar o diretório dos snapshots
+import time  # Importa o time para medir os tempos
+
+from main import RedBlackTree  # Importa a árvore a ser medida
+
+
+def timed(func):
+    """
+    Executa 'func' e retorna o tempo gasto em segundos e o seu resultado.
+    """
+    start = time.perf_counter()  # Marca o início
+    result = func()  # Executa a função medida
+    return time.perf_counter() - start, result  # Retorna o tempo e o resultado
+
+
+def run(size, directory, seed=0):
+    """
+    Mede, para 'size' chaves aleatórias, o tempo de reconstrução por inserção, por bulk_load e por carga de snapshot.
+    """
+    rng = random.Random(seed)  # Gerador com semente fixa, para resultados reproduzíveis
+    keys = rng.sample(range(size * 10), size)  # Chaves distintas em ordem aleatória
+    path = os.path.join(directory, f"snapshot-{size}.rbt")  # Arquivo do snapshot
+
+    def insert_all():
+        tree = RedBlackTree()  # Árvore vazia
+        for key in keys:  # Insere as chaves uma a uma
+            tree.insert(key)
+        return tree
+
+    insert_time, tree = timed(insert_all)  # Reconstrução por inserção
+    bulk_time, _ = timed(lambda: RedBlackTree.from_iterable(keys))  # Reconstrução por bulk_load
+    save_time, _ = timed(lambda: tree.save(path))  # Gravação do snapshot
+    load_time, _ = timed(lambda: RedBlackTree.load(path, mmap=False))  # Carga completa do snapshot
+    mmap_time, mapped = timed(lambda: RedBlackTree.load(path, mmap=True))  # Carga mapeada em memória
+    first_search_time, _ = timed(lambda: mapped.search(keys[0]))  # Primeira busca sobre o arquivo mapeado
+    mmap_noverify_time, _ = timed(lambda: RedBlackTree.load(path, mmap=True, verify=False))  # Carga mapeada sem checksum
+    return {
+        "size": size,
+        "file_bytes": os.path.getsize(path),
+        "insert_rebuild_s": insert_time,
+        "bulk_load_rebuild_s": bulk_time,
+        "save_s": save_time,
+        "load_s": load_time,
+        "load_mmap_s": mmap_time,
+        "load_mmap_first_search_s": first_search_time,
+        "load_mmap_noverify_s": mmap_noverify_time,
+    }
+
+
+def main(argv=None):
+    """
+    Executa o benchmark para cada tamanho informado e imprime (ou grava) os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="quantidades de chaves")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador de chaves")
+    parser.add_argument("--output", help="arquivo JSON onde os resultados serão gravados")
+    args = parser.parse_args(argv)
+    results = []  # Resultados de cada tamanho
+    with tempfile.TemporaryDirectory() as directory:  # Diretório temporário para os snapshots
+        for size in args.sizes:  # Executa o benchmark para cada tamanho
+            result = run(size, directory, args.seed)
+            results.append(result)
+            print(f"n={size:>9}  inserção={result['insert_rebuild_s']:.3f}s  bulk_load={result['bulk_load_rebuild_s']:.3f}s  "
+                  f"load={result['load_s']:.3f}s  load(mmap)={result['load_mmap_s']:.4f}s  "
+                  f"load(mmap, sem checksum)={result['load_mmap_noverify_s']:.5f}s")
+    if args.output:  # Grava os resultados em JSON, se solicitado
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Execução dos cenários do benchmark e comparação de resultados gravados em JSON.
+"""
+import gc  # Importa o módulo gc para coletar o lixo entre as medições
+import json  # Importa o json para gravar e ler os resultados
+import platform  # Importa o platform para registrar o ambiente
+import subprocess  # Importa o subprocess para registrar o commit atual
+import sys  # Importa o sys para registrar a versão do Python
+import time  # Importa o time para medir os tempos
+import tracemalloc  # Importa o tracemalloc para medir o pico de memória
+from array import array  # Importa o array para armazenar as latências
+
+import numpy as np  # Importa o NumPy para calcular os percentis
+
+from .workloads import TARGETS, Workload  # Importa os cenários e as estruturas
+
+
+def measure(op, args, unpack=False):
+    """
+    Executa 'op' sobre cada argumento de 'args', cronometrando cada chamada, e retorna a vazão e os percentis de latência.
+    Se 'unpack' for True, cada argumento é uma tupla desempacotada na chamada.
+    A latência de cada operação inclui o custo do relógio (algumas dezenas de nanossegundos).
+    """
+    if unpack:  # Converte a operação para receber a tupla desempacotada
+        call = op
+        op = lambda arg: call(*arg)
+    latencies = array("q", bytes(8 * len(args)))  # Latência de cada operação, em nanossegundos
+    clock = time.perf_counter_ns  # Referência local para o relógio
+    gc.collect()  # Evita que lixo de medições anteriores seja coletado durante esta
+    start = prev = clock()  # Marca o início
+    for i, arg in enumerate(args):  # Executa as operações
+        op(arg)  # Executa a operação
+        now = clock()
+        latencies[i] = now - prev  # Registra a latência da operação
+        prev = now
+    elapsed = (prev - start) / 1e9  # Tempo total em segundos
+    lat = np.frombuffer(latencies, dtype=np.int64)  # Latências como array do NumPy
+    return {
+        "ops": len(args),
+        "seconds": elapsed,
+        "ops_per_s": len(args) / elapsed if elapsed else None,
+        "p50_ns": float(np.percentile(lat, 50)) if len(lat) else None,
+        "p99_ns": float(np.percentile(lat, 99)) if len(lat) else None,
+    }
+
+
+def peak_memory(target_factory, keys):
+    """
+    Retorna o pico de memória, em bytes, para construir a estrutura com as chaves 'keys', medido pelo tracemalloc.
+    """
+    gc.collect()  # Descarta o lixo de medições anteriores
+    tracemalloc.start()  # Começa a rastrear as alocações
+    try:
+        target = target_factory()  # Cria a estrutura vazia
+        for key in keys:  # Insere as chaves
+            target.insert(key)
+        return tracemalloc.get_traced_memory()[1]  # Pico de memória desde o início do rastreamento
+    finally:
+        tracemalloc.stop()  # Para de rastrear as alocações
+
+
+def run_case(target_name, workload, memory=True):
+    """
+    Mede todas as operações de uma estrutura em um cenário e retorna a lista de resultados.
+    """
+    factory = TARGETS[target_name]  # Fábrica da estrutura
+    target = factory()  # Estrutura vazia
+    base = {"target": target_name, "distribution": workload.distribution, "size": workload.size}  # Identificação do cenário
+    results = []  # Resultados de cada operação
+
+    def record(operation, stats):
+        results.append({**base, "operation": operation, **stats})
+
+    record("insert", measure(target.insert, workload.inserts.tolist()))  # Inserções a partir da estrutura vazia
+    if workload.churn is not None:  # Inserções e remoções intercaladas com tamanho constante
+        def churn(victim, fresh):
+            target.remove(victim)
+            target.insert(fresh)
+        record("churn", measure(churn, workload.churn.tolist(), unpack=True))
+    record("search", measure(target.search, workload.searches.tolist()))  # Buscas
+    if target.range_scan is not None:  # Varreduras de intervalo
+        record("range_scan", measure(target.range_scan, workload.ranges.tolist(), unpack=True))
+    record("remove", measure(target.remove, workload.removes.tolist()))  # Remoções até esvaziar a estrutura
+    if memory:  # Pico de memória para construir a estrutura
+        record("build_memory", {"peak_bytes": peak_memory(factory, workload.inserts.tolist())})
+    return results
+
+
+def metadata(args):
+    """
+    Retorna as informações do ambiente gravadas junto dos resultados.
+    """
+    try:  # Registra o commit atual, se o projeto estiver em um repositório git
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": args.seed,
+        "sizes": args.sizes,
+        "distributions": args.distributions,
+        "targets": args.targets,
+    }
+
+
+def run(args):
+    """
+    Executa todos os cenários pedidos na linha de comando e grava os resultados em JSON.
+    """
+    results = []  # Resultados de todos os cenários
+    for size in args.sizes:  # Para cada tamanho
+        for distribution in args.distributions:  # Para cada distribuição
+            workload = Workload(distribution, size, args.seed, args.max_queries)  # Chaves do cenário
+            for target_name in args.targets:  # Para cada estrutura
+                for result in run_case(target_name, workload, memory=not args.no_memory):
+                    results.append(result)
+                    print(format_result(result), flush=True)
+    report = {"meta": metadata(args), "results": results}  # Relatório completo
+    if args.output:  # Grava o relatório em JSON, com as chaves ordenadas para facilitar o diff entre execuções
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return report
+
+
+def format_result(result):
+    """
+    Formata um resultado em uma linha de texto.
+    """
+    name = f"{result['target']:>8} {result['distribution']:>8} n={result['size']:<9} {result['operation']:<12}"
+    if "peak_bytes" in result:  # Resultado de memória
+        return f"{name} pico={result['peak_bytes'] / 2 ** 20:10.1f} MiB"
+    return f"{name} {result['ops_per_s']:>12,.0f} ops/s  p50={result['p50_ns']:>8.0f} ns  p99={result['p99_ns']:>8.0f} ns"
+
+
+def compare(old_path, new_path):
+    """
+    Compara dois relatórios JSON e imprime, para cada cenário presente nos dois, a razão entre os resultados novos e antigos.
+    """
+    def index(path):
+        with open(path) as f:
+            report = json.load(f)
+        return {(r["target"], r["distribution"], r["size"], r["operation"]): r for r in report["results"]}
+
+    old, new = index(old_path), index(new_path)  # Resultados indexados por cenário
+    for key in sorted(old.keys() & new.keys(), key=str):  # Cenários presentes nos dois relatórios
+        a, b = old[key], new[key]
+        name = f"{key[0]:>8} {key[1]:>8} n={key[2]:<9} {key[3]:<12}"
+        if "peak_bytes" in a:  # Resultado de memória
+            print(f"{name} memória x{b['peak_bytes'] / a['peak_bytes']:.2f}")
+        else:
+            print(f"{name} vazão x{b['ops_per_s'] / a['ops_per_s']:.2f}  p99 x{b['p99_ns'] / a['p99_ns']:.2f}")
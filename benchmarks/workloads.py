@@ -0,0 +1,136 @@
+"""
+Distribuições de chaves e estruturas comparadas pelo benchmark (python -m benchmarks).
+"""
+from bisect import bisect_left, bisect_right, insort  # Importa a busca binária usada pela lista ordenada
+
+import numpy as np  # Importa o NumPy para gerar as chaves
+
+from main import CompactRedBlackTree, RedBlackTree  # Importa as árvores a serem medidas
+
+DISTRIBUTIONS = ("random", "sorted", "reverse", "zipfian", "churn")  # Distribuições de chaves disponíveis
+KEY_SPACING = 10  # Distância média entre chaves consecutivas
+RANGE_WIDTH = 100  # Quantidade média de chaves devolvidas por uma varredura de intervalo
+
+
+class Workload:
+    """
+    Chaves de um cenário do benchmark: a ordem de inserção, as buscas, as varreduras de intervalo,
+    a ordem de remoção e, na distribuição "churn", as operações intercaladas de inserção e remoção.
+    Todas as estruturas medidas recebem exatamente as mesmas chaves.
+    """
+
+    def __init__(self, distribution, size, seed=0, max_queries=100_000):
+        """
+        Gera as chaves de 'size' elementos na distribuição 'distribution' a partir da semente 'seed'.
+        """
+        if distribution not in DISTRIBUTIONS:  # Verifica se a distribuição existe
+            raise ValueError(f"Distribuição desconhecida: {distribution}.")
+        rng = np.random.default_rng([seed, size, DISTRIBUTIONS.index(distribution)])  # Semente própria por cenário
+        keys = np.arange(size, dtype=np.int64) * KEY_SPACING + rng.integers(0, KEY_SPACING, size)  # Chaves distintas e espaçadas
+        queries = min(size, max_queries)  # Quantidade de buscas
+        self.distribution = distribution  # Nome da distribuição
+        self.size = size  # Quantidade de chaves
+        if distribution == "sorted":  # Inserções, buscas e remoções em ordem crescente
+            self.inserts = keys
+            self.searches = keys[np.linspace(0, size - 1, queries).astype(np.int64)]
+            self.removes = keys
+        elif distribution == "reverse":  # Inserções, buscas e remoções em ordem decrescente
+            self.inserts = keys[::-1]
+            self.searches = keys[np.linspace(size - 1, 0, queries).astype(np.int64)]
+            self.removes = keys[::-1]
+        else:  # Inserções e remoções em ordem aleatória
+            self.inserts = rng.permutation(keys)
+            self.removes = rng.permutation(keys)
+            if distribution == "zipfian":  # Buscas concentradas em poucas chaves populares
+                popularity = rng.permutation(keys)  # Ordem de popularidade das chaves
+                ranks = np.minimum(rng.zipf(1.2, queries), size) - 1  # Posto de popularidade de cada busca
+                self.searches = popularity[ranks]
+            else:  # Buscas uniformes
+                self.searches = rng.choice(keys, queries)
+        lows = rng.choice(keys, min(size, max_queries // 10 or 1))  # Início de cada varredura de intervalo
+        self.ranges = np.stack([lows, lows + RANGE_WIDTH * KEY_SPACING], axis=1)  # Intervalos fechados [lo, hi]
+        self.churn = None  # Operações intercaladas (apenas na distribuição "churn")
+        if distribution == "churn":  # Remove uma chave existente e insere uma nova, mantendo o tamanho constante
+            victims = rng.permutation(keys)[:queries]  # Chaves removidas
+            fresh = size * KEY_SPACING + np.arange(queries, dtype=np.int64) * KEY_SPACING + 1  # Chaves novas
+            self.churn = np.stack([victims, rng.permutation(fresh)], axis=1)  # Pares (remoção, inserção)
+
+
+class Target:
+    """
+    Estrutura medida pelo benchmark, exposta como um conjunto de funções com a mesma assinatura.
+    'range_scan' é None quando a estrutura não oferece varreduras ordenadas.
+    """
+
+    def __init__(self, name, insert, remove, search, range_scan, size):
+        self.name = name  # Nome da estrutura
+        self.insert = insert  # Insere uma chave
+        self.remove = remove  # Remove uma chave
+        self.search = search  # Retorna True se a chave estiver presente
+        self.range_scan = range_scan  # Retorna a quantidade de chaves em [lo, hi]
+        self.size = size  # Retorna a quantidade de chaves
+
+
+def rbtree_target():
+    """
+    RedBlackTree com armazenamento em objetos.
+    """
+    tree = RedBlackTree()  # Árvore vazia
+    nil = tree.nil  # Referência local para o nó nil
+
+    def range_scan(lo, hi):
+        n = 0  # Quantidade de chaves percorridas
+        for _ in tree.iter_range(lo, hi):  # Consome o iterador preguiçoso
+            n += 1
+        return n
+
+    return Target("rbtree", tree.insert, tree.remove, lambda key: tree.search(key) != nil, range_scan, tree.__len__)
+
+
+def compact_target():
+    """
+    CompactRedBlackTree com armazenamento em arrays paralelos.
+    """
+    tree = CompactRedBlackTree()  # Árvore vazia
+    return Target("compact", tree.insert, tree.remove, lambda key: tree.search(key) != 0, None, tree.__len__)
+
+
+def bisect_target():
+    """
+    Lista ordenada mantida com o módulo bisect.
+    """
+    items = []  # Lista ordenada de chaves
+
+    def remove(key):
+        i = bisect_left(items, key)  # Posição da chave
+        if i < len(items) and items[i] == key:  # Remove apenas se a chave existir
+            del items[i]
+
+    def search(key):
+        i = bisect_left(items, key)  # Posição da chave
+        return i < len(items) and items[i] == key
+
+    def range_scan(lo, hi):
+        n = 0  # Quantidade de chaves percorridas
+        for _ in items[bisect_left(items, lo):bisect_right(items, hi)]:  # Percorre a fatia do intervalo
+            n += 1
+        return n
+
+    return Target("bisect", lambda key: insort(items, key), remove, search, range_scan, items.__len__)
+
+
+def dict_target():
+    """
+    Dicionário do Python, referência para operações pontuais (não oferece varreduras ordenadas).
+    """
+    table = {}  # Dicionário de chaves
+    return Target("dict", lambda key: table.__setitem__(key, None), lambda key: table.pop(key, None),
+                  table.__contains__, None, table.__len__)
+
+
+TARGETS = {  # Estruturas disponíveis
+    "rbtree": rbtree_target,
+    "compact": compact_target,
+    "bisect": bisect_target,
+    "dict": dict_target,
+}
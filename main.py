@@ -1,7 +1,77 @@
-import matplotlib.pyplot as plt # Importa a biblioteca Matplotlib para plotar a árvore
-import networkx as nx # Importa a biblioteca NetworkX para criar o grafo da árvore
+import argparse  # Importa o argparse para ler os argumentos da linha de comando
+import numpy as np  # Importa o NumPy para as operações em lote sobre arrays de chaves
+import gc  # Importa o módulo gc para pausar o coletor de lixo durante a construção em lote
+import os  # Importa o módulo os para substituir arquivos de forma atômica
+import struct  # Importa o módulo struct para o cabeçalho binário dos snapshots
+import sys  # Importa o módulo sys para medir o tamanho dos objetos em memória
+import threading  # Importa o módulo threading para a trava de escrita da ConcurrentRedBlackTree
+import time  # Importa o módulo time para cronometrar as operações instrumentadas
+import zlib  # Importa o módulo zlib para o checksum (CRC-32) dos snapshots
+from bisect import bisect_left, bisect_right  # Importa a busca binária usada para dividir lotes ordenados
+from array import array  # Importa o tipo array para o armazenamento compacto dos nós
+
+SNAPSHOT_MAGIC = b"RBTS"  # Assinatura dos arquivos de snapshot
+SNAPSHOT_VERSION = 1  # Versão do formato de snapshot
+SNAPSHOT_HEADER = struct.Struct("<4sHcBQI12x")  # Assinatura, versão, tipo das chaves, flags, quantidade de chaves e CRC-32 (32 bytes)
+SNAPSHOT_DTYPES = {b"q": np.dtype("<i8"), b"d": np.dtype("<f8")}  # Tipos de chave suportados pelo formato
+JOURNAL_MAGIC = b"RBTJ"  # Assinatura dos segmentos do journal
+JOURNAL_VERSION = 1  # Versão do formato do journal
+JOURNAL_HEADER = struct.Struct("<4sHc")  # Cabeçalho de um segmento: assinatura, versão e tipo das chaves
+JOURNAL_BLOCK = struct.Struct("<II")  # Cabeçalho de um bloco de registros: tamanho e CRC-32
+JOURNAL_INSERT = b"+"  # Operação de inserção em um registro do journal
+JOURNAL_REMOVE = b"-"  # Operação de remoção em um registro do journal
+
+def _write_snapshot(path, keys, order_statistics=False):
+    """
+    Grava o array ordenado e sem duplicatas 'keys' no arquivo de snapshot 'path' (veja RedBlackTree.save).
+    """
+    if keys.dtype.kind in "iub" or len(keys) == 0:  # Chaves inteiras (ou árvore vazia)
+        typecode = b"q"
+    elif keys.dtype.kind == "f":  # Chaves de ponto flutuante
+        typecode = b"d"
+    else:
+        raise TypeError("O snapshot suporta apenas chaves inteiras ou de ponto flutuante.")
+    data = keys.astype(SNAPSHOT_DTYPES[typecode]).tobytes()  # Bytes das chaves no formato do arquivo
+    flags = 1 if order_statistics else 0  # Guarda se a árvore mantém estatísticas de ordem
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, typecode, flags, len(keys), zlib.crc32(data))  # Monta o cabeçalho
+    tmp_path = f"{path}.tmp"  # Arquivo temporário usado durante a escrita
+    with open(tmp_path, "wb") as f:  # Escreve o snapshot no arquivo temporário
+        f.write(header)  # Escreve o cabeçalho
+        f.write(data)  # Escreve as chaves
+        f.flush()  # Esvazia o buffer do Python
+        os.fsync(f.fileno())  # Garante que os dados chegaram ao disco
+    os.replace(tmp_path, path)  # Substitui o snapshot anterior de forma atômica
+
+def _read_snapshot(path, mmap=True, verify=True):
+    """
+    Lê o arquivo de snapshot 'path' (veja RedBlackTree.load) e retorna o array ordenado de chaves (mapeado em
+    memória se 'mmap' for True) e os indicadores do cabeçalho.
+    """
+    with open(path, "rb") as f:  # Lê o cabeçalho do arquivo
+        raw = f.read(SNAPSHOT_HEADER.size)
+    if len(raw) < SNAPSHOT_HEADER.size:  # Verifica se o cabeçalho está completo
+        raise ValueError(f"O arquivo {path} não é um snapshot válido.")
+    magic, version, typecode, flags, count, checksum = SNAPSHOT_HEADER.unpack(raw)  # Decodifica o cabeçalho
+    if magic != SNAPSHOT_MAGIC or typecode not in SNAPSHOT_DTYPES:  # Verifica a assinatura e o tipo das chaves
+        raise ValueError(f"O arquivo {path} não é um snapshot válido.")
+    if version != SNAPSHOT_VERSION:  # Verifica a versão do formato
+        raise ValueError(f"Versão de snapshot {version} não suportada.")
+    dtype = SNAPSHOT_DTYPES[typecode]  # Tipo das chaves gravadas
+    if os.path.getsize(path) != SNAPSHOT_HEADER.size + count * dtype.itemsize:  # Verifica se o arquivo não está truncado
+        raise ValueError(f"O snapshot {path} está truncado.")
+    if count == 0:  # Um arquivo vazio não pode ser mapeado em memória
+        keys = np.empty(0, dtype=dtype)
+    elif mmap:  # Mapeia as chaves diretamente do arquivo, sem copiá-las
+        keys = np.memmap(path, dtype=dtype, mode="r", offset=SNAPSHOT_HEADER.size, shape=(count,))
+    else:  # Lê as chaves para a memória
+        keys = np.fromfile(path, dtype=dtype, offset=SNAPSHOT_HEADER.size, count=count)
+    if verify and zlib.crc32(keys) != checksum:  # Confere o checksum das chaves
+        raise ValueError(f"O checksum do snapshot {path} não confere.")
+    return keys, flags
 
 class Node:
+    __slots__ = ("key", "parent", "left", "right", "color", "size")  # Dispensa o __dict__ de cada nó para reduzir o uso de memória
+
     def __init__(self, key, parent=None, color="Red"):
         """
         Cria um novo nó com uma chave, um pai e uma cor.
@@ -11,14 +81,142 @@ class Node:
         self.left = None  # Inicializa o nó filho esquerdo como None
         self.right = None  # Inicializa o nó filho direito como None
         self.color = color  # Atribui a cor do nó (padrão é "Red")
+        self.size = 1  # Número de nós na subárvore enraizada neste nó (usado pelas estatísticas de ordem)
+
+class MapNode(Node):
+    __slots__ = ("value",)  # Valor associado à chave
+
+    def __init__(self, key, parent=None, color="Red", value=None):
+        """
+        Cria um novo nó da RedBlackMap com uma chave, um pai, uma cor e o valor associado à chave.
+        """
+        super().__init__(key, parent, color)  # Inicializa a chave, o pai, os filhos e a cor
+        self.value = value  # Atribui o valor associado à chave
 
 class RedBlackTree:
-    def __init__(self):
+    NODE = Node  # Classe dos nós criados pela árvore
+
+    def __init__(self, order_statistics=False):
         """
         Inicializa a árvore Rubro-Negra com um nó nil como a raiz.
+        Se 'order_statistics' for True, cada nó mantém o tamanho de sua subárvore, habilitando
+        rank, select, count_range e percentile em tempo logarítmico.
         """
         self.nil = Node(None, color="Black")  # Cria um nó nil com valor None e cor preta
+        self.nil.size = 0  # O nó nil não conta como nó da subárvore
+        self.order_statistics = order_statistics  # Indica se o tamanho das subárvores é mantido
         self.root = self.nil  # Define o nó nil como a raiz da árvore
+        self.count = 0  # Número de chaves armazenadas na árvore
+
+    def __len__(self):
+        """
+        Retorna o número de chaves armazenadas na árvore.
+        Após split, join ou uma operação de conjuntos sem estatísticas de ordem, o contador é desconhecido (None)
+        e é recalculado aqui, em O(n), apenas na primeira consulta.
+        """
+        if self.count is None:  # Se o contador não for conhecido
+            self.count = sum(1 for _ in self._subtree_keys(self.root))  # Conta os nós da árvore uma única vez
+        return self.count  # Retorna o contador mantido por insert, remove e bulk_load
+
+    def bytes_per_node(self):
+        """
+        Retorna o número aproximado de bytes ocupados por nó, somando o objeto Node e o objeto da chave.
+        Permite comparar este armazenamento com o da CompactRedBlackTree.
+        """
+        key_size = sys.getsizeof(self.root.key) if self.root != self.nil else 0  # Tamanho de uma chave armazenada
+        return sys.getsizeof(self.nil) + key_size  # Soma o tamanho do nó ao tamanho da chave
+
+    @classmethod
+    def from_iterable(cls, keys, presorted=False, order_statistics=False):
+        """
+        Cria uma nova árvore a partir de um iterável de chaves usando a carga em lote (bulk_load).
+        """
+        tree = cls(order_statistics=order_statistics)  # Cria uma árvore vazia
+        tree.bulk_load(keys, presorted=presorted)  # Carrega todas as chaves de uma só vez
+        return tree  # Retorna a árvore construída
+
+    def bulk_load(self, keys, presorted=False):
+        """
+        Carrega várias chaves de uma vez, ordenando e removendo duplicatas uma única vez e construindo uma árvore
+        perfeitamente balanceada em tempo linear, sem rotações e sem uma busca por chave.
+        Se 'presorted' for True, as chaves já devem vir em ordem crescente e a ordenação é pulada.
+        Se a árvore já contiver chaves, o lote é intercalado com as chaves existentes em O(n + m) e a árvore é reconstruída.
+        """
+        if presorted:  # Se as chaves já vierem ordenadas
+            batch = self._dedupe_sorted(keys)  # Apenas remove as duplicatas adjacentes
+        else:
+            batch = sorted(set(keys))  # Remove as duplicatas e ordena o lote uma única vez
+        self._merge_sorted(batch)  # Intercala o lote com as chaves existentes e reconstrói a árvore
+
+    def _merge_sorted(self, batch):
+        """
+        Reconstrói a árvore com as chaves existentes mais as chaves ordenadas e sem duplicatas 'batch', em O(n + m).
+        """
+        if self.root != self.nil:  # Se a árvore já possuir chaves
+            merged = list(self.keys())  # Coleta as chaves existentes em ordem
+            merged.extend(batch)  # Concatena as duas sequências ordenadas
+            merged.sort()  # O Timsort detecta as duas sequências e as intercala em tempo linear
+            batch = self._dedupe_sorted(merged)  # Remove as chaves presentes nas duas sequências
+        self._build_balanced(batch)  # Reconstrói a árvore a partir das chaves ordenadas
+
+    @staticmethod
+    def _dedupe_sorted(keys):
+        """
+        Retorna uma lista com as chaves de uma sequência ordenada, sem as duplicatas adjacentes.
+        """
+        unique = []  # Lista com as chaves sem duplicatas
+        last = None  # Última chave adicionada
+        for key in keys:  # Percorre as chaves em ordem
+            if not unique or key != last:  # Se a chave for diferente da última adicionada
+                unique.append(key)  # Adiciona a chave
+                last = key  # Atualiza a última chave adicionada
+        return unique  # Retorna as chaves sem duplicatas
+
+    def _build_balanced(self, keys):
+        """
+        Substitui o conteúdo da árvore por uma árvore perfeitamente balanceada com as chaves ordenadas e sem duplicatas 'keys'.
+        Todos os níveis completos são pretos e apenas os nós do último nível incompleto são vermelhos,
+        de modo que todos os caminhos tenham a mesma quantidade de nós pretos.
+        """
+        self.root = self.nil  # Descarta a árvore atual
+        self.root = self._build_nodes(keys)  # Constrói os novos nós
+        self.count = len(keys)  # Atualiza o número de chaves
+
+    def _build_nodes(self, keys):
+        """
+        Constrói, sem alterar a árvore, uma subárvore perfeitamente balanceada com as chaves ordenadas e sem duplicatas 'keys'
+        e retorna sua raiz (o nó nil se 'keys' for vazia), preta e sem pai.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        n = len(keys)  # Quantidade de chaves a serem inseridas
+        red_depth = (n + 1).bit_length() - 1  # Profundidade do último nível incompleto (floor(log2(n + 1)))
+        node_class = self.NODE  # Classe dos nós criados
+        root = nil  # Raiz da subárvore construída
+        gc_enabled = gc.isenabled()  # Guarda o estado do coletor de lixo
+        gc.disable()  # Os ciclos pai/filho dos nós novos disparariam o coletor repetidas vezes durante a construção
+        try:
+            stack = [(0, n, nil, False, 0)]  # Pilha com os intervalos (início, fim, pai, é filho esquerdo, profundidade)
+            while stack:  # Enquanto houver intervalos a serem construídos
+                lo, hi, parent, is_left, depth = stack.pop()  # Retira o próximo intervalo da pilha
+                if lo >= hi:  # Se o intervalo estiver vazio, o filho permanece nil
+                    continue
+                mid = (lo + hi) // 2  # A chave do meio se torna a raiz da subárvore
+                node = node_class(keys[mid], parent, "Red" if depth == red_depth else "Black")  # Cria o nó com a cor do seu nível
+                node.left = nil  # Inicializa o filho esquerdo como o nó nil
+                node.right = nil  # Inicializa o filho direito como o nó nil
+                node.size = hi - lo  # A subárvore contém todas as chaves do intervalo
+                if parent == nil:  # Se o nó não tiver pai, ele é a raiz
+                    root = node  # Define o nó como a raiz da subárvore
+                elif is_left:  # Se o nó for o filho esquerdo de seu pai
+                    parent.left = node  # Liga o nó ao pai pela esquerda
+                else:
+                    parent.right = node  # Liga o nó ao pai pela direita
+                stack.append((mid + 1, hi, node, False, depth + 1))  # Agenda a construção da subárvore direita
+                stack.append((lo, mid, node, True, depth + 1))  # Agenda a construção da subárvore esquerda
+        finally:
+            if gc_enabled:  # Restaura o coletor de lixo
+                gc.enable()
+        return root  # Retorna a raiz da subárvore
 
     def transplant(self, u, v):
         """
@@ -49,6 +247,9 @@ class RedBlackTree:
             x.parent.right = y  # Define y como o novo filho direito do pai de x
         y.left = x  # Define x como o filho esquerdo de y
         x.parent = y  # Define y como o novo pai de x
+        if self.order_statistics:  # Se o tamanho das subárvores for mantido
+            y.size = x.size  # y passa a enraizar a subárvore que era de x
+            x.size = x.left.size + x.right.size + 1  # Recalcula o tamanho da subárvore de x
 
     def right_rotate(self, x):
         """
@@ -67,6 +268,9 @@ class RedBlackTree:
             x.parent.left = y  # Define y como o novo filho esquerdo do pai de x
         y.right = x  # Define x como o filho direito de y
         x.parent = y  # Define y como o novo pai de x
+        if self.order_statistics:  # Se o tamanho das subárvores for mantido
+            y.size = x.size  # y passa a enraizar a subárvore que era de x
+            x.size = x.left.size + x.right.size + 1  # Recalcula o tamanho da subárvore de x
 
     def insert_fixup(self, z):
         """
@@ -106,31 +310,66 @@ class RedBlackTree:
     def insert(self, key):
         """
         Insere um novo nó com a chave 'key' na árvore, garantindo que não haja inserção de chaves duplicadas.
+        A verificação de duplicatas e a posição de inserção são obtidas em uma única descida (veja _locate).
         """
-        if self.search(key) != self.nil:  # Verifica se a chave já existe na árvore
+        x, parent, left = self._locate(key)  # Procura a chave ou a sua posição de inserção
+        if x != self.nil:  # Verifica se a chave já existe na árvore
             print(f"A chave {key} já existe na árvore. Inserção cancelada.")  # Informa ao usuário que a chave já existe
             return  # Retorna sem fazer a inserção
+        self._attach(self.NODE(key), parent, left)  # Insere a nova chave na posição encontrada
 
-        z = Node(key)  # Cria um novo nó 'z' com a chave 'key'
+    def _locate(self, key):
+        """
+        Procura a chave 'key' em uma única descida a partir da raiz.
+        Retorna (nó com a chave ou nil, pai da posição de inserção, se a posição é o filho esquerdo do pai).
+        """
+        nil = self.nil  # Referência local para o nó nil
+        parent = nil  # Último nó visitado
+        left = False  # Lado pelo qual a descida saiu do último nó
+        x = self.root  # Começa pela raiz da árvore
+        while x != nil:  # Desce até encontrar a chave ou o nó nil
+            if key < x.key:  # A chave está à esquerda
+                parent, x, left = x, x.left, True
+            elif x.key < key:  # A chave está à direita
+                parent, x, left = x, x.right, False
+            else:
+                return x, parent, left  # A chave já está na árvore
+        return nil, parent, left  # Retorna a posição de inserção
+
+    def _insert_key(self, key):
+        """
+        Insere a chave 'key', que não pode estar presente na árvore, sem verificar duplicatas.
+        """
         y = self.nil  # Inicializa 'y' como o nó nil
         x = self.root  # Inicializa 'x' como a raiz da árvore
+        left = False  # Indica se 'z' será o filho esquerdo de 'y'
         while x != self.nil:  # Enquanto 'x' não for o nó nil
             y = x  # Define 'y' como 'x'
-            if z.key < x.key:  # Se a chave de 'z' for menor que a chave de 'x'
-                x = x.left  # 'x' se move para o filho esquerdo
-            else:
-                x = x.right  # 'x' se move para o filho direito
+            left = key < x.key  # Compara a chave com a chave de 'x'
+            x = x.left if left else x.right  # 'x' se move para o filho esquerdo ou para o direito
+        return self._attach(self.NODE(key), y, left)  # Liga o novo nó na posição encontrada
+
+    def _attach(self, z, y, left):
+        """
+        Liga o novo nó 'z' como filho de 'y' (esquerdo se 'left' for True), ou como raiz se 'y' for o nó nil,
+        e corrige as propriedades da árvore. A posição deve ter sido obtida por uma descida pela chave de 'z'.
+        """
         z.parent = y  # Define o pai de 'z' como 'y'
         if y == self.nil:  # Se 'y' for o nó nil (árvore vazia)
             self.root = z  # 'z' se torna a nova raiz da árvore
-        elif z.key < y.key:  # Se a chave de 'z' for menor que a chave de 'y'
+        elif left:  # Se 'z' for o filho esquerdo de 'y'
             y.left = z  # 'z' se torna o filho esquerdo de 'y'
         else:
             y.right = z  # 'z' se torna o filho direito de 'y'
         z.left = self.nil  # Define o filho esquerdo de 'z' como o nó nil
         z.right = self.nil  # Define o filho direito de 'z' como o nó nil
         z.color = "Red"  # Define a cor de 'z' como vermelha
+        if self.count is not None:  # Se o contador for conhecido
+            self.count += 1  # Incrementa o número de chaves da árvore
+        if self.order_statistics:  # Se o tamanho das subárvores for mantido
+            self._adjust_sizes(y, 1)  # Incrementa o tamanho das subárvores dos ancestrais de 'z'
         self.insert_fixup(z)  # Chama o método 'insert_fixup' para corrigir as propriedades da árvore Rubro-Negra após a inserção de 'z'
+        return z  # Retorna o nó inserido
 
         def transplant(self, u, v):
             """
@@ -201,6 +440,110 @@ class RedBlackTree:
             x = x.left  # Atualiza o valor de x para o filho esquerdo de x
         return x  # Retorna o nó com a menor chave na subárvore enraizada em x
 
+    def maximum(self, x):
+        """
+        Retorna o nó com a maior chave na subárvore enraizada no nó 'x'.
+        """
+        while x.right != self.nil:  # Enquanto existir um filho direito de x que não seja o nó nil
+            x = x.right  # Atualiza o valor de x para o filho direito de x
+        return x  # Retorna o nó com a maior chave na subárvore enraizada em x
+
+    def successor(self, x):
+        """
+        Retorna o nó com a menor chave maior que a chave de 'x' (o nó nil se 'x' for o maior), usando os ponteiros para o pai.
+        """
+        if x.right != self.nil:  # Se x tiver subárvore direita, o sucessor é o menor nó dela
+            return self.minimum(x.right)
+        y = x.parent  # Caso contrário, sobe até o primeiro ancestral do qual x está à esquerda
+        while y != self.nil and x == y.right:  # Enquanto x for o filho direito de seu pai
+            x = y  # Sobe x
+            y = y.parent  # Sobe y
+        return y  # Retorna o sucessor (ou o nó nil)
+
+    def predecessor(self, x):
+        """
+        Retorna o nó com a maior chave menor que a chave de 'x' (o nó nil se 'x' for o menor), usando os ponteiros para o pai.
+        """
+        if x.left != self.nil:  # Se x tiver subárvore esquerda, o predecessor é o maior nó dela
+            return self.maximum(x.left)
+        y = x.parent  # Caso contrário, sobe até o primeiro ancestral do qual x está à direita
+        while y != self.nil and x == y.left:  # Enquanto x for o filho esquerdo de seu pai
+            x = y  # Sobe x
+            y = y.parent  # Sobe y
+        return y  # Retorna o predecessor (ou o nó nil)
+
+    def lower_bound(self, key):
+        """
+        Retorna o nó com a menor chave maior ou igual a 'key' (o nó nil se não houver) em O(log n).
+        """
+        result = self.nil  # Melhor candidato encontrado até o momento
+        x = self.root  # Começa pela raiz da árvore
+        while x != self.nil:  # Desce até o nó nil
+            if x.key < key:  # Se a chave de x for menor que 'key', o candidato está à direita
+                x = x.right
+            else:  # Caso contrário, x é candidato e pode haver um menor à esquerda
+                result = x
+                x = x.left
+        return result  # Retorna o nó encontrado
+
+    def floor(self, key):
+        """
+        Retorna o nó com a maior chave menor ou igual a 'key' (o nó nil se não houver) em O(log n).
+        """
+        result = self.nil  # Melhor candidato encontrado até o momento
+        x = self.root  # Começa pela raiz da árvore
+        while x != self.nil:  # Desce até o nó nil
+            if key < x.key:  # Se a chave de x for maior que 'key', o candidato está à esquerda
+                x = x.left
+            else:  # Caso contrário, x é candidato e pode haver um maior à direita
+                result = x
+                x = x.right
+        return result  # Retorna o nó encontrado
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera, de forma preguiçosa, as chaves no intervalo fechado [lo, hi] (None indica sem limite), em ordem crescente
+        ou decrescente se 'reverse' for True. Cada chave é obtida pelo sucessor ou predecessor do nó anterior,
+        totalizando O(log n + k) para k chaves, sem recursão e sem listas intermediárias.
+        A árvore não deve ser modificada enquanto o gerador estiver em uso.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if self.root == nil:  # Uma árvore vazia não possui chaves
+            return
+        if not reverse:  # Percurso em ordem crescente
+            node = self.minimum(self.root) if lo is None else self.lower_bound(lo)  # Primeiro nó do intervalo
+            while node != nil and (hi is None or node.key <= hi):  # Enquanto o nó estiver dentro do intervalo
+                yield node.key  # Gera a chave do nó
+                node = self.successor(node)  # Avança para o sucessor
+        else:  # Percurso em ordem decrescente
+            node = self.maximum(self.root) if hi is None else self.floor(hi)  # Último nó do intervalo
+            while node != nil and (lo is None or node.key >= lo):  # Enquanto o nó estiver dentro do intervalo
+                yield node.key  # Gera a chave do nó
+                node = self.predecessor(node)  # Recua para o predecessor
+
+    def keys(self):
+        """
+        Gera todas as chaves da árvore em ordem crescente.
+        """
+        return self.iter_range()  # Percorre a árvore inteira
+
+    def __iter__(self):
+        """
+        Permite iterar diretamente sobre as chaves da árvore em ordem crescente.
+        """
+        return self.iter_range()  # Percorre a árvore inteira
+
+    def cursor(self, key=None):
+        """
+        Retorna um cursor posicionado na menor chave maior ou igual a 'key' (ou na menor chave da árvore se 'key' for None).
+        """
+        cursor = TreeCursor(self)  # Cria o cursor sobre esta árvore
+        if key is None:  # Se nenhuma chave for informada
+            cursor.first()  # Posiciona o cursor na menor chave
+        else:
+            cursor.seek(key)  # Posiciona o cursor na chave informada
+        return cursor  # Retorna o cursor
+
     def remove(self, key):
         """
         Remove o nó com a chave 'key' da árvore.
@@ -208,6 +551,19 @@ class RedBlackTree:
         z = self.search(key)  # Procura o nó com a chave 'key' na árvore
         if z == self.nil:  # Se o nó não for encontrado, retorna
             return
+        self._remove_node(z)  # Remove o nó encontrado
+
+    def _remove_node(self, z):
+        """
+        Remove da árvore o nó 'z', que não pode ser o nó nil.
+        """
+        if self.count is not None:  # Se o contador for conhecido
+            self.count -= 1  # Decrementa o número de chaves da árvore
+        if self.order_statistics:  # Se o tamanho das subárvores for mantido
+            if z.left == self.nil or z.right == self.nil:  # Se 'z' tiver no máximo um filho, ele sai da árvore
+                self._adjust_sizes(z.parent, -1)  # Decrementa o tamanho das subárvores dos ancestrais de 'z'
+            else:  # Caso contrário, o sucessor de 'z' sai de sua posição original
+                self._adjust_sizes(self.minimum(z.right).parent, -1)  # Decrementa a partir do pai do sucessor
         y = z  # Define 'y' como 'z'
         y_original_color = y.color  # Armazena a cor original de 'y'
         if z.left == self.nil:  # Se o filho esquerdo de 'z' for o nó nil
@@ -230,9 +586,81 @@ class RedBlackTree:
             y.left = z.left  # Define o filho esquerdo de 'y' como o filho esquerdo de 'z'
             y.left.parent = y  # Define o pai do filho esquerdo de 'y' como 'y'
             y.color = z.color  # Define a cor de 'y' como a cor de 'z'
+            y.size = z.size  # 'y' passa a enraizar a subárvore que era de 'z'
         if y_original_color == "Black":  # Se a cor original de 'y' for preta
             self.delete_fixup(x)  # Chama o método 'delete_fixup' para corrigir as propriedades da árvore Rubro-Negra após a remoção de 'x'
 
+    def _adjust_sizes(self, x, delta):
+        """
+        Soma 'delta' ao tamanho das subárvores de 'x' e de todos os seus ancestrais.
+        """
+        while x != self.nil:  # Sobe até a raiz da árvore
+            x.size += delta  # Atualiza o tamanho da subárvore de x
+            x = x.parent  # Passa para o pai de x
+
+    def _require_order_statistics(self):
+        """
+        Garante que a árvore mantém o tamanho das subárvores antes de uma consulta de estatística de ordem.
+        """
+        if not self.order_statistics:  # Se o tamanho das subárvores não for mantido
+            raise RuntimeError("A árvore não mantém estatísticas de ordem; crie-a com order_statistics=True.")
+
+    def rank(self, key):
+        """
+        Retorna a quantidade de chaves menores que 'key' em O(log n).
+        """
+        self._require_order_statistics()  # Verifica se as estatísticas de ordem estão habilitadas
+        r = 0  # Quantidade de chaves menores que 'key' encontradas até o momento
+        x = self.root  # Começa pela raiz da árvore
+        while x != self.nil:  # Desce até o nó nil
+            if key <= x.key:  # Se a chave for menor ou igual à chave de x, x e sua subárvore direita não contam
+                x = x.left  # Move x para o filho esquerdo
+            else:
+                r += x.left.size + 1  # x e sua subárvore esquerda são menores que 'key'
+                x = x.right  # Move x para o filho direito
+        return r  # Retorna a quantidade de chaves menores que 'key'
+
+    def select(self, i):
+        """
+        Retorna a i-ésima menor chave da árvore (começando em 0) em O(log n).
+        """
+        self._require_order_statistics()  # Verifica se as estatísticas de ordem estão habilitadas
+        if i < 0:  # Permite índices negativos, contados a partir da maior chave
+            i += self.root.size
+        if not 0 <= i < self.root.size:  # Verifica se o índice está dentro dos limites
+            raise IndexError("Índice fora dos limites da árvore.")
+        x = self.root  # Começa pela raiz da árvore
+        while True:
+            left_size = x.left.size  # Quantidade de chaves menores que a chave de x em sua subárvore
+            if i < left_size:  # Se a chave procurada estiver na subárvore esquerda
+                x = x.left  # Move x para o filho esquerdo
+            elif i == left_size:  # Se x for a chave procurada
+                return x.key  # Retorna a chave de x
+            else:
+                i -= left_size + 1  # Descarta x e sua subárvore esquerda
+                x = x.right  # Move x para o filho direito
+
+    def count_range(self, lo, hi):
+        """
+        Retorna a quantidade de chaves no intervalo fechado [lo, hi] em O(log n).
+        """
+        if hi < lo:  # Se o intervalo estiver vazio
+            return 0
+        upper = self.rank(hi) + (self.search(hi) != self.nil)  # Quantidade de chaves menores ou iguais a 'hi'
+        return upper - self.rank(lo)  # Desconta as chaves menores que 'lo'
+
+    def percentile(self, p):
+        """
+        Retorna a chave no percentil 'p' (entre 0 e 100) pelo método do posto mais próximo, em O(log n).
+        """
+        self._require_order_statistics()  # Verifica se as estatísticas de ordem estão habilitadas
+        if not 0 <= p <= 100:  # Verifica se o percentil é válido
+            raise ValueError("O percentil deve estar entre 0 e 100.")
+        if self.root == self.nil:  # Uma árvore vazia não possui percentis
+            raise IndexError("A árvore está vazia.")
+        i = max(0, -(-p * self.root.size // 100) - 1)  # Posto mais próximo: ceil(p / 100 * n), começando em 0
+        return self.select(int(i))  # Retorna a chave nessa posição
+
     def search(self, key):
         """
         Procura e retorna o nó com a chave 'key' na árvore.
@@ -245,156 +673,2778 @@ class RedBlackTree:
                 x = x.right  # 'x' se move para o filho direito
         return x  # Retorna o nó encontrado ou o nó nil se a chave não for encontrada
 
+    BULK_REBUILD_RATIO = 0.25  # Fração do tamanho da árvore a partir da qual um lote reconstrói a árvore em vez de alterá-la chave a chave
+
+    def search_many(self, keys, return_positions=False):
+        """
+        Procura todas as chaves do array 'keys' de uma só vez e retorna um array booleano indicando quais estão na árvore.
+        O lote é ordenado uma única vez e dividido em cada nó visitado por busca binária, de modo que cada nó é visitado
+        no máximo uma vez e os caminhos em comum entre as chaves são percorridos uma única vez.
+        Se 'return_positions' for True (requer order_statistics=True), retorna também o rank de cada chave.
+        """
+        keys = np.asarray(keys)  # Converte a entrada em um array do NumPy
+        if return_positions:  # O rank depende do tamanho das subárvores
+            self._require_order_statistics()
+        n = len(keys)  # Tamanho do lote
+        order = np.argsort(keys, kind="stable")  # Ordena o lote uma única vez
+        sorted_keys = keys[order].tolist()  # Chaves ordenadas como objetos Python, para comparar com as chaves da árvore
+        found = np.zeros(n, dtype=bool)  # Indica, na ordem do lote ordenado, quais chaves foram encontradas
+        positions = np.zeros(n, dtype=np.int64) if return_positions else None  # Rank de cada chave do lote ordenado
+        nil = self.nil  # Referência local para o nó nil
+        stack = [(self.root, 0, n, 0)]  # Pilha com (nó, início, fim, quantidade de chaves da árvore à esquerda do trecho)
+        while stack:  # Enquanto houver trechos do lote a serem resolvidos
+            node, a, b, offset = stack.pop()  # Retira o próximo trecho da pilha
+            if a >= b:  # Se o trecho estiver vazio, não há o que procurar
+                continue
+            if node == nil:  # Se o trecho chegou ao nó nil, nenhuma de suas chaves está na árvore
+                if return_positions:
+                    positions[a:b] = offset  # Todas as chaves do trecho têm o mesmo rank
+                continue
+            if b - a == 1 and not return_positions:  # Um trecho com uma única chave é resolvido com uma descida simples
+                key = sorted_keys[a]  # Chave procurada
+                while node != nil and key != node.key:  # Desce até encontrar a chave ou o nó nil
+                    node = node.left if key < node.key else node.right
+                found[a] = node != nil  # Marca se a chave foi encontrada
+                continue
+            i = bisect_left(sorted_keys, node.key, a, b)  # Primeira chave do trecho maior ou igual à chave do nó
+            j = bisect_right(sorted_keys, node.key, i, b)  # Primeira chave do trecho maior que a chave do nó
+            if j > i:  # Se alguma chave do trecho for igual à chave do nó
+                found[i:j] = True  # Marca as chaves como encontradas
+                if return_positions:
+                    positions[i:j] = offset + node.left.size  # O rank é a quantidade de chaves à esquerda do nó
+            if return_positions:
+                stack.append((node.right, j, b, offset + node.left.size + 1))  # As chaves maiores seguem pela direita
+            else:
+                stack.append((node.right, j, b, 0))  # As chaves maiores seguem pela direita
+            stack.append((node.left, a, i, offset))  # As chaves menores seguem pela esquerda
+        mask = np.empty(n, dtype=bool)  # Resultado na ordem original do lote
+        mask[order] = found  # Desfaz a ordenação
+        if not return_positions:
+            return mask  # Retorna apenas a máscara de chaves encontradas
+        ranks = np.empty(n, dtype=np.int64)  # Ranks na ordem original do lote
+        ranks[order] = positions  # Desfaz a ordenação
+        return mask, ranks  # Retorna a máscara e os ranks
+
+    def insert_many(self, keys):
+        """
+        Insere todas as chaves do array 'keys' e retorna um array booleano indicando quais não estavam na árvore.
+        As chaves já presentes são descartadas com uma única chamada a search_many. Se o lote de chaves novas for grande
+        em relação à árvore, ele é intercalado com as chaves existentes e a árvore é reconstruída por bulk_load.
+        """
+        keys = np.asarray(keys)  # Converte a entrada em um array do NumPy
+        inserted = ~self.search_many(keys)  # Chaves que ainda não estão na árvore
+        new_keys = np.unique(keys[inserted]).tolist()  # Chaves novas ordenadas e sem duplicatas
+        if len(new_keys) >= self.BULK_REBUILD_RATIO * len(self):  # Se o lote for grande em relação à árvore
+            self._merge_sorted(new_keys)  # Intercala o lote com as chaves existentes e reconstrói a árvore
+        else:
+            for key in new_keys:  # Caso contrário, insere as chaves novas uma a uma
+                self._insert_key(key)  # Insere sem repetir a verificação de duplicatas
+        return inserted  # Retorna a máscara de chaves inseridas
+
+    def remove_many(self, keys):
+        """
+        Remove todas as chaves do array 'keys' e retorna um array booleano indicando quais estavam na árvore.
+        Se o lote de chaves presentes for grande em relação à árvore, a árvore é reconstruída apenas com as chaves restantes.
+        """
+        keys = np.asarray(keys)  # Converte a entrada em um array do NumPy
+        removed = self.search_many(keys)  # Chaves que estão na árvore
+        victims = np.unique(keys[removed])  # Chaves a serem removidas, ordenadas e sem duplicatas
+        if len(victims) >= self.BULK_REBUILD_RATIO * len(self):  # Se o lote for grande em relação à árvore
+            gone = set(victims.tolist())  # Chaves removidas, comparadas por valor (2 == 2.0), sem converter as da árvore
+            remaining = [key for key in self.keys() if key not in gone]  # Chaves restantes, já ordenadas e com o tipo original
+            self._build_balanced(remaining)  # Reconstrói a árvore com as chaves restantes
+        else:
+            for key in victims.tolist():  # Caso contrário, remove as chaves uma a uma
+                self.remove(key)
+        return removed  # Retorna a máscara de chaves removidas
+
+    def _subtree_keys(self, x):
+        """
+        Gera, sem recursão, as chaves da subárvore enraizada em 'x' em ordem crescente.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        stack = []  # Pilha com os ancestrais ainda não visitados
+        while stack or x != nil:  # Percorre a subárvore em ordem simétrica
+            while x != nil:  # Desce pelo caminho mais à esquerda
+                stack.append(x)
+                x = x.left
+            x = stack.pop()  # Visita o menor nó pendente
+            yield x.key
+            x = x.right  # Passa para a subárvore direita
+
+    def _detach(self, x):
+        """
+        Transforma a subárvore enraizada em 'x' em uma árvore independente: sem pai e com a raiz preta.
+        """
+        if x != self.nil:  # O nó nil não é alterado
+            x.parent = self.nil  # A raiz não possui pai
+            x.color = "Black"  # A raiz é sempre preta
+        return x  # Retorna a raiz da subárvore
+
+    def _detach_height(self, x, height):
+        """
+        Desliga a subárvore 'x', cuja altura negra dentro da árvore é 'height', e retorna (x, altura negra de 'x'
+        como árvore independente): a raiz vermelha passa a ser preta e acrescenta um nível.
+        """
+        height += x.color == "Red"  # Consulta a cor antes de _detach pintar a raiz de preto
+        return self._detach(x), height
+
+    def _join_roots(self, left, left_height, pivot, right, right_height):
+        """
+        Junta as árvores independentes 'left' e 'right' (dadas por suas raízes e alturas negras) pelo nó 'pivot', cuja
+        chave deve ser maior que todas as chaves de 'left' e menor que todas as de 'right'. O pivô é pendurado na árvore
+        mais alta, no nó do caminho lateral com a mesma altura negra da mais baixa, e insert_fixup corrige a possível
+        violação vermelho-vermelho. Como as alturas são conhecidas, a descida e a correção custam
+        O(|left_height - right_height| + 1). Usa self.root como área de trabalho.
+        Retorna (raiz da árvore resultante, altura negra da árvore resultante).
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if left_height == right_height:  # Alturas iguais: o pivô se torna a nova raiz
+            pivot.left = left
+            pivot.right = right
+            pivot.parent = nil
+            pivot.color = "Black"
+            pivot.size = left.size + right.size + 1  # Tamanho da subárvore do pivô
+            if left != nil:
+                left.parent = pivot
+            if right != nil:
+                right.parent = pivot
+            return pivot, left_height + 1  # Retorna a nova raiz, um nível preto acima das duas árvores
+        if left_height > right_height:  # A árvore esquerda é mais alta: desce pelo seu caminho mais à direita
+            self.root = left
+            parent = nil  # Pai do nó atual do caminho
+            x = left  # Nó atual do caminho
+            h = left_height  # Altura negra da subárvore de x
+            while x.color == "Red" or h != right_height:  # Até um nó preto com a altura negra da árvore direita
+                if x.color == "Black":
+                    h -= 1
+                parent = x
+                x = x.right
+            parent.right = pivot  # O pivô ocupa a posição de x
+            pivot.left = x  # x passa a ser o filho esquerdo do pivô
+            pivot.right = right  # A árvore direita passa a ser o filho direito do pivô
+            other = right  # Árvore pendurada no pivô
+        else:  # A árvore direita é mais alta: desce pelo seu caminho mais à esquerda
+            self.root = right
+            parent = nil  # Pai do nó atual do caminho
+            x = right  # Nó atual do caminho
+            h = right_height  # Altura negra da subárvore de x
+            while x.color == "Red" or h != left_height:  # Até um nó preto com a altura negra da árvore esquerda
+                if x.color == "Black":
+                    h -= 1
+                parent = x
+                x = x.left
+            parent.left = pivot  # O pivô ocupa a posição de x
+            pivot.left = left  # A árvore esquerda passa a ser o filho esquerdo do pivô
+            pivot.right = x  # x passa a ser o filho direito do pivô
+            other = left  # Árvore pendurada no pivô
+        pivot.parent = parent
+        pivot.color = "Red"  # O pivô entra vermelho, sem alterar as alturas negras
+        if x != nil:
+            x.parent = pivot
+        if other != nil:
+            other.parent = pivot
+        if self.order_statistics:  # Se o tamanho das subárvores for mantido
+            pivot.size = x.size + other.size + 1  # Tamanho da subárvore do pivô
+            self._adjust_sizes(parent, other.size + 1)  # Os ancestrais ganham o pivô e a outra árvore
+        top = self.root  # Raiz da árvore mais alta
+        # A altura negra só cresce se insert_fixup recolorir a raiz (caso 1 com os dois filhos da raiz vermelhos),
+        # o que pinta os dois filhos de preto; nesse caso não há rotação na raiz
+        grows = top.left.color == "Red" and top.right.color == "Red"
+        self.insert_fixup(pivot)  # Corrige um possível pai vermelho do pivô
+        height = max(left_height, right_height)  # Altura negra da árvore mais alta
+        if grows and top.left.color == "Black":  # A raiz foi recolorida: um nível preto a mais
+            height += 1
+        return self.root, height  # Retorna a raiz e a altura negra da árvore resultante
+
+    def _join_pair(self, left, left_height, right, right_height):
+        """
+        Junta as árvores independentes 'left' e 'right', sem pivô, usando o maior nó de 'left' como pivô.
+        Retorna (raiz da árvore resultante, altura negra da árvore resultante).
+        """
+        if left == self.nil:  # Se uma das árvores for vazia, o resultado é a outra
+            return right, right_height
+        if right == self.nil:
+            return left, left_height
+        self.root = left  # Trabalha sobre a árvore esquerda
+        pivot = self.maximum(left)  # O maior nó da árvore esquerda será o pivô
+        RedBlackTree._remove_node(self, pivot)  # Retira o pivô sem os ganchos das subclasses: não é uma remoção da árvore
+        left = self._detach(self.root)  # A remoção pode reduzir a altura negra, medida de novo no mesmo O(log n)
+        return self._join_roots(left, self._leftmost_black_height(left), pivot, right, right_height)
+
+    def _split_root(self, x, height, key):
+        """
+        Divide a árvore independente de raiz 'x' e altura negra 'height' pela chave 'key'. As alturas negras das
+        subárvores do caminho são calculadas durante a descida, de modo que as junções de cada lado somam O(log n).
+        Retorna (raiz com as chaves menores, sua altura negra, nó com a chave 'key' ou nil,
+        raiz com as chaves maiores, sua altura negra).
+        """
+        nil = self.nil  # Referência local para o nó nil
+        smaller = []  # Nós do caminho menores que 'key' (ficam à esquerda com suas subárvores esquerdas)
+        larger = []  # Nós do caminho maiores que 'key' (ficam à direita com suas subárvores direitas)
+        smaller_heights = []  # Altura negra das subárvores de cada nó de 'smaller'
+        larger_heights = []  # Altura negra das subárvores de cada nó de 'larger'
+        found = nil  # Nó com a chave 'key', se existir
+        while x != nil:  # Desce pelo caminho de busca de 'key'
+            height -= x.color == "Black"  # Altura negra das subárvores de x
+            if key < x.key:
+                larger.append(x)
+                larger_heights.append(height)
+                x = x.left
+            elif x.key < key:
+                smaller.append(x)
+                smaller_heights.append(height)
+                x = x.right
+            else:
+                found = x
+                break
+        left = right = nil  # Raízes das duas partes
+        left_height = right_height = 0  # Alturas negras das duas partes
+        if found != nil:  # As subárvores do nó encontrado são o início das duas partes
+            left, left_height = self._detach_height(found.left, height)
+            right, right_height = self._detach_height(found.right, height)
+            found.left = found.right = found.parent = nil  # Desliga o nó encontrado
+        for node, h in zip(reversed(larger), reversed(larger_heights)):  # Do nó mais profundo para a raiz, junta as subárvores direitas
+            sub = node.right  # Subárvore direita, desligada como em _detach_height (sem a chamada, pois é o laço crítico)
+            if sub != nil:
+                sub.parent = nil
+                if sub.color == "Red":
+                    sub.color = "Black"
+                    h += 1
+            right, right_height = self._join_roots(right, right_height, node, sub, h)
+        for node, h in zip(reversed(smaller), reversed(smaller_heights)):  # Do nó mais profundo para a raiz, junta as subárvores esquerdas
+            sub = node.left  # Subárvore esquerda, desligada como em _detach_height
+            if sub != nil:
+                sub.parent = nil
+                if sub.color == "Red":
+                    sub.color = "Black"
+                    h += 1
+            left, left_height = self._join_roots(sub, h, node, left, left_height)
+        return left, left_height, found, right, right_height  # Retorna as duas partes e o nó com a chave 'key'
+
+    def _spawn(self, root, count):
+        """
+        Cria uma árvore da mesma classe (sem os mixins) que compartilha o nó nil desta árvore e tem raiz 'root'.
+        """
+        cls = type(self)  # Classe da instância
+        while "_mixin_base" in cls.__dict__:  # Desfaz as subclasses dos mixins
+            cls = cls._mixin_base
+        tree = cls(order_statistics=self.order_statistics)  # Cria a árvore vazia
+        tree.nil = self.nil  # Compartilha o nó nil, de modo que os nós possam ser movidos entre as árvores
+        tree.root = root  # Define a raiz da árvore
+        tree.count = count  # Número de chaves, se conhecido
+        return tree  # Retorna a nova árvore
+
+    def _adopt(self, other):
+        """
+        Prepara a árvore 'other' para ter seus nós movidos para esta árvore: as duas devem manter (ou não) o tamanho
+        das subárvores, e os nós de 'other' passam a apontar para o nó nil desta árvore, em O(m) se os nós nil forem diferentes.
+        """
+        if other.order_statistics != self.order_statistics:  # O tamanho das subárvores precisa ser mantido nas duas
+            raise ValueError("As árvores devem ter o mesmo valor de order_statistics.")
+        root = other.root  # Raiz da outra árvore (materializa uma árvore mapeada em memória)
+        nil, old = self.nil, other.nil  # Nós nil das duas árvores
+        if old is not nil:  # Se as árvores não compartilharem o nó nil
+            stack = [root] if root != old else []  # Pilha com os nós a serem religados
+            while stack:
+                node = stack.pop()
+                if node.left == old:
+                    node.left = nil
+                else:
+                    stack.append(node.left)
+                if node.right == old:
+                    node.right = nil
+                else:
+                    stack.append(node.right)
+            if root != old:
+                root.parent = nil
+            other.nil = nil  # A outra árvore passa a usar o nó nil desta árvore
+            other.root = root if root != old else nil
+        return other.root  # Retorna a raiz da outra árvore
+
+    def _empty(self):
+        """
+        Esvazia a árvore depois que seus nós foram movidos para outra árvore (split, join e operações de conjuntos).
+        """
+        self.root = self.nil  # A árvore fica vazia
+        self.count = 0
+
+    def split(self, key):
+        """
+        Divide a árvore em O(log n) em duas árvores: uma com as chaves menores que 'key' e outra com as chaves maiores
+        ou iguais a 'key', retornadas como (left_tree, right_tree). Os nós são movidos, sem cópia: esta árvore fica vazia.
+        """
+        root = self._detach(self.root)  # Raiz da árvore (materializa uma árvore mapeada em memória)
+        left, _, found, right, right_height = self._split_root(root, self._leftmost_black_height(root), key)  # Divide a árvore pela chave
+        if found != self.nil:  # A chave 'key' fica na árvore da direita, como sua menor chave
+            right, _ = self._join_roots(self.nil, 0, found, right, right_height)
+        self._empty()  # Esta árvore fica vazia
+        sizes = self.order_statistics  # Com estatísticas de ordem, o tamanho de cada parte é conhecido
+        return (self._spawn(left, left.size if sizes else None),  # Retorna as duas árvores
+                self._spawn(right, right.size if sizes else None))
+
+    @staticmethod
+    def join(left, pivot, right, value=None):
+        """
+        Junta as árvores 'left' e 'right' com a chave 'pivot' em O(log n), em uma nova árvore.
+        Todas as chaves de 'left' devem ser menores que 'pivot', e todas as de 'right', maiores.
+        Ao juntar dois RedBlackMap, 'value' é o valor associado ao pivô; árvores sem valores não o aceitam.
+        Os nós são movidos, sem cópia: 'left' e 'right' ficam vazias.
+        """
+        if value is not None and not isinstance(left, RedBlackMap):  # Apenas os nós de um mapa guardam valores
+            raise TypeError("Apenas RedBlackMap associa um valor ao pivô.")
+        right_root = left._adopt(right)  # Faz os nós da direita usarem o nó nil da esquerda
+        left_root = left.root  # Raiz da árvore esquerda
+        nil = left.nil  # Nó nil compartilhado
+        if (left_root != nil and not left.maximum(left_root).key < pivot) or \
+                (right_root != nil and not pivot < left.minimum(right_root).key):  # Verifica a ordem das chaves
+            raise ValueError("As chaves de 'left' devem ser menores que o pivô, e as de 'right', maiores.")
+        count = None  # Número de chaves da árvore resultante, se conhecido
+        if left.count is not None and right.count is not None:
+            count = left.count + right.count + 1
+        left_root, right_root = left._detach(left_root), left._detach(right_root)  # Raízes pretas das duas árvores
+        pivot_node = left.NODE(pivot)  # Nó do pivô
+        if isinstance(left, RedBlackMap):  # Em um mapa, o pivô recebe o seu valor
+            pivot_node.value = value
+        root, _ = left._join_roots(left_root, left._leftmost_black_height(left_root), pivot_node,
+                                   right_root, left._leftmost_black_height(right_root))  # Junta as árvores
+        for tree in (left, right):  # As árvores originais ficam vazias
+            tree._empty()
+        return left._spawn(root, count)  # Retorna a árvore resultante
+
+    def union(self, other, executor=None, parallel_depth=2):
+        """
+        Torna esta árvore a união de suas chaves com as chaves de 'other' e a retorna.
+        Veja _set_operation para o custo, o consumo de 'other' e o uso de 'executor'.
+        """
+        return self._set_operation("union", other, executor, parallel_depth)
+
+    def intersection(self, other, executor=None, parallel_depth=2):
+        """
+        Torna esta árvore a interseção de suas chaves com as chaves de 'other' e a retorna.
+        Veja _set_operation para o custo, o consumo de 'other' e o uso de 'executor'.
+        """
+        return self._set_operation("intersection", other, executor, parallel_depth)
+
+    def difference(self, other, executor=None, parallel_depth=2):
+        """
+        Remove desta árvore as chaves presentes em 'other' e a retorna.
+        Veja _set_operation para o custo, o consumo de 'other' e o uso de 'executor'.
+        """
+        return self._set_operation("difference", other, executor, parallel_depth)
+
+    def _set_operation(self, operation, other, executor, parallel_depth):
+        """
+        Aplica a operação de conjuntos 'operation' entre esta árvore e 'other' por divisão e junção (split/join):
+        a raiz de uma árvore divide a outra, as metades são combinadas separadamente e o resultado é juntado pela raiz.
+        Com m chaves na árvore menor e n na maior, o custo é O(m log(n/m + 1)) divisões e junções, em vez das O(m log n)
+        buscas de inserções e remoções uma a uma. Os nós são reaproveitados, sem cópia: esta árvore recebe o resultado
+        e 'other' fica vazia. Combinar a árvore consigo mesma não altera a união e a interseção, e esvazia a diferença.
+        Se 'executor' (por exemplo um concurrent.futures.ProcessPoolExecutor) for informado, os 2 ** parallel_depth
+        subproblemas independentes abaixo dos primeiros níveis são enviados a ele como listas ordenadas de chaves e
+        suas respostas são reconstruídas e juntadas aqui. A serialização das chaves custa O(n), então isso só compensa
+        para árvores grandes.
+        """
+        if other is self:  # A árvore combinada consigo mesma: não há nós a mover
+            if operation == "difference":  # Todas as chaves são removidas
+                self._empty()
+            return self  # Retorna esta árvore
+        other_root = self._detach(self._adopt(other))  # Raiz da outra árvore, com o nó nil desta árvore
+        root = self._detach(self.root)  # Raiz desta árvore (materializa uma árvore mapeada em memória)
+        self.count = None  # O contador é desconhecido durante a operação
+        problem = (root, self._leftmost_black_height(root), other_root, self._leftmost_black_height(other_root))  # Raízes e alturas negras
+        gc_enabled = gc.isenabled()  # Guarda o estado do coletor de lixo
+        gc.disable()  # As tuplas de raízes e alturas de cada passo disparariam o coletor sobre todos os nós
+        try:
+            if executor is None:  # Execução sequencial
+                root, _ = self._combine(operation, *problem)
+            else:  # Envia os subproblemas dos níveis inferiores ao executor
+                root, _ = self._assemble(self._plan(operation, *problem, parallel_depth, executor))
+        finally:
+            if gc_enabled:  # Restaura o coletor de lixo
+                gc.enable()
+        self.root = self._detach(root)  # Define a raiz do resultado
+        self.count = root.size if self.order_statistics else None  # Com estatísticas de ordem, o tamanho é conhecido
+        other._empty()  # A outra árvore fica vazia (ela já usa o nó nil desta árvore)
+        return self  # Retorna esta árvore
+
+    def _set_base(self, operation, a, a_height, b, b_height):
+        """
+        Retorna (raiz, altura negra) do resultado da operação entre as árvores de raízes 'a' e 'b' se uma delas for
+        vazia, ou None.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if a == nil:  # A árvore da esquerda está vazia
+            return (b, b_height) if operation == "union" else (nil, 0)
+        if b == nil:  # A árvore da direita está vazia
+            return (nil, 0) if operation == "intersection" else (a, a_height)
+        return None  # Nenhuma das árvores está vazia
+
+    def _set_step(self, operation, a, a_height, b, b_height):
+        """
+        Divide o problema entre as árvores de raízes 'a' e 'b' (não vazias) pela raiz de uma delas.
+        Retorna (pivô, se o pivô pertence ao resultado, a1, altura de a1, b1, altura de b1, a2, altura de a2, b2,
+        altura de b2), em que (a1, b1) são as raízes do subproblema da esquerda e (a2, b2), as do subproblema da direita.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if operation == "difference":  # A raiz de 'b' divide 'a' e nunca pertence ao resultado
+            pivot, keep, h = b, False, b_height - 1  # Altura negra das subárvores da raiz preta de 'b'
+            left, left_height, found, right, right_height = self._split_root(a, a_height, b.key)
+        else:  # A raiz de 'a' divide 'b'
+            pivot, h = a, a_height - 1  # Altura negra das subárvores da raiz preta de 'a'
+            left, left_height, found, right, right_height = self._split_root(b, b_height, a.key)
+            keep = operation == "union" or found != nil  # Na interseção, a raiz de 'a' precisa estar em 'b'
+        first, first_height = pivot.left, h  # Subárvores do pivô, desligadas como em _detach_height
+        if first != nil:
+            first.parent = nil
+            if first.color == "Red":
+                first.color = "Black"
+                first_height += 1
+        second, second_height = pivot.right, h
+        if second != nil:
+            second.parent = nil
+            if second.color == "Red":
+                second.color = "Black"
+                second_height += 1
+        if operation == "difference":
+            return (pivot, keep, left, left_height, first, first_height,
+                    right, right_height, second, second_height)
+        return (pivot, keep, first, first_height, left, left_height,
+                second, second_height, right, right_height)
+
+    def _combine(self, operation, a, a_height, b, b_height):
+        """
+        Retorna (raiz, altura negra) da árvore resultante da operação entre as árvores de raízes 'a' e 'b'.
+        A profundidade da recursão é limitada pela altura das árvores, O(log n).
+        """
+        base = self._set_base(operation, a, a_height, b, b_height)  # Caso em que uma das árvores é vazia
+        if base is not None:
+            return base
+        pivot, keep, a1, h1, b1, g1, a2, h2, b2, g2 = self._set_step(operation, a, a_height, b, b_height)  # Divide o problema pela raiz
+        left, left_height = self._combine(operation, a1, h1, b1, g1)  # Combina as chaves menores que o pivô
+        right, right_height = self._combine(operation, a2, h2, b2, g2)  # Combina as chaves maiores que o pivô
+        if keep:  # Junta as duas partes pelo pivô
+            return self._join_roots(left, left_height, pivot, right, right_height)
+        return self._join_pair(left, left_height, right, right_height)  # Junta as duas partes sem o pivô
+
+    def _plan(self, operation, a, a_height, b, b_height, depth, executor):
+        """
+        Divide o problema como _combine nos 'depth' primeiros níveis e envia os subproblemas restantes a 'executor'.
+        Retorna um plano: ("done", raiz, altura negra), ("task", futuro) ou
+        ("join", pivô, mantém o pivô, plano esquerdo, plano direito).
+        """
+        base = self._set_base(operation, a, a_height, b, b_height)  # Caso em que uma das árvores é vazia
+        if base is not None:
+            return ("done", *base)
+        if depth == 0:  # Envia o subproblema ao executor como listas ordenadas de chaves
+            a_keys = list(self._subtree_keys(a))
+            b_keys = list(self._subtree_keys(b))
+            return "task", executor.submit(_set_operation_keys, operation, a_keys, b_keys)
+        pivot, keep, a1, h1, b1, g1, a2, h2, b2, g2 = self._set_step(operation, a, a_height, b, b_height)  # Divide o problema pela raiz
+        return ("join", pivot, keep, self._plan(operation, a1, h1, b1, g1, depth - 1, executor),
+                self._plan(operation, a2, h2, b2, g2, depth - 1, executor))
+
+    def _assemble(self, plan):
+        """
+        Aguarda os subproblemas enviados por _plan e junta suas respostas, retornando (raiz, altura negra) da árvore
+        resultante.
+        """
+        if plan[0] == "done":  # Subproblema resolvido durante o plano
+            return plan[1], plan[2]
+        if plan[0] == "task":  # Reconstrói a subárvore a partir das chaves calculadas pelo executor
+            root = self._build_nodes(plan[1].result())
+            return root, self._leftmost_black_height(root)
+        _, pivot, keep, left_plan, right_plan = plan  # Junta as respostas das duas metades
+        left, left_height = self._assemble(left_plan)
+        right, right_height = self._assemble(right_plan)
+        if keep:
+            return self._join_roots(left, left_height, pivot, right, right_height)
+        return self._join_pair(left, left_height, right, right_height)
+
+    def save(self, path):
+        """
+        Salva a árvore no arquivo binário 'path': um cabeçalho de 32 bytes seguido das chaves ordenadas, em little-endian.
+        A forma e as cores não precisam ser gravadas, pois a carga reconstrói a árvore balanceada canônica de bulk_load.
+        As chaves devem ser todas inteiras (gravadas como int64) ou todas de ponto flutuante (gravadas como float64).
+        O arquivo é escrito em um arquivo temporário e depois renomeado, de modo que um snapshot anterior nunca fica corrompido.
+        """
+        _write_snapshot(path, np.array(list(self.keys())), self.order_statistics)  # Grava as chaves em ordem crescente
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=True):
+        """
+        Carrega uma árvore salva por 'save'. Se 'mmap' for True, retorna uma MappedRedBlackTree que responde a buscas
+        e varreduras de intervalo diretamente sobre o arquivo mapeado em memória, sem criar nós; os nós só são criados
+        quando a árvore é modificada. Caso contrário, a árvore é reconstruída imediatamente em tempo linear.
+        Se 'verify' for True, o checksum das chaves é conferido.
+        """
+        keys, flags = _read_snapshot(path, mmap, verify)  # Lê e verifica as chaves do arquivo
+        if mmap:  # Retorna a árvore servida diretamente pelo arquivo
+            return MappedRedBlackTree(keys, order_statistics=bool(flags & 1))
+        tree = cls(order_statistics=bool(flags & 1))  # Cria a árvore vazia
+        tree._build_balanced(keys.tolist())  # As chaves já estão ordenadas e sem duplicatas
+        return tree  # Retorna a árvore carregada
+
     def inorder(self, node):
         """
         Realiza um percurso em ordem na árvore, imprimindo as chaves dos nós e suas cores.
         """
-        if node != self.nil:  # Verifica se o nó não é o nó nil
-            self.inorder(node.left)  # Realiza um percurso em ordem no filho esquerdo do nó
+        stack = []  # Pilha explícita, evitando o limite de recursão em árvores profundas
+        while stack or node != self.nil:  # Enquanto houver nós a serem visitados
+            while node != self.nil:  # Desce pela esquerda empilhando os nós
+                stack.append(node)
+                node = node.left
+            node = stack.pop()  # Visita o nó de menor chave ainda não visitado
             print(node.key, node.color)  # Imprime a chave e a cor do nó
-            self.inorder(node.right)  # Realiza um percurso em ordem no filho direito do nó
+            node = node.right  # Passa para a subárvore direita
+
+    def height(self):
+        """
+        Retorna a altura da árvore (quantidade de nós no caminho mais longo da raiz até uma folha), em O(n).
+        """
+        best = 0  # Maior profundidade encontrada
+        stack = [(self.root, 1)]  # Pilha com os nós e suas profundidades
+        while stack:  # Enquanto houver nós a serem visitados
+            node, depth = stack.pop()  # Retira o próximo nó da pilha
+            if node != self.nil:  # Ignora o nó nil
+                best = max(best, depth)  # Atualiza a maior profundidade
+                stack.append((node.left, depth + 1))  # Visita o filho esquerdo
+                stack.append((node.right, depth + 1))  # Visita o filho direito
+        return best  # Retorna a altura da árvore
+
+    def black_height(self):
+        """
+        Retorna a altura negra da árvore (quantidade de nós pretos da raiz até uma folha, sem contar o nó nil), em O(log n).
+        """
+        h = 0  # Quantidade de nós pretos encontrados
+        x = self.root  # Começa pela raiz da árvore
+        while x != self.nil:  # Desce pelo caminho mais à esquerda
+            if x.color == "Black":  # Conta os nós pretos
+                h += 1
+            x = x.left
+        return h  # Retorna a altura negra
+
+    def enable_instrumentation(self):
+        """
+        Habilita os contadores de operações internas (self.stats) e os ganchos de tempo por operação (add_hook).
+        A instância passa a usar uma subclasse instrumentada; com a instrumentação desabilitada, os métodos são os
+        originais e não há nenhum custo adicional.
+        """
+        if isinstance(self, InstrumentedTreeMixin):  # A instrumentação já está habilitada
+            return
+        if isinstance(self, MappedRedBlackTree):  # Uma árvore mapeada em memória é materializada antes
+            self._materialize()
+        self.stats = TreeStats()  # Contadores das operações internas
+        self.hooks = []  # Funções chamadas com o nome e a duração de cada operação
+        self._timing = False  # Indica se uma operação cronometrada está em andamento
+        _add_mixin(self, InstrumentedTreeMixin)  # Passa a usar a subclasse instrumentada
+
+    def disable_instrumentation(self):
+        """
+        Desabilita a instrumentação, voltando a usar os métodos originais. Os contadores acumulados são mantidos em self.stats.
+        """
+        _remove_mixin(self, InstrumentedTreeMixin)  # Volta a usar os métodos originais
 
     def check_balanced(self):
         """
         Verifica se a árvore está balanceada, garantindo que todos os caminhos da raiz até as folhas contenham o mesmo número de nós pretos.
         """
-        if self.root == self.nil:  # Verifica se a raiz é o nó nil
-            return True  # Retorna True se a árvore estiver vazia
-        black_count = 0  # Contador para o número de nós pretos em um caminho da raiz até as folhas
-
-        def is_balanced_util(node, black_count, current_count):
+        black_count = None  # Número de nós pretos do primeiro caminho encontrado
+        stack = [(self.root, 0)]  # Pilha com os nós e a quantidade de nós pretos acima deles
+        while stack:  # Enquanto houver nós a serem visitados, sem recursão
+            node, current_count = stack.pop()  # Retira o próximo nó da pilha
+            if node == self.nil:  # Se o caminho chegou ao nó nil
+                if black_count is None:  # Se este for o primeiro caminho
+                    black_count = current_count  # Guarda a quantidade de nós pretos do caminho
+                elif black_count != current_count:  # Se o caminho tiver uma quantidade diferente de nós pretos
+                    return False  # Retorna False, pois os caminhos não têm o mesmo número de nós pretos
+                continue
             if node.color == "Black":  # Verifica se o nó é preto
                 current_count += 1  # Incrementa o contador de nós pretos no caminho atual
-            if node == self.nil:  # Verifica se o nó é o nó nil
-                if black_count == 0:  # Se o contador de nós pretos for zero
-                    black_count = current_count  # Define o contador de nós pretos como o contador atual
-                else:
-                    if black_count != current_count:  # Se o contador de nós pretos for diferente do contador atual
-                        return False  # Retorna False, pois os caminhos não têm o mesmo número de nós pretos
-            if node.left != self.nil:  # Verifica se há um filho esquerdo do nó
-                if not is_balanced_util(node.left, black_count, current_count):  # Chama recursivamente a função para o filho esquerdo
-                    return False  # Retorna False se o filho esquerdo não estiver balanceado
-            if node.right != self.nil:  # Verifica se há um filho direito do nó
-                if not is_balanced_util(node.right, black_count, current_count):  # Chama recursivamente a função para o filho direito
-                    return False  # Retorna False se o filho direito não estiver balanceado
-            return True  # Retorna True se todos os caminhos da raiz até as folhas tiverem o mesmo número de nós pretos
-
-        return is_balanced_util(self.root, black_count, 0)  # Chama a função auxiliar para verificar se a árvore está balanceada
-
-def plot(tree):
-    """
-    Função para plotar a árvore Rubro-Negra usando o NetworkX e o Matplotlib.
-    """
-    # Cria um grafo direcionado
-    G = nx.DiGraph()
-
-    # Função para adicionar as arestas do grafo com base na árvore
-    def add_edges(node):
-        if node != tree.nil:  # Verifica se o nó não é um nó nil
-            if node.left != tree.nil:
-                # Adiciona uma aresta entre o nó e seu filho esquerdo
-                G.add_edge(node.key, node.left.key)
-                # Chama recursivamente a função para o filho esquerdo
-                add_edges(node.left)
-            if node.right != tree.nil:
-                # Adiciona uma aresta entre o nó e seu filho direito
-                G.add_edge(node.key, node.right.key)
-                # Chama recursivamente a função para o filho direito
-                add_edges(node.right)
-
-    # Chama a função add_edges para adicionar todas as arestas da árvore ao grafo
-    add_edges(tree.root)
-
-    # Função para calcular a altura máxima da árvore
-    def max_depth(node):
-        if node == tree.nil:  # Se o nó for nil, a altura é 0
-            return 0
-        # Retorna a altura máxima entre o filho esquerdo e o filho direito, mais 1
-        return max(max_depth(node.left), max_depth(node.right)) + 1
-
-    # Calcula a altura máxima da árvore
-    max_height = max_depth(tree.root)
-
-    # Calcula a posição de cada nó com base em sua profundidade na árvore
-    pos = {}  # Dicionário para armazenar as posições dos nós
-    depth = {tree.nil: 0}  # Dicionário para armazenar as profundidades dos nós
-
-    def compute_position(node, x=0, y=0, level=1):
-        if node != tree.nil:  # Verifica se o nó não é um nó nil
-            if level not in depth:
-                depth[level] = 0
-            # Define a posição do nó com base em sua profundidade
-            pos[node.key] = (x, -y)
-            depth[level] += 1
-            # Calcula o deslocamento horizontal com base na altura máxima e no nível atual
-            dx = 2 ** (max_height - level + 1)
-            # Chama recursivamente a função para os filhos esquerdo e direito
-            compute_position(node.left, x - dx, y + 1, level + 1)
-            compute_position(node.right, x + dx, y + 1, level + 1)
-
-    # Calcula as posições dos nós na árvore
-    compute_position(tree.root)
-
-    # Função para obter a cor de um nó da árvore
-    def get_node_color(node):
-        if node.color == "Red":  # Se o nó for vermelho, retorna "red"
-            return "red"
-        else:
-            return "black"  # Caso contrário, retorna "black"
-
-    # Lista para armazenar as cores dos nós da árvore
-    node_colors = []
-
-    # Função para coletar as cores dos nós da árvore
-    def collect_node_colors(node):
-        if node != tree.nil:  # Verifica se o nó não é um nó nil
-            # Adiciona a cor do nó à lista de cores
-            node_colors.append(get_node_color(node))
-            # Chama recursivamente a função para os filhos esquerdo e direito
-            collect_node_colors(node.left)
-            collect_node_colors(node.right)
-
-    # Coleta as cores dos nós da árvore
-    collect_node_colors(tree.root)
-
-    # Tamanho dos nós na plotagem
-    node_size = 500
-    # Cor das bordas dos nós na plotagem
-    node_edge_color = "black"
-    # Plota a árvore usando o NetworkX
-    nx.draw_networkx(G, pos, node_size=node_size, with_labels=True, font_color='white', edgecolors=node_edge_color, node_color=node_colors)
-    # Define o título da plotagem
-    plt.title("Árvore Rubro-Negra")
-    # Exibe a plotagem
-    plt.show()
+            stack.append((node.left, current_count))  # Visita o filho esquerdo
+            stack.append((node.right, current_count))  # Visita o filho direito
+        return True  # Retorna True se todos os caminhos tiverem o mesmo número de nós pretos
 
-def interface():
+    def _node_violation(self, node, lo, hi):
+        """
+        Verifica as propriedades locais de 'node', cujas chaves devem estar estritamente entre 'lo' e 'hi' (None indica sem limite).
+        Retorna a descrição da primeira violação encontrada ou None.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if node.color not in ("Red", "Black"):  # Todo nó é vermelho ou preto
+            return f"cor inválida {node.color!r}"
+        if (lo is not None and not lo < node.key) or (hi is not None and not node.key < hi):  # Ordem da árvore de busca
+            return f"a chave {node.key} está fora do intervalo ({lo}, {hi}) imposto pelos ancestrais"
+        if node.left != nil and node.left.parent != node:  # Ponteiro para o pai do filho esquerdo
+            return "o filho esquerdo não aponta para o nó como pai"
+        if node.right != nil and node.right.parent != node:  # Ponteiro para o pai do filho direito
+            return "o filho direito não aponta para o nó como pai"
+        if node.color == "Red" and (node.left.color == "Red" or node.right.color == "Red"):  # Nó vermelho com filho vermelho
+            return "nó vermelho com filho vermelho"
+        if self.order_statistics and node.size != node.left.size + node.right.size + 1:  # Tamanho da subárvore
+            return f"tamanho da subárvore {node.size} diferente de {node.left.size + node.right.size + 1}"
+        return None  # Nenhuma violação encontrada
+
+    def _leftmost_black_height(self, x):
+        """
+        Retorna a quantidade de nós pretos no caminho mais à esquerda da subárvore enraizada em 'x'.
+        """
+        h = 0  # Quantidade de nós pretos encontrados
+        while x != self.nil:  # Desce pelo caminho mais à esquerda
+            if x.color == "Black":
+                h += 1
+            x = x.left
+        return h  # Retorna a altura negra da subárvore
+
+    def validate(self):
+        """
+        Verifica, em O(n) e sem recursão, todas as propriedades da árvore Rubro-Negra e da árvore de busca: raiz e nó nil
+        pretos, cores válidas, nenhum nó vermelho com filho vermelho, mesma quantidade de nós pretos em todos os caminhos,
+        ordem das chaves, ponteiros para o pai, tamanho das subárvores (com estatísticas de ordem) e número de chaves.
+        Retorna None se a árvore for válida, ou uma tupla (nó, motivo) com o primeiro nó que viola alguma propriedade.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if nil.color != "Black":  # O nó nil é preto
+            return nil, "o nó nil não é preto"
+        if self.root.color != "Black":  # A raiz é preta
+            return self.root, "a raiz não é preta"
+        if self.root != nil and self.root.parent != nil:  # A raiz não tem pai
+            return self.root, "a raiz possui um pai"
+        count = 0  # Quantidade de nós visitados
+        heights = []  # Alturas negras das subárvores já verificadas
+        stack = [(self.root, None, None, False)]  # Pilha com (nó, limite inferior, limite superior, filhos já verificados)
+        while stack:  # Percorre a árvore em pós-ordem
+            node, lo, hi, done = stack.pop()  # Retira o próximo nó da pilha
+            if node == nil:  # O nó nil tem altura negra 0
+                heights.append(0)
+                continue
+            if not done:  # Primeira visita: verifica as propriedades locais e agenda os filhos
+                reason = self._node_violation(node, lo, hi)
+                if reason is not None:
+                    return node, reason
+                count += 1  # Conta o nó
+                stack.append((node, lo, hi, True))  # Volta ao nó depois dos filhos
+                stack.append((node.right, node.key, hi, False))  # Agenda o filho direito
+                stack.append((node.left, lo, node.key, False))  # Agenda o filho esquerdo
+            else:  # Segunda visita: compara as alturas negras dos filhos
+                right = heights.pop()  # Altura negra da subárvore direita
+                left = heights.pop()  # Altura negra da subárvore esquerda
+                if left != right:
+                    return node, f"alturas negras diferentes nas subárvores esquerda ({left}) e direita ({right})"
+                heights.append(left + (node.color == "Black"))  # Altura negra da subárvore do nó
+        if self.count is not None and count != self.count:  # O contador de chaves, se conhecido, deve corresponder aos nós da árvore
+            return self.root, f"a árvore contém {count} nós, mas o contador indica {self.count}"
+        return None  # A árvore é válida
+
+    def enable_debug_checks(self):
+        """
+        Habilita a verificação incremental: após cada inserção e remoção, as propriedades são verificadas apenas
+        no caminho alterado (da posição modificada até a raiz) e nos filhos de seus nós, sem percorrer a árvore inteira.
+        Uma violação lança InvariantError. Assim como a instrumentação, não há custo quando desabilitada.
+        """
+        if not isinstance(self, DebugCheckedTreeMixin):  # Se a verificação ainda não estiver habilitada
+            if isinstance(self, MappedRedBlackTree):  # Uma árvore mapeada em memória é materializada antes
+                self._materialize()
+            _add_mixin(self, DebugCheckedTreeMixin)  # Passa a usar a subclasse com verificação
+
+    def disable_debug_checks(self):
+        """
+        Desabilita a verificação incremental.
+        """
+        _remove_mixin(self, DebugCheckedTreeMixin)  # Volta a usar os métodos originais
+
+    def enable_journal(self, directory, **options):
+        """
+        Habilita o journal no diretório 'directory': grava um checkpoint com as chaves atuais e, a partir daí,
+        registra cada inserção e remoção antes de aplicá-la (veja Journal, cujos parâmetros podem ser passados em
+        'options'). Após uma queda, a árvore é reconstruída por RedBlackTree.recover(directory).
+        """
+        if isinstance(self, JournaledTreeMixin):  # O journal já está habilitado
+            return
+        if isinstance(self, RedBlackMap):  # O journal registra apenas chaves, não os valores associados
+            raise TypeError("O journal não suporta RedBlackMap.")
+        if isinstance(self, MappedRedBlackTree):  # Uma árvore mapeada em memória é materializada antes
+            self._materialize()
+        journal = Journal(directory, **options)  # Abre o journal
+        try:
+            journal.checkpoint(self)  # Estado inicial, sobre o qual as operações serão aplicadas
+        except TypeError:  # As chaves atuais não podem ser gravadas
+            journal.close()
+            raise
+        self.journal = journal
+        _add_mixin(self, JournaledTreeMixin)  # Passa a registrar as operações
+
+    def disable_journal(self):
+        """
+        Grava as operações pendentes, fecha o journal e deixa de registrar as operações.
+        """
+        if isinstance(self, JournaledTreeMixin):
+            self.journal.close()  # Grava as operações pendentes e encerra as threads
+            _remove_mixin(self, JournaledTreeMixin)  # Volta a usar os métodos originais
+
+    @classmethod
+    def recover(cls, directory, order_statistics=False, **options):
+        """
+        Reconstrói a árvore gravada pelo journal de 'directory' (o último checkpoint mais as operações registradas
+        depois dele) e continua registrando as operações seguintes no mesmo diretório.
+        """
+        if issubclass(cls, RedBlackMap):  # O journal registra apenas chaves, não os valores associados
+            raise TypeError("O journal não suporta RedBlackMap.")
+        keys, _ = Journal.replay(directory, repair=True)  # Chaves ordenadas e sem duplicatas
+        if keys.dtype.kind == "f":  # Mantém o tipo das chaves gravadas
+            options.setdefault("typecode", "d")
+        tree = cls(order_statistics=order_statistics)  # Cria a árvore vazia
+        tree._build_balanced(keys.tolist())  # Constrói a árvore em tempo linear, sem registrar as chaves
+        tree.journal = Journal(directory, **options)  # Continua em um novo segmento, depois dos já existentes
+        _add_mixin(tree, JournaledTreeMixin)  # Passa a registrar as operações
+        return tree  # Retorna a árvore recuperada
+
+def _set_operation_keys(operation, a_keys, b_keys):
     """
-    Função para interagir com a árvore Rubro-Negra, permitindo ao usuário inserir e remover nós, verificar se a árvore está balanceada e plotar a árvore.
+    Aplica a operação de conjuntos 'operation' às listas ordenadas de chaves 'a_keys' e 'b_keys' e retorna a lista
+    ordenada resultante. Executada pelos processos de RedBlackTree._set_operation, por isso é uma função de módulo.
     """
-    rb_tree = RedBlackTree()  # Cria uma nova instância da classe RedBlackTree
-    while True:  # Loop infinito
-        print("\nÁrvore Rubro-Negra:")
-        rb_tree.inorder(rb_tree.root)  # Realiza um percurso em ordem na árvore e imprime as chaves e cores dos nós
-        print("\n1 - Inserir nó")
-        print("2 - Remover nó")
-        print("3 - Verificar se a árvore está balanceada")
-        print("4 - Plotar a árvore Rubro-Negra")
-        print("5 - Sair")
-        option = input("Escolha uma opção: ")  # Solicita ao usuário que escolha uma opção
-        if option == "1":  # Se a opção escolhida for inserir um nó
-            key = int(input("Digite a chave do nó a ser inserido: "))  # Solicita ao usuário que digite a chave do nó a ser inserido
-            rb_tree.insert(key)  # Insere o nó com a chave digitada na árvore
-        elif option == "2":  # Se a opção escolhida for remover um nó
-            key = int(input("Digite a chave do nó a ser removido: "))  # Solicita ao usuário que digite a chave do nó a ser removido
-            rb_tree.remove(key)  # Remove o nó com a chave digitada da árvore
-        elif option == "3":  # Se a opção escolhida for verificar se a árvore está balanceada
-            print("A árvore está balanceada:", rb_tree.check_balanced())  # Verifica se a árvore está balanceada e imprime o resultado
-        elif option == "4":  # Se a opção escolhida for plotar a árvore Rubro-Negra
-            plot(rb_tree)  # Chama a função para plotar a árvore
-        elif option == "5":  # Se a opção escolhida for sair
-            break  # Sai do loop
-        else:
-            print("Opção inválida. Tente novamente.")  # Imprime uma mensagem de erro se a opção escolhida for inválida
+    if operation == "union":
+        return sorted(set(a_keys).union(b_keys))
+    if operation == "intersection":
+        return sorted(set(a_keys).intersection(b_keys))
+    return sorted(set(a_keys).difference(b_keys))
+
+class TreeCursor:
+    """
+    Cursor com estado sobre uma RedBlackTree, que se move entre chaves vizinhas pelos ponteiros para o pai.
+    O cursor deixa de ser válido se o nó em que está posicionado for removido da árvore.
+    """
+
+    def __init__(self, tree):
+        """
+        Cria um cursor sobre a árvore 'tree', inicialmente fora de qualquer chave.
+        """
+        self.tree = tree  # Árvore percorrida pelo cursor
+        self.node = tree.nil  # Nó em que o cursor está posicionado (nil indica fora da árvore)
+
+    @property
+    def key(self):
+        """
+        Chave em que o cursor está posicionado (None se estiver fora da árvore).
+        """
+        return self.node.key  # A chave do nó nil é None
+
+    def valid(self):
+        """
+        Retorna True se o cursor estiver posicionado em uma chave.
+        """
+        return self.node != self.tree.nil  # O cursor é válido se não estiver no nó nil
+
+    def first(self):
+        """
+        Posiciona o cursor na menor chave da árvore e a retorna.
+        """
+        tree = self.tree  # Referência local para a árvore
+        self.node = tree.minimum(tree.root) if tree.root != tree.nil else tree.nil  # Move o cursor para o menor nó
+        return self.node.key  # Retorna a chave (None se a árvore estiver vazia)
+
+    def last(self):
+        """
+        Posiciona o cursor na maior chave da árvore e a retorna.
+        """
+        tree = self.tree  # Referência local para a árvore
+        self.node = tree.maximum(tree.root) if tree.root != tree.nil else tree.nil  # Move o cursor para o maior nó
+        return self.node.key  # Retorna a chave (None se a árvore estiver vazia)
+
+    def seek(self, key):
+        """
+        Posiciona o cursor na menor chave maior ou igual a 'key' e a retorna (None se não houver).
+        """
+        self.node = self.tree.lower_bound(key)  # Move o cursor para o primeiro nó a partir de 'key'
+        return self.node.key  # Retorna a chave encontrada
+
+    def next(self):
+        """
+        Avança o cursor para a próxima chave e a retorna (None se o cursor passar da maior chave).
+        """
+        if self.node != self.tree.nil:  # Se o cursor estiver em uma chave
+            self.node = self.tree.successor(self.node)  # Move o cursor para o sucessor
+        return self.node.key  # Retorna a nova chave
+
+    def prev(self):
+        """
+        Recua o cursor para a chave anterior e a retorna (None se o cursor passar da menor chave).
+        """
+        if self.node != self.tree.nil:  # Se o cursor estiver em uma chave
+            self.node = self.tree.predecessor(self.node)  # Move o cursor para o predecessor
+        return self.node.key  # Retorna a nova chave
+
+class MappedRedBlackTree(RedBlackTree):
+    """
+    Árvore Rubro-Negra carregada de um snapshot mapeado em memória (veja RedBlackTree.load).
+    Buscas, varreduras de intervalo e estatísticas de ordem são respondidas por busca binária sobre o array ordenado
+    de chaves, sem criar nós. Na primeira modificação, ou no primeiro acesso aos nós (root), a árvore é materializada
+    em tempo linear e o objeto passa a ser uma RedBlackTree comum.
+    """
+
+    def __init__(self, keys, order_statistics=False):
+        """
+        Cria a árvore sobre o array ordenado e sem duplicatas 'keys'.
+        """
+        self._mapped = keys  # Array de chaves servido diretamente do arquivo
+        super().__init__(order_statistics=order_statistics)  # Inicializa a árvore vazia
+        self.count = len(keys)  # Número de chaves do snapshot
+
+    @property
+    def root(self):
+        """
+        Raiz da árvore; acessá-la materializa os nós.
+        """
+        self._materialize()  # Cria os nós a partir do array de chaves
+        return self.__dict__["root"]  # Retorna a raiz da árvore materializada
+
+    @root.setter
+    def root(self, value):
+        self.__dict__["root"] = value  # Guarda a raiz no dicionário da instância
+
+    def _materialize(self):
+        """
+        Cria os nós da árvore a partir do array de chaves e transforma o objeto em uma RedBlackTree comum.
+        """
+        keys = self._mapped.tolist()  # Copia as chaves do arquivo para objetos Python
+        self._mapped = None  # Libera o mapeamento do arquivo
+        self.__class__ = RedBlackTree  # A partir daqui a árvore é uma RedBlackTree comum
+        self._build_balanced(keys)  # Constrói a árvore balanceada em tempo linear
+
+    def _key(self, i):
+        """
+        Retorna a i-ésima chave do array como um objeto Python.
+        """
+        return self._mapped[i].item()  # Converte o escalar do NumPy em int ou float
+
+    def search(self, key):
+        """
+        Procura a chave 'key' por busca binária e retorna um nó avulso com a chave (ou o nó nil se ela não existir).
+        """
+        keys = self._mapped  # Array de chaves
+        i = int(np.searchsorted(keys, key))  # Posição da primeira chave maior ou igual a 'key'
+        if i < len(keys) and keys[i] == key:  # Se a chave estiver no array
+            return Node(self._key(i), self.nil, "Black")  # Retorna um nó avulso com a chave
+        return self.nil  # Retorna o nó nil se a chave não for encontrada
+
+    def search_many(self, keys, return_positions=False):
+        """
+        Procura um array de chaves com uma única busca binária vetorizada. Assim como na árvore materializada,
+        'return_positions' requer order_statistics=True, embora os ranks venham diretamente do array.
+        """
+        if return_positions:  # Mesma exigência da árvore materializada
+            self._require_order_statistics()
+        keys = np.asarray(keys)  # Converte a entrada em um array do NumPy
+        positions = np.searchsorted(self._mapped, keys)  # Rank de cada chave
+        found = np.zeros(len(keys), dtype=bool)  # Máscara de chaves encontradas
+        inside = positions < len(self._mapped)  # Chaves cujo rank aponta para uma posição válida
+        found[inside] = self._mapped[positions[inside]] == keys[inside]  # Compara com a chave na posição
+        return (found, positions.astype(np.int64)) if return_positions else found  # Retorna a máscara (e os ranks)
+
+    def iter_range(self, lo=None, hi=None, reverse=False, chunk=4096):
+        """
+        Gera as chaves do intervalo fechado [lo, hi] a partir do array, em blocos de 'chunk' chaves.
+        """
+        keys = self._mapped  # Array de chaves
+        start = 0 if lo is None else int(np.searchsorted(keys, lo, side="left"))  # Primeira posição do intervalo
+        stop = len(keys) if hi is None else int(np.searchsorted(keys, hi, side="right"))  # Posição após o intervalo
+        if not reverse:  # Percurso em ordem crescente
+            for i in range(start, stop, chunk):  # Percorre o intervalo em blocos
+                yield from keys[i:min(i + chunk, stop)].tolist()  # Gera as chaves do bloco
+        else:  # Percurso em ordem decrescente
+            for i in range(stop, start, -chunk):  # Percorre o intervalo em blocos, do fim para o início
+                yield from reversed(keys[max(i - chunk, start):i].tolist())  # Gera as chaves do bloco em ordem inversa
+
+    def rank(self, key):
+        """
+        Retorna a quantidade de chaves menores que 'key' por busca binária.
+        """
+        self._require_order_statistics()  # Mesma exigência da árvore materializada
+        return int(np.searchsorted(self._mapped, key, side="left"))  # Posição da primeira chave maior ou igual
+
+    def select(self, i):
+        """
+        Retorna a i-ésima menor chave (começando em 0) por acesso direto ao array.
+        """
+        self._require_order_statistics()  # Mesma exigência da árvore materializada
+        if not -self.count <= i < self.count:  # Verifica se o índice está dentro dos limites
+            raise IndexError("Índice fora dos limites da árvore.")
+        return self._key(i)  # Retorna a chave na posição
+
+    def count_range(self, lo, hi):
+        """
+        Retorna a quantidade de chaves no intervalo fechado [lo, hi] por busca binária.
+        """
+        if hi < lo:  # Se o intervalo estiver vazio
+            return 0
+        self._require_order_statistics()  # Mesma exigência da árvore materializada
+        keys = self._mapped  # Array de chaves
+        return int(np.searchsorted(keys, hi, side="right") - np.searchsorted(keys, lo, side="left"))  # Diferença entre as posições
+
+    def percentile(self, p):
+        """
+        Retorna a chave no percentil 'p' (entre 0 e 100) pelo método do posto mais próximo.
+        """
+        self._require_order_statistics()  # Mesma exigência da árvore materializada
+        if not 0 <= p <= 100:  # Verifica se o percentil é válido
+            raise ValueError("O percentil deve estar entre 0 e 100.")
+        if self.count == 0:  # Uma árvore vazia não possui percentis
+            raise IndexError("A árvore está vazia.")
+        return self._key(int(max(0, -(-p * self.count // 100) - 1)))  # Posto mais próximo: ceil(p / 100 * n), começando em 0
+
+    def insert(self, key):
+        """
+        Materializa a árvore e insere a chave 'key'.
+        """
+        self._materialize()  # Cria os nós antes de modificar a árvore
+        self.insert(key)  # Insere a chave na árvore materializada
+
+    def remove(self, key):
+        """
+        Materializa a árvore e remove a chave 'key'.
+        """
+        self._materialize()  # Cria os nós antes de modificar a árvore
+        self.remove(key)  # Remove a chave da árvore materializada
+
+    def insert_many(self, keys):
+        """
+        Materializa a árvore e insere um array de chaves.
+        """
+        self._materialize()  # Cria os nós antes de modificar a árvore
+        return self.insert_many(keys)  # Insere as chaves na árvore materializada
+
+    def remove_many(self, keys):
+        """
+        Materializa a árvore e remove um array de chaves.
+        """
+        self._materialize()  # Cria os nós antes de modificar a árvore
+        return self.remove_many(keys)  # Remove as chaves da árvore materializada
+
+    def bulk_load(self, keys, presorted=False):
+        """
+        Materializa a árvore e carrega um lote de chaves.
+        """
+        self._materialize()  # Cria os nós antes de modificar a árvore
+        self.bulk_load(keys, presorted=presorted)  # Carrega as chaves na árvore materializada
+
+class RedBlackMap(RedBlackTree):
+    """
+    Mapa ordenado sobre a Árvore Rubro-Negra: cada nó (MapNode) guarda um valor associado à sua chave.
+    Escritas encontram a chave ou a sua posição de inserção em uma única descida e nunca imprimem mensagens.
+    upsert(..., hint=True) começa pela posição da última escrita, de modo que fluxos quase ordenados (por exemplo,
+    carimbos de tempo) inserem a chave ao lado da anterior sem descer da raiz.
+    """
+    NODE = MapNode  # Classe dos nós criados pelo mapa
+
+    def __init__(self, order_statistics=False):
+        """
+        Inicializa o mapa vazio.
+        """
+        super().__init__(order_statistics=order_statistics)  # Inicializa a árvore vazia
+        self._forget_hint()  # Nenhuma posição de escrita anterior
+
+    def _forget_hint(self):
+        """
+        Descarta a posição da última escrita.
+        """
+        self._last = self.nil  # Nó da última escrita
+        self._last_prev = None  # Predecessor de _last (nil se não houver; None se desconhecido)
+        self._last_next = None  # Sucessor de _last (nil se não houver; None se desconhecido)
+
+    def _attach(self, z, y, left):
+        z = super()._attach(z, y, left)  # Insere o nó
+        self._last = z  # O nó inserido passa a ser a posição da última escrita
+        self._last_prev = self._last_next = None  # Seus vizinhos são desconhecidos
+        return z
+
+    def _remove_node(self, z):
+        if z is self._last or z is self._last_prev or z is self._last_next:  # A posição guardada deixaria de valer
+            self._forget_hint()
+        super()._remove_node(z)  # Remove o nó
+
+    def _build_balanced(self, keys):
+        values = {key: value for key, value in self.items()}  # Preserva os valores das chaves existentes
+        super()._build_balanced(keys)  # Reconstrói a árvore
+        self._forget_hint()  # Os nós antigos foram descartados
+        node = self.minimum(self.root) if self.root != self.nil else self.nil  # Atribui os valores em ordem
+        while node != self.nil:
+            node.value = values.get(node.key)
+            node = self.successor(node)
+
+    def bulk_load(self, items, presorted=False):
+        """
+        Carrega vários pares (chave, valor) de uma vez, reconstruindo a árvore em tempo linear. Se a mesma chave
+        aparecer mais de uma vez, ou já estiver no mapa, prevalece o último valor. 'presorted' é aceito por
+        compatibilidade com RedBlackTree.bulk_load; as chaves são ordenadas de qualquer forma.
+        """
+        values = {key: value for key, value in self.items()}  # Valores atuais do mapa
+        values.update(items)  # Acrescenta os novos pares
+        RedBlackTree._build_balanced(self, sorted(values))  # Reconstrói a árvore com todas as chaves
+        self._forget_hint()  # Os nós antigos foram descartados
+        node = self.minimum(self.root) if self.root != self.nil else self.nil  # Atribui os valores em ordem
+        while node != self.nil:
+            node.value = values[node.key]
+            node = self.successor(node)
+
+    def split(self, key):
+        self._forget_hint()  # Os nós passam para as novas árvores
+        return super().split(key)
+
+    def insert_many(self, keys):
+        """
+        Um lote de chaves não traz valores; inseri-lo criaria entradas com o valor None.
+        """
+        raise TypeError("RedBlackMap não suporta insert_many; use bulk_load com pares (chave, valor) ou upsert.")
+
+    def _set_operation(self, operation, other, executor, parallel_depth):
+        self._forget_hint()  # Os nós podem ser descartados ou reconstruídos
+        values = None  # Valores a devolver aos nós reconstruídos pelo executor
+        if executor is not None and other is not self:  # Os subproblemas voltam do executor apenas com as chaves
+            values = dict(other.items()) if isinstance(other, RedBlackMap) else {}
+            values.update(self.items())  # Como na execução sequencial, prevalece o valor deste mapa
+        result = super()._set_operation(operation, other, executor, parallel_depth)
+        if isinstance(other, RedBlackMap):  # A outra árvore fica vazia e passa a usar o nó nil deste mapa
+            other._forget_hint()
+        if values is not None:  # Atribui os valores em ordem
+            node = self.minimum(self.root) if self.root != self.nil else self.nil
+            while node != self.nil:
+                node.value = values.get(node.key)
+                node = self.successor(node)
+        return result
+
+    def _spawn(self, root, count):
+        tree = super()._spawn(root, count)  # Cria o mapa com o nó nil compartilhado
+        tree._forget_hint()  # A posição vazia passa a usar o nó nil compartilhado
+        return tree
+
+    def _hinted_locate(self, key):
+        """
+        Procura a posição de 'key' a partir do nó da última escrita, comparando a chave apenas com esse nó e com o seu
+        vizinho na direção da chave. Retorna o mesmo que _locate, mais o predecessor e o sucessor da posição de
+        inserção, ou None se a chave não estiver entre o nó e o seu vizinho.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        last = self._last  # Nó da última escrita
+        if last == nil or self.root == nil:  # Não há posição guardada
+            return None
+        if last.key < key:  # A chave está depois do último nó
+            if last.right != nil:  # O sucessor é o menor nó da subárvore direita
+                nxt = self.minimum(last.right)
+            else:  # O sucessor é um ancestral, guardado pela escrita anterior ou calculado uma única vez
+                nxt = self._last_next if self._last_next is not None else self.successor(last)
+            if nxt != nil and not key < nxt.key:  # A chave não está antes do sucessor
+                return (nxt, nil, False, None, None) if not nxt.key < key else None
+            if last.right == nil:  # A posição é o filho direito do último nó
+                return nil, last, False, last, nxt
+            return nil, nxt, True, last, nxt  # A posição é o filho esquerdo do sucessor
+        if key < last.key:  # A chave está antes do último nó
+            if last.left != nil:  # O predecessor é o maior nó da subárvore esquerda
+                prv = self.maximum(last.left)
+            else:  # O predecessor é um ancestral, guardado pela escrita anterior ou calculado uma única vez
+                prv = self._last_prev if self._last_prev is not None else self.predecessor(last)
+            if prv != nil and not prv.key < key:  # A chave não está depois do predecessor
+                return (prv, nil, False, None, None) if not key < prv.key else None
+            if last.left == nil:  # A posição é o filho esquerdo do último nó
+                return nil, last, True, prv, last
+            return nil, prv, False, prv, last  # A posição é o filho direito do predecessor
+        return last, nil, False, None, None  # A chave é a do último nó
+
+    def upsert(self, key, value, hint=False):
+        """
+        Associa 'value' à chave 'key', inserindo-a se necessário, e retorna True se a chave foi inserida.
+        A chave e a posição de inserção são encontradas em uma única descida. Com 'hint=True', a busca começa pela
+        posição da última escrita e só desce da raiz se a chave não estiver ao lado dela.
+        """
+        located = self._hinted_locate(key) if hint else None  # Tenta a posição da última escrita
+        if located is None:  # Sem dica, ou a chave está longe da última escrita
+            x, parent, left = self._locate(key)
+            prv = nxt = None  # Vizinhos desconhecidos
+        else:
+            x, parent, left, prv, nxt = located
+        if x != self.nil:  # A chave já existe: atualiza o valor
+            x.value = value
+            self._last = x  # A posição da última escrita passa a ser este nó
+            self._last_prev = self._last_next = None  # Seus vizinhos são desconhecidos
+            return False
+        self._attach(self.NODE(key, value=value), parent, left)  # Insere o novo nó
+        self._last_prev, self._last_next = prv, nxt  # Guarda os vizinhos conhecidos do nó inserido
+        return True
+
+    def __setitem__(self, key, value):
+        """
+        Associa 'value' à chave 'key' (mapa[chave] = valor).
+        """
+        self.upsert(key, value)
+
+    def __getitem__(self, key):
+        """
+        Retorna o valor associado à chave 'key' (mapa[chave]), ou lança KeyError se a chave não existir.
+        """
+        x = self.search(key)  # Procura a chave
+        if x == self.nil:
+            raise KeyError(key)
+        return x.value
+
+    def __delitem__(self, key):
+        """
+        Remove a chave 'key' (del mapa[chave]), ou lança KeyError se a chave não existir.
+        """
+        self.pop(key)
+
+    def __contains__(self, key):
+        """
+        Verifica se a chave 'key' está no mapa.
+        """
+        return self.search(key) != self.nil
+
+    def get(self, key, default=None):
+        """
+        Retorna o valor associado à chave 'key', ou 'default' se a chave não existir.
+        """
+        x = self.search(key)  # Procura a chave
+        return default if x == self.nil else x.value
+
+    def setdefault(self, key, default=None):
+        """
+        Retorna o valor associado à chave 'key'; se a chave não existir, insere-a com o valor 'default',
+        na mesma descida, e retorna 'default'.
+        """
+        x, parent, left = self._locate(key)  # Procura a chave ou a sua posição de inserção
+        if x != self.nil:  # A chave já existe
+            return x.value
+        self._attach(self.NODE(key, value=default), parent, left)  # Insere a chave com o valor padrão
+        return default
+
+    _MISSING = object()  # Marca a ausência do valor padrão em pop
+
+    def pop(self, key, default=_MISSING):
+        """
+        Remove a chave 'key' e retorna o seu valor. Se a chave não existir, retorna 'default' ou,
+        se ele não for informado, lança KeyError.
+        """
+        x = self.search(key)  # Procura a chave
+        if x == self.nil:  # A chave não existe
+            if default is self._MISSING:
+                raise KeyError(key)
+            return default
+        value = x.value  # Guarda o valor antes de remover o nó
+        self._remove_node(x)  # Remove o nó sem repetir a busca
+        return value
+
+    def items(self):
+        """
+        Gera os pares (chave, valor) do mapa em ordem crescente.
+        """
+        if self.root == self.nil:  # Um mapa vazio não possui chaves
+            return
+        node = self.minimum(self.root)  # Começa pelo menor nó
+        while node != self.nil:  # Enquanto houver nós a serem visitados
+            yield node.key, node.value
+            node = self.successor(node)
+
+    def values(self):
+        """
+        Gera os valores do mapa na ordem crescente das chaves.
+        """
+        for _, value in self.items():
+            yield value
+
+    def save(self, path):
+        """
+        Snapshots gravam apenas as chaves; gravar um mapa descartaria os valores.
+        """
+        raise TypeError("RedBlackMap não suporta snapshots binários, pois os valores não seriam gravados.")
+
+class InvariantError(AssertionError):
+    """
+    Violação de uma propriedade da árvore encontrada pela verificação incremental (veja RedBlackTree.enable_debug_checks).
+    """
+
+    def __init__(self, node, reason):
+        super().__init__(f"Nó {node.key}: {reason}")  # Mensagem com a chave do nó e o motivo
+        self.node = node  # Nó que viola a propriedade
+        self.reason = reason  # Descrição da violação
+
+class DebugCheckedTreeMixin:
+    """
+    Métodos de uma RedBlackTree que verificam o caminho alterado após cada inserção e remoção.
+    Não deve ser usada diretamente; veja RedBlackTree.enable_debug_checks.
+    """
+    PREFIX = "Checked"  # Prefixo do nome das subclasses com verificação
+
+    def _attach(self, z, y, left):
+        super()._attach(z, y, left)  # Insere o nó
+        self.check_path(z)  # Verifica o caminho do nó inserido até a raiz
+        return z
+
+    def _remove_node(self, z):
+        if z.left == self.nil or z.right == self.nil:  # A estrutura muda no pai de 'z'
+            anchor = z.parent
+        else:  # A estrutura muda na posição original do sucessor de 'z'
+            successor = self.minimum(z.right)
+            anchor = successor if successor.parent == z else successor.parent
+        super()._remove_node(z)  # Remove o nó
+        self.check_path(anchor if anchor != self.nil else self.root)  # Verifica o caminho alterado até a raiz
+
+    def check_path(self, node):
+        """
+        Verifica as propriedades no caminho de 'node' até a raiz: as propriedades locais de cada nó do caminho e de seus
+        filhos, os limites de chave impostos pelos ancestrais e a igualdade das alturas negras dos dois filhos de cada nó
+        do caminho. Custa O(log² n) no pior caso, pois a altura negra de cada filho é medida pelo seu caminho mais à esquerda.
+        Lança InvariantError na primeira violação encontrada.
+        """
+        nil = self.nil  # Referência local para o nó nil
+        if self.root.color != "Black":  # A raiz é preta
+            raise InvariantError(self.root, "a raiz não é preta")
+        path = []  # Caminho de 'node' até a raiz
+        while node != nil:  # Sobe pelos ponteiros para o pai
+            path.append(node)
+            node = node.parent
+        if path and path[-1] != self.root:  # O caminho deve terminar na raiz
+            raise InvariantError(path[-1], "o caminho não termina na raiz")
+        lo = hi = None  # Limites de chave impostos pelos ancestrais
+        for i in range(len(path) - 1, -1, -1):  # Percorre o caminho da raiz até o nó
+            x = path[i]
+            for child, child_lo, child_hi in ((x, lo, hi), (x.left, lo, x.key), (x.right, x.key, hi)):  # O nó e seus filhos
+                if child != nil:
+                    reason = self._node_violation(child, child_lo, child_hi)
+                    if reason is not None:
+                        raise InvariantError(child, reason)
+            left, right = self._leftmost_black_height(x.left), self._leftmost_black_height(x.right)  # Alturas negras dos filhos
+            if left != right:
+                raise InvariantError(x, f"alturas negras diferentes nas subárvores esquerda ({left}) e direita ({right})")
+            if i > 0:  # Restringe os limites para o próximo nó do caminho
+                if path[i - 1] == x.left:
+                    hi = x.key
+                else:
+                    lo = x.key
+
+class TreeStats:
+    """
+    Contadores das operações internas de uma árvore instrumentada (veja RedBlackTree.enable_instrumentation).
+    """
+    FIELDS = ("comparisons", "left_rotations", "right_rotations", "recolors", "insert_fixup_iterations", "delete_fixup_iterations")
+
+    def __init__(self):
+        """
+        Cria os contadores zerados.
+        """
+        self.reset()  # Zera todos os contadores
+
+    def reset(self):
+        """
+        Zera todos os contadores.
+        """
+        for field in self.FIELDS:  # Para cada contador
+            setattr(self, field, 0)  # Zera o contador
+
+    def as_dict(self):
+        """
+        Retorna os contadores em um dicionário.
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}  # Copia cada contador
+
+class LatencyHistogram:
+    """
+    Histograma de latências por operação, com baldes em potências de 2 (em nanossegundos).
+    Pode ser registrado diretamente como gancho: tree.add_hook(LatencyHistogram()).
+    """
+
+    def __init__(self):
+        """
+        Cria o histograma vazio.
+        """
+        self.buckets = {}  # Para cada operação, a quantidade de ocorrências em cada balde
+
+    def __call__(self, operation, elapsed_ns):
+        """
+        Registra uma operação 'operation' que durou 'elapsed_ns' nanossegundos.
+        """
+        counts = self.buckets.setdefault(operation, {})  # Baldes da operação
+        bucket = int(elapsed_ns).bit_length()  # Balde b contém as durações em [2^(b-1), 2^b)
+        counts[bucket] = counts.get(bucket, 0) + 1  # Conta a ocorrência
+
+    def percentile(self, operation, p):
+        """
+        Retorna o limite superior, em nanossegundos, do balde que contém o percentil 'p' (entre 0 e 100) da operação.
+        """
+        counts = self.buckets.get(operation)  # Baldes da operação
+        if not counts:  # Nenhuma ocorrência registrada
+            return None
+        target = p / 100 * sum(counts.values())  # Quantidade de ocorrências até o percentil
+        seen = 0  # Ocorrências acumuladas
+        for bucket in sorted(counts):  # Percorre os baldes em ordem crescente
+            seen += counts[bucket]
+            if seen >= target:  # O percentil está neste balde
+                return 2 ** bucket
+        return 2 ** max(counts)  # Limite do maior balde
+
+class InstrumentedTreeMixin:
+    """
+    Métodos instrumentados de uma RedBlackTree: contam comparações de chaves, rotações, recolorações e iterações
+    dos laços de correção, e cronometram as operações públicas quando há ganchos registrados.
+    Não deve ser usada diretamente; veja RedBlackTree.enable_instrumentation.
+    """
+    PREFIX = "Instrumented"  # Prefixo do nome das subclasses instrumentadas
+
+    def add_hook(self, callback):
+        """
+        Registra 'callback(operação, duração_em_ns)', chamado ao final de cada insert, remove e search.
+        """
+        self.hooks.append(callback)  # Adiciona o gancho
+
+    def remove_hook(self, callback):
+        """
+        Remove um gancho registrado por add_hook.
+        """
+        self.hooks.remove(callback)  # Remove o gancho
+
+    def report(self):
+        """
+        Retorna os contadores junto com a altura, a altura negra e a quantidade de nós da árvore.
+        """
+        return {**self.stats.as_dict(), "height": self.height(), "black_height": self.black_height(), "count": len(self)}
+
+    def _timed(self, operation, method, key):
+        """
+        Executa 'method(key)' e, se houver ganchos e esta for a operação mais externa, informa sua duração aos ganchos.
+        """
+        if not self.hooks or self._timing:  # Sem ganchos, ou chamada interna de outra operação cronometrada
+            return method(key)
+        self._timing = True  # Marca a operação em andamento
+        start = time.perf_counter_ns()  # Marca o início
+        try:
+            return method(key)  # Executa a operação
+        finally:
+            elapsed = time.perf_counter_ns() - start  # Duração da operação
+            self._timing = False  # Encerra a operação em andamento
+            for hook in self.hooks:  # Informa a duração a cada gancho
+                hook(operation, elapsed)
+
+    def insert(self, key):
+        return self._timed("insert", super().insert, key)  # Cronometra a inserção
+
+    def remove(self, key):
+        return self._timed("remove", super().remove, key)  # Cronometra a remoção
+
+    def search(self, key):
+        return self._timed("search", self._counted_search, key)  # Cronometra a busca
+
+    def _counted_search(self, key):
+        """
+        Mesma busca de RedBlackTree.search, contando uma comparação de chaves por nó visitado.
+        """
+        comparisons = 0  # Comparações desta busca
+        x = self.root  # Inicializa 'x' como a raiz da árvore
+        while x != self.nil and key != x.key:  # Enquanto 'x' não for o nó nil e a chave não for igual à chave de 'x'
+            comparisons += 1  # Conta a comparação com 'x'
+            if key < x.key:  # Se a chave for menor que a chave de 'x'
+                x = x.left  # 'x' se move para o filho esquerdo
+            else:
+                x = x.right  # 'x' se move para o filho direito
+        self.stats.comparisons += comparisons + (x != self.nil)  # Conta também a comparação com o nó encontrado
+        return x  # Retorna o nó encontrado ou o nó nil
+
+    def _locate(self, key):
+        """
+        Conta as comparações da descida de insert (uma por nó do caminho) e procura a chave.
+        """
+        found, parent, left = super()._locate(key)  # Procura a chave
+        x = parent  # Sobe do último nó visitado até a raiz para contar o caminho
+        while x != self.nil:
+            self.stats.comparisons += 1
+            x = x.parent
+        self.stats.comparisons += found != self.nil  # Conta também a comparação com o nó encontrado
+        return found, parent, left
+
+    def _insert_key(self, key):
+        """
+        Conta as comparações da descida de inserção (uma por nó do caminho) e insere a chave.
+        """
+        x = self.root  # Refaz a descida apenas para contá-la
+        while x != self.nil:  # Cada nó do caminho é comparado uma vez com a chave
+            self.stats.comparisons += 1
+            x = x.left if key < x.key else x.right
+        return super()._insert_key(key)  # Insere a chave
+
+    def left_rotate(self, x):
+        self.stats.left_rotations += 1  # Conta a rotação
+        super().left_rotate(x)  # Realiza a rotação
+
+    def right_rotate(self, x):
+        self.stats.right_rotations += 1  # Conta a rotação
+        super().right_rotate(x)  # Realiza a rotação
+
+    def insert_fixup(self, z):
+        """
+        Corrige quaisquer violações das propriedades da árvore Rubro-Negra após a inserção do nó 'z'.
+        Mesma correção de RedBlackTree.insert_fixup, contando as iterações e as recolorações.
+        """
+        stats = self.stats  # Referência local para os contadores
+        while z.parent.color == "Red": # Enquanto a cor do pai de z for vermelha
+            stats.insert_fixup_iterations += 1  # Conta a iteração do laço
+            if z.parent == z.parent.parent.left: # Se o pai de z for o filho esquerdo do avô de z
+                y = z.parent.parent.right # y recebe o irmão do pai de z
+                if y.color == "Red": # Se a cor de y for vermelha
+                    z.parent.color = "Black" # Define a cor do pai de z como preta
+                    y.color = "Black" # Define a cor de y como preta
+                    z.parent.parent.color = "Red" # Define a cor do avô de z como vermelha
+                    stats.recolors += 3  # Conta as recolorações
+                    z = z.parent.parent # Move z para o avô de z
+                else: # Se a cor de y for preta
+                    if z == z.parent.right: # Se z for o filho direito do pai de z
+                        z = z.parent # Move z para o pai de z
+                        self.left_rotate(z) # Realiza uma rotação para a esquerda em torno de z
+                    z.parent.color = "Black" # Define a cor do pai de z como preta
+                    z.parent.parent.color = "Red" # Define a cor do avô de z como vermelha
+                    stats.recolors += 2  # Conta as recolorações
+                    self.right_rotate(z.parent.parent) # Realiza uma rotação para a direita em torno do avô de z
+            else: # Se o pai de z for o filho direito do avô de z
+                y = z.parent.parent.left # y recebe o irmão do pai de z
+                if y.color == "Red": # Se a cor de y for vermelha
+                    z.parent.color = "Black" # Define a cor do pai de z como preta
+                    y.color = "Black" # Define a cor de y como preta
+                    z.parent.parent.color = "Red" # Define a cor do avô de z como vermelha
+                    stats.recolors += 3  # Conta as recolorações
+                    z = z.parent.parent # Move z para o avô de z
+                else: # Se a cor de y for preta
+                    if z == z.parent.left: # Se z for o filho esquerdo do pai de z
+                        z = z.parent # Move z para o pai de z
+                        self.right_rotate(z) # Realiza uma rotação para a direita em torno de z
+                    z.parent.color = "Black" # Define a cor do pai de z como preta
+                    z.parent.parent.color = "Red" # Define a cor do avô de z como vermelha
+                    stats.recolors += 2  # Conta as recolorações
+                    self.left_rotate(z.parent.parent) # Realiza uma rotação para a esquerda em torno do avô de z
+        if self.root.color == "Red":  # Conta a recoloração da raiz apenas se ela mudar de cor
+            stats.recolors += 1
+        self.root.color = "Black" # Define a cor da raiz como preta
+
+    def delete_fixup(self, x):
+        """
+        Corrige quaisquer violações das propriedades da árvore Rubro-Negra após a remoção do nó 'x'.
+        Mesma correção de RedBlackTree.delete_fixup, contando as iterações e as recolorações.
+        """
+        stats = self.stats  # Referência local para os contadores
+        while x != self.root and x.color == "Black":  # Enquanto x não for a raiz e a cor de x for preta
+            stats.delete_fixup_iterations += 1  # Conta a iteração do laço
+            if x == x.parent.left:  # Se x for o filho esquerdo de seu pai
+                w = x.parent.right  # w recebe o irmão direito de x
+                if w.color == "Red":  # Se a cor de w for vermelha
+                    w.color = "Black"  # Define a cor de w como preta
+                    x.parent.color = "Red"  # Define a cor do pai de x como vermelha
+                    stats.recolors += 2  # Conta as recolorações
+                    self.left_rotate(x.parent)  # Realiza uma rotação para a esquerda em torno do pai de x
+                    w = x.parent.right  # Atualiza o valor de w para o novo irmão direito de x
+                if w.left.color == "Black" and w.right.color == "Black":  # Se a cor do filho esquerdo de w e a cor do filho direito de w forem pretas
+                    w.color = "Red"  # Define a cor de w como vermelha
+                    stats.recolors += 1  # Conta a recoloração
+                    x = x.parent  # Atualiza o valor de x para o pai de x
+                else:
+                    if w.right.color == "Black":  # Se a cor do filho direito de w for preta
+                        w.left.color = "Black"  # Define a cor do filho esquerdo de w como preta
+                        w.color = "Red"  # Define a cor de w como vermelha
+                        stats.recolors += 2  # Conta as recolorações
+                        self.right_rotate(w)  # Realiza uma rotação para a direita em torno de w
+                        w = x.parent.right  # Atualiza o valor de w para o novo irmão direito de x
+                    w.color = x.parent.color  # Define a cor de w como a cor do pai de x
+                    x.parent.color = "Black"  # Define a cor do pai de x como preta
+                    w.right.color = "Black"  # Define a cor do filho direito de w como preta
+                    stats.recolors += 3  # Conta as recolorações
+                    self.left_rotate(x.parent)  # Realiza uma rotação para a esquerda em torno do pai de x
+                    x = self.root  # Atualiza o valor de x para a raiz da árvore
+            else:
+                w = x.parent.left  # w recebe o irmão esquerdo de x
+                if w.color == "Red":  # Se a cor de w for vermelha
+                    w.color = "Black"  # Define a cor de w como preta
+                    x.parent.color = "Red"  # Define a cor do pai de x como vermelha
+                    stats.recolors += 2  # Conta as recolorações
+                    self.right_rotate(x.parent)  # Realiza uma rotação para a direita em torno do pai de x
+                    w = x.parent.left  # Atualiza o valor de w para o novo irmão esquerdo de x
+                if w.right.color == "Black" and w.left.color == "Black":  # Se a cor do filho direito de w e a cor do filho esquerdo de w forem pretas
+                    w.color = "Red"  # Define a cor de w como vermelha
+                    stats.recolors += 1  # Conta a recoloração
+                    x = x.parent  # Atualiza o valor de x para o pai de x
+                else:
+                    if w.left.color == "Black":  # Se a cor do filho esquerdo de w for preta
+                        w.right.color = "Black"  # Define a cor do filho direito de w como preta
+                        w.color = "Red"  # Define a cor de w como vermelha
+                        stats.recolors += 2  # Conta as recolorações
+                        self.left_rotate(w)  # Realiza uma rotação para a esquerda em torno de w
+                        w = x.parent.left  # Atualiza o valor de w para o novo irmão esquerdo de x
+                    w.color = x.parent.color  # Define a cor de w como a cor do pai de x
+                    x.parent.color = "Black"  # Define a cor do pai de x como preta
+                    w.left.color = "Black"  # Define a cor do filho esquerdo de w como preta
+                    stats.recolors += 3  # Conta as recolorações
+                    self.right_rotate(x.parent)  # Realiza uma rotação para a direita em torno do pai de x
+                    x = self.root  # Atualiza o valor de x para a raiz da árvore
+        if x.color == "Red":  # Conta a recoloração final apenas se x mudar de cor
+            stats.recolors += 1
+        x.color = "Black"  # Define a cor de x como preta
+
+class Journal:
+    """
+    Registro (journal) somente de acréscimo das inserções e remoções de uma RedBlackTree, gravado no diretório
+    'directory'. Cada operação é um registro binário de 9 bytes (operação e chave em little-endian). Os registros
+    são gravados em blocos, cada um com o seu tamanho e CRC-32, de modo que um bloco incompleto ou corrompido por
+    uma queda é detectado e descartado na recuperação.
+    Os blocos são gravados em segmentos (journal-N.log). Quando um segmento passa de 'segment_bytes', ele é
+    fechado e um novo é aberto. A cada 'compact_segments' segmentos fechados, uma thread em segundo plano os
+    compacta, junto com o checkpoint anterior, em um novo checkpoint (checkpoint-N.rbt, no formato dos snapshots,
+    com as chaves ordenadas) e apaga os arquivos antigos. Um checkpoint-N contém o efeito de todos os segmentos até N.
+    Política de gravação ('sync'):
+    - "always": cada operação é gravada e sincronizada com o disco (fsync) antes de retornar;
+    - "group": as operações são acumuladas e gravadas em um único bloco, com um único fsync, a cada 'latency'
+      segundos (ou a cada 'max_batch' operações), por uma thread em segundo plano. Uma queda perde no máximo as
+      operações dos últimos 'latency' segundos;
+    - "never": como "group", mas sem fsync; os blocos ficam a cargo do sistema operacional.
+    """
+    SYNC_POLICIES = ("always", "group", "never")  # Políticas de gravação aceitas
+
+    def __init__(self, directory, typecode="q", sync="group", latency=0.005, max_batch=4096,
+                 segment_bytes=64 << 20, compact_segments=4):
+        """
+        Abre o journal no diretório 'directory' (criado se necessário), começando um novo segmento depois dos
+        arquivos já existentes. 'typecode' é o tipo das chaves ("q" para inteiros de 64 bits, "d" para ponto
+        flutuante). Se 'compact_segments' for None, a compactação só ocorre por chamadas a compact().
+        """
+        if sync not in self.SYNC_POLICIES:  # Verifica a política de gravação
+            raise ValueError(f"Política de gravação inválida {sync!r}; use uma de {self.SYNC_POLICIES}.")
+        if typecode.encode() not in SNAPSHOT_DTYPES:  # O journal usa os mesmos tipos de chave dos snapshots
+            raise ValueError("O journal suporta apenas chaves inteiras ('q') ou de ponto flutuante ('d').")
+        os.makedirs(directory, exist_ok=True)  # Cria o diretório do journal
+        self.directory = directory  # Diretório dos segmentos e checkpoints
+        self.typecode = typecode.encode()  # Tipo das chaves gravadas
+        self.sync = sync  # Política de gravação
+        self.latency = latency  # Atraso máximo de uma operação até ser gravada, nas políticas "group" e "never"
+        self.max_batch = max_batch  # Quantidade máxima de operações acumuladas em um bloco
+        self.segment_bytes = segment_bytes  # Tamanho a partir do qual o segmento atual é fechado
+        self.compact_segments = compact_segments  # Segmentos fechados que disparam a compactação
+        self._record = struct.Struct("<c" + typecode)  # Formato de um registro: operação e chave
+        self._lock = threading.Lock()  # Protege os registros pendentes e o segmento atual
+        self._compact_lock = threading.Lock()  # Impede compactações e checkpoints simultâneos
+        self._pending = []  # Registros ainda não gravados
+        checkpoints, segments = self._scan(directory)  # Arquivos já existentes
+        self._segment = max(checkpoints + segments, default=0)  # Número do segmento atual (aberto por _open_segment)
+        self._file = None  # Arquivo do segmento atual
+        self._open_segment()  # Abre um novo segmento
+        self._closed = threading.Event()  # Sinaliza o encerramento das threads
+        self._compact_wanted = threading.Event()  # Sinaliza que há segmentos a compactar
+        self._threads = [threading.Thread(target=self._compactor, daemon=True)]  # Thread de compactação
+        if sync != "always":  # Thread que grava os blocos acumulados a cada 'latency' segundos
+            self._threads.append(threading.Thread(target=self._flusher, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    @staticmethod
+    def _scan(directory):
+        """
+        Retorna os números dos checkpoints e dos segmentos existentes em 'directory', em ordem crescente.
+        """
+        checkpoints, segments = [], []  # Números encontrados
+        for name in os.listdir(directory):
+            stem, _, ext = name.rpartition(".")
+            if stem.startswith("checkpoint-") and ext == "rbt":
+                checkpoints.append(int(stem[len("checkpoint-"):]))
+            elif stem.startswith("journal-") and ext == "log":
+                segments.append(int(stem[len("journal-"):]))
+        return sorted(checkpoints), sorted(segments)
+
+    def _path(self, kind, number):
+        """
+        Retorna o caminho do checkpoint ("checkpoint") ou do segmento ("journal") de número 'number'.
+        """
+        return os.path.join(self.directory, f"{kind}-{number:08d}.{'rbt' if kind == 'checkpoint' else 'log'}")
+
+    def _sync_directory(self):
+        """
+        Sincroniza o diretório com o disco, tornando duráveis a criação, a renomeação e a remoção de arquivos.
+        """
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:  # Alguns sistemas (como o Windows) não permitem abrir diretórios
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _open_segment(self):
+        """
+        Fecha o segmento atual (se houver) e abre o próximo, gravando o seu cabeçalho. Deve ser chamado com a trava.
+        """
+        if self._file is not None:  # Fecha o segmento atual, já gravado por inteiro
+            self._file.close()
+        self._segment += 1  # Número do novo segmento
+        self._file = open(self._path("journal", self._segment), "wb")  # Cria o segmento
+        self._file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.typecode))  # Grava o cabeçalho
+        self._file.flush()
+        if self.sync != "never":
+            os.fsync(self._file.fileno())
+            self._sync_directory()
+        self._size = JOURNAL_HEADER.size  # Bytes gravados no segmento
+
+    def append(self, operation, key):
+        """
+        Acrescenta a operação 'operation' (JOURNAL_INSERT ou JOURNAL_REMOVE) sobre a chave 'key' ao journal.
+        Deve ser chamado antes de a operação ser aplicada à árvore.
+        """
+        try:
+            record = self._record.pack(operation, key)  # Codifica o registro antes de alterar a árvore
+        except struct.error:
+            raise TypeError(f"A chave {key!r} não pode ser gravada no journal com o tipo {self.typecode.decode()!r}.") from None
+        with self._lock:
+            self._pending.append(record)  # Acumula o registro
+            if self.sync == "always" or len(self._pending) >= self.max_batch:  # Grava imediatamente
+                self._commit()
+
+    def _commit(self):
+        """
+        Grava os registros pendentes em um único bloco e, conforme a política, sincroniza o segmento com o disco.
+        Deve ser chamado com a trava.
+        """
+        if not self._pending:  # Nada a gravar
+            return
+        payload = b"".join(self._pending)  # Registros do bloco
+        self._pending.clear()
+        self._file.write(JOURNAL_BLOCK.pack(len(payload), zlib.crc32(payload)))  # Cabeçalho do bloco
+        self._file.write(payload)  # Registros
+        self._file.flush()  # Entrega os dados ao sistema operacional
+        if self.sync != "never":  # Um único fsync para todo o bloco
+            os.fsync(self._file.fileno())
+        self._size += JOURNAL_BLOCK.size + len(payload)  # Atualiza o tamanho do segmento
+        if self._size >= self.segment_bytes:  # Fecha o segmento cheio e abre o próximo
+            self._open_segment()
+            if self.compact_segments is not None and \
+                    len(self._scan(self.directory)[1]) - 1 >= self.compact_segments:  # Segmentos fechados suficientes
+                self._compact_wanted.set()  # Acorda a thread de compactação
+
+    def flush(self):
+        """
+        Grava imediatamente as operações pendentes.
+        """
+        with self._lock:
+            self._commit()
+
+    def _flusher(self):
+        """
+        Laço da thread que grava as operações acumuladas a cada 'latency' segundos (commit em grupo).
+        """
+        while not self._closed.wait(self.latency):
+            self.flush()
+
+    def _compactor(self):
+        """
+        Laço da thread que compacta os segmentos fechados em segundo plano.
+        """
+        while True:
+            self._compact_wanted.wait()  # Espera um pedido de compactação ou o encerramento
+            if self._closed.is_set():
+                return
+            self._compact_wanted.clear()
+            self.compact()
+
+    def compact(self):
+        """
+        Compacta o último checkpoint e os segmentos já fechados em um novo checkpoint com as chaves ordenadas,
+        apagando os arquivos substituídos. Não usa a árvore nem bloqueia as gravações: apenas arquivos que não
+        mudam mais são lidos.
+        """
+        with self._compact_lock:  # Uma compactação ou checkpoint por vez
+            with self._lock:
+                current = self._segment  # Segmento aberto, que não é compactado
+            checkpoints, segments = self._scan(self.directory)
+            base = checkpoints[-1] if checkpoints else 0  # Checkpoint mais recente
+            sealed = [n for n in segments if base < n < current]  # Segmentos fechados depois do checkpoint
+            if not sealed:  # Nada a compactar
+                return
+            keys, _ = self.replay(self.directory, upto=sealed[-1])  # Estado ao final do último segmento fechado
+            _write_snapshot(self._path("checkpoint", sealed[-1]), keys)  # Grava o novo checkpoint
+            self._sync_directory()
+            self._remove_before(sealed[-1])  # Apaga os arquivos substituídos pelo novo checkpoint
+
+    def _remove_before(self, number):
+        """
+        Apaga os checkpoints anteriores a 'number' e os segmentos até 'number', substituídos pelo checkpoint-'number'.
+        """
+        checkpoints, segments = self._scan(self.directory)
+        for n in checkpoints:
+            if n < number:
+                os.remove(self._path("checkpoint", n))
+        for n in segments:
+            if n <= number:
+                os.remove(self._path("journal", n))
+        self._sync_directory()
+
+    def checkpoint(self, tree):
+        """
+        Grava imediatamente um checkpoint com as chaves atuais de 'tree' e descarta os segmentos anteriores.
+        Usado quando a árvore é reconstruída de uma só vez (bulk_load, lotes grandes, split e operações de conjuntos).
+        """
+        with self._compact_lock:  # Não compete com a compactação em segundo plano
+            with self._lock:
+                self._pending.clear()  # O checkpoint já contém o efeito das operações pendentes
+                number = self._segment  # O checkpoint substitui todos os segmentos até o atual
+                self._open_segment()  # As próximas operações vão para um novo segmento
+                keys = np.array(list(tree.keys()))  # Chaves atuais da árvore
+                if len(keys) and keys.dtype.kind not in ("iub" if self.typecode == b"q" else "iubf"):  # Chaves que o journal não representa
+                    raise TypeError(f"As chaves da árvore não podem ser gravadas no journal com o tipo {self.typecode.decode()!r}.")
+            _write_snapshot(self._path("checkpoint", number), keys.astype(SNAPSHOT_DTYPES[self.typecode]))  # Grava o checkpoint
+            self._sync_directory()
+            self._remove_before(number)  # Apaga os arquivos substituídos
+
+    def close(self):
+        """
+        Grava as operações pendentes, encerra as threads e fecha o segmento atual.
+        """
+        self._closed.set()  # Sinaliza o encerramento
+        self._compact_wanted.set()  # Acorda a thread de compactação para que ela termine
+        for thread in self._threads:
+            thread.join()
+        with self._lock:
+            self._commit()
+            self._file.close()
+
+    @classmethod
+    def replay(cls, directory, upto=None, repair=False):
+        """
+        Reconstrói o conjunto de chaves gravado em 'directory': carrega o checkpoint mais recente e aplica, em ordem,
+        os segmentos posteriores (até o segmento 'upto', se informado). Um bloco incompleto ou com CRC-32 inválido
+        encerra o último segmento, pois é o resultado de uma queda durante a gravação; em um segmento anterior, ele
+        indica corrupção e lança ValueError. Se 'repair' for True, o final interrompido do último segmento é
+        descartado do arquivo, para que novos segmentos possam ser gravados depois dele.
+        Retorna (array ordenado das chaves, número do último segmento aplicado).
+        """
+        checkpoints, segments = cls._scan(directory)
+        base = checkpoints[-1] if checkpoints else 0  # Checkpoint mais recente
+        if checkpoints:  # Carrega as chaves do checkpoint, sem criar nós
+            keys, _ = _read_snapshot(os.path.join(directory, f"checkpoint-{base:08d}.rbt"), mmap=False)
+        else:
+            keys = np.empty(0, dtype=np.int64)
+        segments = [n for n in segments if n > base and (upto is None or n <= upto)]  # Segmentos a aplicar
+        chunks = []  # Registros de todos os segmentos, em ordem
+        dtype = None  # Tipo dos registros
+        for i, number in enumerate(segments):
+            path = os.path.join(directory, f"journal-{number:08d}.log")
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < JOURNAL_HEADER.size:  # Segmento criado, mas sem o cabeçalho completo
+                if i == len(segments) - 1:
+                    if repair:  # O segmento não contém nenhuma operação
+                        os.remove(path)
+                    break
+                raise ValueError(f"O segmento {path} está truncado.")
+            magic, version, typecode = JOURNAL_HEADER.unpack_from(data)
+            if magic != JOURNAL_MAGIC or typecode not in SNAPSHOT_DTYPES:  # Verifica a assinatura e o tipo das chaves
+                raise ValueError(f"O arquivo {path} não é um segmento de journal válido.")
+            if version != JOURNAL_VERSION:  # Verifica a versão do formato
+                raise ValueError(f"Versão de journal {version} não suportada.")
+            dtype = np.dtype([("op", "S1"), ("key", SNAPSHOT_DTYPES[typecode])])  # Registro de 9 bytes
+            offset = JOURNAL_HEADER.size  # Posição do próximo bloco
+            while offset < len(data):  # Percorre os blocos do segmento
+                valid = offset + JOURNAL_BLOCK.size <= len(data)
+                if valid:
+                    length, checksum = JOURNAL_BLOCK.unpack_from(data, offset)
+                    payload = data[offset + JOURNAL_BLOCK.size:offset + JOURNAL_BLOCK.size + length]
+                    valid = len(payload) == length and length % dtype.itemsize == 0 and zlib.crc32(payload) == checksum
+                if not valid:  # Bloco incompleto ou corrompido
+                    if i == len(segments) - 1:  # Final de um segmento interrompido por uma queda
+                        if repair:  # Descarta o bloco incompleto
+                            with open(path, "r+b") as f:
+                                f.truncate(offset)
+                                os.fsync(f.fileno())
+                        break
+                    raise ValueError(f"O segmento {path} está corrompido na posição {offset}.")
+                chunks.append(np.frombuffer(payload, dtype=dtype))
+                offset += JOURNAL_BLOCK.size + length
+        if chunks:  # Aplica as operações: para cada chave, vale a última operação registrada
+            records = np.concatenate(chunks)
+            reversed_keys = records["key"][::-1]  # A primeira ocorrência no array invertido é a última operação
+            unique, index = np.unique(reversed_keys, return_index=True)
+            last = records["op"][::-1][index]  # Última operação de cada chave
+            keys = np.union1d(np.setdiff1d(keys, unique[last == JOURNAL_REMOVE]), unique[last == JOURNAL_INSERT])
+        return keys, segments[-1] if segments else base
+
+class JournaledTreeMixin:
+    """
+    Métodos de uma RedBlackTree que registram cada inserção e remoção no journal antes de aplicá-las.
+    Não deve ser usada diretamente; veja RedBlackTree.enable_journal.
+    """
+    PREFIX = "Journaled"  # Prefixo do nome das subclasses com journal
+
+    def _attach(self, z, y, left):
+        self.journal.append(JOURNAL_INSERT, z.key)  # Registra a inserção
+        return super()._attach(z, y, left)
+
+    def _remove_node(self, z):
+        self.journal.append(JOURNAL_REMOVE, z.key)  # Registra a remoção
+        super()._remove_node(z)
+
+    def _build_balanced(self, keys):
+        super()._build_balanced(keys)  # Reconstrói a árvore
+        self.journal.checkpoint(self)  # Grava o novo conteúdo de uma só vez, em vez de uma operação por chave
+
+    def _empty(self):
+        super()._empty()  # Os nós foram movidos para outra árvore (split, join ou operação de conjuntos)
+        self.journal.checkpoint(self)  # Registra que a árvore ficou vazia
+
+    def _set_operation(self, operation, other, executor, parallel_depth):
+        result = super()._set_operation(operation, other, executor, parallel_depth)  # Combina as árvores
+        self.journal.checkpoint(self)  # Grava o resultado de uma só vez
+        return result
+
+_MIXIN_CLASSES = {}  # Subclasses já criadas, por (mixin, classe original)
+
+def _mixin_class(mixin, cls):
+    """
+    Retorna (criando na primeira vez) a subclasse que combina os métodos de 'mixin' com a classe 'cls'.
+    """
+    if (mixin, cls) not in _MIXIN_CLASSES:  # Cria a subclasse na primeira vez
+        name = f"{mixin.PREFIX}{cls.__name__}"  # Nome da subclasse, por exemplo InstrumentedRedBlackTree
+        _MIXIN_CLASSES[mixin, cls] = type(name, (mixin, cls), {"_mixin": mixin, "_mixin_base": cls})
+    return _MIXIN_CLASSES[mixin, cls]  # Retorna a subclasse
+
+def _add_mixin(tree, mixin):
+    """
+    Faz a instância 'tree' passar a usar os métodos de 'mixin', sem alterar seus dados.
+    """
+    tree.__class__ = _mixin_class(mixin, type(tree))  # Troca a classe da instância
+
+def _remove_mixin(tree, mixin):
+    """
+    Faz a instância 'tree' deixar de usar os métodos de 'mixin', mantendo os demais mixins habilitados.
+    """
+    mixins = []  # Mixins que continuam habilitados, do mais externo para o mais interno
+    cls = type(tree)  # Classe atual da instância
+    while "_mixin_base" in cls.__dict__:  # Desfaz as subclasses até chegar à classe original
+        if cls._mixin is not mixin:
+            mixins.append(cls._mixin)
+        cls = cls._mixin_base
+    for other in reversed(mixins):  # Recria a combinação sem o mixin removido
+        cls = _mixin_class(other, cls)
+    tree.__class__ = cls  # Troca a classe da instância
+
+class CompactRedBlackTree:
+    """
+    Árvore Rubro-Negra com armazenamento compacto: cada nó é um índice inteiro em arrays paralelos
+    (chaves, filhos esquerdos, filhos direitos, pais e cores), em vez de um objeto Python por nó.
+    O índice 0 é o nó nil (sentinela) e os índices liberados por 'remove' são reaproveitados por meio de uma lista livre.
+    """
+    RED = 0  # Valor que representa a cor vermelha no array de cores
+    BLACK = 1  # Valor que representa a cor preta no array de cores
+
+    def __init__(self, typecode="q"):
+        """
+        Inicializa a árvore vazia. 'typecode' é o código de tipo do módulo 'array' usado para as chaves
+        ("q" para inteiros de 64 bits, "d" para números de ponto flutuante).
+        """
+        self.key = array(typecode, [0])  # Chaves dos nós (a posição 0 pertence ao nó nil)
+        self.left = array("i", [0])  # Índices dos filhos esquerdos
+        self.right = array("i", [0])  # Índices dos filhos direitos
+        self.parent = array("i", [0])  # Índices dos pais
+        self.color = bytearray([self.BLACK])  # Cores dos nós (o nó nil é preto)
+        self.nil = 0  # Índice do nó nil
+        self.root = self.nil  # Define o nó nil como a raiz da árvore
+        self.count = 0  # Número de chaves armazenadas na árvore
+        self._free = 0  # Primeiro índice da lista livre (0 indica que a lista está vazia)
+
+    def __len__(self):
+        """
+        Retorna o número de chaves armazenadas na árvore.
+        """
+        return self.count  # Retorna o contador mantido por insert e remove
+
+    def bytes_per_node(self):
+        """
+        Retorna o número de bytes ocupados por nó nos arrays paralelos.
+        """
+        return self.key.itemsize + self.left.itemsize + self.right.itemsize + self.parent.itemsize + 1  # Soma o tamanho de cada campo
+
+    @classmethod
+    def from_iterable(cls, keys, presorted=False, typecode="q"):
+        """
+        Cria uma nova árvore compacta a partir de um iterável de chaves, construindo-a balanceada em tempo linear.
+        """
+        tree = cls(typecode)  # Cria uma árvore vazia
+        if presorted:  # Se as chaves já vierem ordenadas
+            keys = RedBlackTree._dedupe_sorted(keys)  # Apenas remove as duplicatas adjacentes
+        else:
+            keys = sorted(set(keys))  # Remove as duplicatas e ordena as chaves
+        n = len(keys)  # Quantidade de chaves
+        red_depth = (n + 1).bit_length() - 1  # Profundidade do último nível incompleto (floor(log2(n + 1)))
+        tree.key.extend(keys)  # As chaves ordenadas ocupam os índices 1..n
+        tree.left.extend([0] * n)  # Inicializa os filhos esquerdos como nil
+        tree.right.extend([0] * n)  # Inicializa os filhos direitos como nil
+        tree.parent.extend([0] * n)  # Inicializa os pais como nil
+        tree.color.extend(bytes(n))  # Inicializa as cores (serão definidas abaixo)
+        tree.count = n  # Atualiza o número de chaves
+        stack = [(1, n + 1, 0, False, 0)]  # Pilha com os intervalos (início, fim, pai, é filho esquerdo, profundidade)
+        while stack:  # Enquanto houver intervalos a serem construídos
+            lo, hi, parent, is_left, depth = stack.pop()  # Retira o próximo intervalo da pilha
+            if lo >= hi:  # Se o intervalo estiver vazio, o filho permanece nil
+                continue
+            mid = (lo + hi) // 2  # O índice do meio se torna a raiz da subárvore
+            tree.parent[mid] = parent  # Liga o nó ao seu pai
+            tree.color[mid] = cls.RED if depth == red_depth else cls.BLACK  # Apenas o último nível incompleto é vermelho
+            if parent == 0:  # Se o nó não tiver pai, ele é a raiz
+                tree.root = mid
+            elif is_left:  # Se o nó for o filho esquerdo de seu pai
+                tree.left[parent] = mid
+            else:
+                tree.right[parent] = mid
+            stack.append((mid + 1, hi, mid, False, depth + 1))  # Agenda a construção da subárvore direita
+            stack.append((lo, mid, mid, True, depth + 1))  # Agenda a construção da subárvore esquerda
+        return tree  # Retorna a árvore construída
+
+    def _new_node(self, key, parent):
+        """
+        Reserva um índice para um novo nó vermelho, reaproveitando a lista livre quando possível.
+        """
+        z = self._free  # Tenta reaproveitar o primeiro índice da lista livre
+        if z != 0:  # Se houver um índice livre
+            self._free = self.left[z]  # A lista livre é encadeada pelo array de filhos esquerdos
+            self.key[z] = key  # Atribui a chave ao nó
+            self.left[z] = 0  # Inicializa o filho esquerdo como nil
+            self.right[z] = 0  # Inicializa o filho direito como nil
+            self.parent[z] = parent  # Atribui o pai ao nó
+            self.color[z] = self.RED  # Define a cor do nó como vermelha
+        else:
+            z = len(self.key)  # O novo nó ocupa o final dos arrays
+            self.key.append(key)  # Atribui a chave ao nó
+            self.left.append(0)  # Inicializa o filho esquerdo como nil
+            self.right.append(0)  # Inicializa o filho direito como nil
+            self.parent.append(parent)  # Atribui o pai ao nó
+            self.color.append(self.RED)  # Define a cor do nó como vermelha
+        return z  # Retorna o índice do novo nó
+
+    def _free_node(self, z):
+        """
+        Devolve o índice 'z' à lista livre.
+        """
+        self.left[z] = self._free  # Encadeia o índice ao início da lista livre
+        self._free = z  # O índice se torna o primeiro da lista livre
+
+    def transplant(self, u, v):
+        """
+        Substitui a subárvore enraizada no nó 'u' pela subárvore enraizada no nó 'v'.
+        """
+        parent = self.parent  # Referência local para o array de pais
+        pu = parent[u]  # Pai de u
+        if pu == 0:  # Verifica se u é a raiz
+            self.root = v  # Define v como a nova raiz da árvore
+        elif u == self.left[pu]:  # Verifica se u é o filho esquerdo de seu pai
+            self.left[pu] = v  # Define v como o novo filho esquerdo do pai de u
+        else:
+            self.right[pu] = v  # Define v como o novo filho direito do pai de u
+        parent[v] = pu  # Define o pai de v como o pai de u
+
+    def left_rotate(self, x):
+        """
+        Realiza uma rotação para a esquerda em torno do nó 'x'.
+        """
+        left, right, parent = self.left, self.right, self.parent  # Referências locais para os arrays
+        y = right[x]  # Armazena o filho direito de x em y
+        yl = left[y]  # Filho esquerdo de y
+        right[x] = yl  # Define o filho esquerdo de y como o filho direito de x
+        if yl != 0:  # Verifica se o filho esquerdo de y não é o nó nil
+            parent[yl] = x  # Define o pai do filho esquerdo de y como x
+        px = parent[x]  # Pai de x
+        parent[y] = px  # Define o pai de y como o pai de x
+        if px == 0:  # Verifica se x é a raiz
+            self.root = y  # Define y como a nova raiz da árvore
+        elif x == left[px]:  # Verifica se x é o filho esquerdo de seu pai
+            left[px] = y  # Define y como o novo filho esquerdo do pai de x
+        else:
+            right[px] = y  # Define y como o novo filho direito do pai de x
+        left[y] = x  # Define x como o filho esquerdo de y
+        parent[x] = y  # Define y como o novo pai de x
+
+    def right_rotate(self, x):
+        """
+        Realiza uma rotação para a direita em torno do nó 'x'.
+        """
+        left, right, parent = self.left, self.right, self.parent  # Referências locais para os arrays
+        y = left[x]  # Armazena o filho esquerdo de x em y
+        yr = right[y]  # Filho direito de y
+        left[x] = yr  # Define o filho direito de y como o novo filho esquerdo de x
+        if yr != 0:  # Verifica se o filho direito de y não é o nó nil
+            parent[yr] = x  # Define o pai do filho direito de y como x
+        px = parent[x]  # Pai de x
+        parent[y] = px  # Define o pai de y como o pai de x
+        if px == 0:  # Verifica se x é a raiz
+            self.root = y  # Define y como a nova raiz da árvore
+        elif x == right[px]:  # Verifica se x é o filho direito de seu pai
+            right[px] = y  # Define y como o novo filho direito do pai de x
+        else:
+            left[px] = y  # Define y como o novo filho esquerdo do pai de x
+        right[y] = x  # Define x como o filho direito de y
+        parent[x] = y  # Define y como o novo pai de x
+
+    def insert_fixup(self, z):
+        """
+        Corrige quaisquer violações das propriedades da árvore Rubro-Negra após a inserção do nó 'z'.
+        """
+        left, right, parent, color = self.left, self.right, self.parent, self.color  # Referências locais para os arrays
+        RED, BLACK = self.RED, self.BLACK  # Referências locais para as cores
+        while color[parent[z]] == RED:  # Enquanto a cor do pai de z for vermelha
+            p = parent[z]  # Pai de z
+            g = parent[p]  # Avô de z
+            if p == left[g]:  # Se o pai de z for o filho esquerdo do avô de z
+                y = right[g]  # y recebe o irmão do pai de z
+                if color[y] == RED:  # Se a cor de y for vermelha
+                    color[p] = BLACK  # Define a cor do pai de z como preta
+                    color[y] = BLACK  # Define a cor de y como preta
+                    color[g] = RED  # Define a cor do avô de z como vermelha
+                    z = g  # Move z para o avô de z
+                else:
+                    if z == right[p]:  # Se z for o filho direito do pai de z
+                        z = p  # Move z para o pai de z
+                        self.left_rotate(z)  # Realiza uma rotação para a esquerda em torno de z
+                        p = parent[z]  # Atualiza o pai de z após a rotação
+                    color[p] = BLACK  # Define a cor do pai de z como preta
+                    color[g] = RED  # Define a cor do avô de z como vermelha
+                    self.right_rotate(g)  # Realiza uma rotação para a direita em torno do avô de z
+            else:
+                y = left[g]  # y recebe o irmão do pai de z
+                if color[y] == RED:  # Se a cor de y for vermelha
+                    color[p] = BLACK  # Define a cor do pai de z como preta
+                    color[y] = BLACK  # Define a cor de y como preta
+                    color[g] = RED  # Define a cor do avô de z como vermelha
+                    z = g  # Move z para o avô de z
+                else:
+                    if z == left[p]:  # Se z for o filho esquerdo do pai de z
+                        z = p  # Move z para o pai de z
+                        self.right_rotate(z)  # Realiza uma rotação para a direita em torno de z
+                        p = parent[z]  # Atualiza o pai de z após a rotação
+                    color[p] = BLACK  # Define a cor do pai de z como preta
+                    color[g] = RED  # Define a cor do avô de z como vermelha
+                    self.left_rotate(g)  # Realiza uma rotação para a esquerda em torno do avô de z
+        color[self.root] = BLACK  # Define a cor da raiz como preta
+
+    def insert(self, key):
+        """
+        Insere um novo nó com a chave 'key' na árvore, garantindo que não haja inserção de chaves duplicadas.
+        """
+        keys, left, right = self.key, self.left, self.right  # Referências locais para os arrays
+        y = 0  # Inicializa 'y' como o nó nil
+        x = self.root  # Inicializa 'x' como a raiz da árvore
+        while x != 0:  # Enquanto 'x' não for o nó nil
+            y = x  # Define 'y' como 'x'
+            xk = keys[x]  # Chave de 'x'
+            if key < xk:  # Se a chave for menor que a chave de 'x'
+                x = left[x]  # 'x' se move para o filho esquerdo
+            elif key > xk:  # Se a chave for maior que a chave de 'x'
+                x = right[x]  # 'x' se move para o filho direito
+            else:
+                print(f"A chave {key} já existe na árvore. Inserção cancelada.")  # Informa ao usuário que a chave já existe
+                return  # Retorna sem fazer a inserção
+        z = self._new_node(key, y)  # Cria o novo nó 'z' com a chave 'key' e pai 'y'
+        if y == 0:  # Se 'y' for o nó nil (árvore vazia)
+            self.root = z  # 'z' se torna a nova raiz da árvore
+        elif key < keys[y]:  # Se a chave de 'z' for menor que a chave de 'y'
+            left[y] = z  # 'z' se torna o filho esquerdo de 'y'
+        else:
+            right[y] = z  # 'z' se torna o filho direito de 'y'
+        self.count += 1  # Incrementa o número de chaves da árvore
+        self.insert_fixup(z)  # Corrige as propriedades da árvore Rubro-Negra após a inserção de 'z'
+
+    def delete_fixup(self, x):
+        """
+        Corrige quaisquer violações das propriedades da árvore Rubro-Negra após a remoção do nó 'x'.
+        """
+        left, right, parent, color = self.left, self.right, self.parent, self.color  # Referências locais para os arrays
+        RED, BLACK = self.RED, self.BLACK  # Referências locais para as cores
+        while x != self.root and color[x] == BLACK:  # Enquanto x não for a raiz e a cor de x for preta
+            p = parent[x]  # Pai de x
+            if x == left[p]:  # Se x for o filho esquerdo de seu pai
+                w = right[p]  # w recebe o irmão direito de x
+                if color[w] == RED:  # Se a cor de w for vermelha
+                    color[w] = BLACK  # Define a cor de w como preta
+                    color[p] = RED  # Define a cor do pai de x como vermelha
+                    self.left_rotate(p)  # Realiza uma rotação para a esquerda em torno do pai de x
+                    w = right[p]  # Atualiza o valor de w para o novo irmão direito de x
+                if color[left[w]] == BLACK and color[right[w]] == BLACK:  # Se os dois filhos de w forem pretos
+                    color[w] = RED  # Define a cor de w como vermelha
+                    x = p  # Atualiza o valor de x para o pai de x
+                else:
+                    if color[right[w]] == BLACK:  # Se a cor do filho direito de w for preta
+                        color[left[w]] = BLACK  # Define a cor do filho esquerdo de w como preta
+                        color[w] = RED  # Define a cor de w como vermelha
+                        self.right_rotate(w)  # Realiza uma rotação para a direita em torno de w
+                        w = right[p]  # Atualiza o valor de w para o novo irmão direito de x
+                    color[w] = color[p]  # Define a cor de w como a cor do pai de x
+                    color[p] = BLACK  # Define a cor do pai de x como preta
+                    color[right[w]] = BLACK  # Define a cor do filho direito de w como preta
+                    self.left_rotate(p)  # Realiza uma rotação para a esquerda em torno do pai de x
+                    x = self.root  # Atualiza o valor de x para a raiz da árvore
+            else:
+                w = left[p]  # w recebe o irmão esquerdo de x
+                if color[w] == RED:  # Se a cor de w for vermelha
+                    color[w] = BLACK  # Define a cor de w como preta
+                    color[p] = RED  # Define a cor do pai de x como vermelha
+                    self.right_rotate(p)  # Realiza uma rotação para a direita em torno do pai de x
+                    w = left[p]  # Atualiza o valor de w para o novo irmão esquerdo de x
+                if color[right[w]] == BLACK and color[left[w]] == BLACK:  # Se os dois filhos de w forem pretos
+                    color[w] = RED  # Define a cor de w como vermelha
+                    x = p  # Atualiza o valor de x para o pai de x
+                else:
+                    if color[left[w]] == BLACK:  # Se a cor do filho esquerdo de w for preta
+                        color[right[w]] = BLACK  # Define a cor do filho direito de w como preta
+                        color[w] = RED  # Define a cor de w como vermelha
+                        self.left_rotate(w)  # Realiza uma rotação para a esquerda em torno de w
+                        w = left[p]  # Atualiza o valor de w para o novo irmão esquerdo de x
+                    color[w] = color[p]  # Define a cor de w como a cor do pai de x
+                    color[p] = BLACK  # Define a cor do pai de x como preta
+                    color[left[w]] = BLACK  # Define a cor do filho esquerdo de w como preta
+                    self.right_rotate(p)  # Realiza uma rotação para a direita em torno do pai de x
+                    x = self.root  # Atualiza o valor de x para a raiz da árvore
+        color[x] = BLACK  # Define a cor de x como preta
+
+    def minimum(self, x):
+        """
+        Retorna o índice do nó com a menor chave na subárvore enraizada no nó 'x'.
+        """
+        left = self.left  # Referência local para o array de filhos esquerdos
+        while left[x] != 0:  # Enquanto existir um filho esquerdo de x que não seja o nó nil
+            x = left[x]  # Atualiza o valor de x para o filho esquerdo de x
+        return x  # Retorna o nó com a menor chave na subárvore enraizada em x
+
+    def remove(self, key):
+        """
+        Remove o nó com a chave 'key' da árvore.
+        """
+        z = self.search(key)  # Procura o nó com a chave 'key' na árvore
+        if z == 0:  # Se o nó não for encontrado, retorna
+            return
+        self.count -= 1  # Decrementa o número de chaves da árvore
+        left, right, parent, color = self.left, self.right, self.parent, self.color  # Referências locais para os arrays
+        y = z  # Define 'y' como 'z'
+        y_original_color = color[y]  # Armazena a cor original de 'y'
+        if left[z] == 0:  # Se o filho esquerdo de 'z' for o nó nil
+            x = right[z]  # Define 'x' como o filho direito de 'z'
+            self.transplant(z, x)  # Substitui a subárvore enraizada em 'z' pela subárvore enraizada em 'z.right'
+        elif right[z] == 0:  # Se o filho direito de 'z' for o nó nil
+            x = left[z]  # Define 'x' como o filho esquerdo de 'z'
+            self.transplant(z, x)  # Substitui a subárvore enraizada em 'z' pela subárvore enraizada em 'z.left'
+        else:
+            y = self.minimum(right[z])  # Encontra o sucessor de 'z' na subárvore direita
+            y_original_color = color[y]  # Armazena a cor original de 'y'
+            x = right[y]  # Define 'x' como o filho direito de 'y'
+            if parent[y] == z:  # Se o pai de 'y' for 'z'
+                parent[x] = y  # Define o pai de 'x' como 'y'
+            else:
+                self.transplant(y, x)  # Substitui a subárvore enraizada em 'y' pela subárvore enraizada em 'y.right'
+                right[y] = right[z]  # Define o filho direito de 'y' como o filho direito de 'z'
+                parent[right[y]] = y  # Define o pai do filho direito de 'y' como 'y'
+            self.transplant(z, y)  # Substitui a subárvore enraizada em 'z' pela subárvore enraizada em 'y'
+            left[y] = left[z]  # Define o filho esquerdo de 'y' como o filho esquerdo de 'z'
+            parent[left[y]] = y  # Define o pai do filho esquerdo de 'y' como 'y'
+            color[y] = color[z]  # Define a cor de 'y' como a cor de 'z'
+        if y_original_color == self.BLACK:  # Se a cor original de 'y' for preta
+            self.delete_fixup(x)  # Corrige as propriedades da árvore Rubro-Negra após a remoção
+        self._free_node(z)  # Devolve o índice de 'z' à lista livre
+
+    def search(self, key):
+        """
+        Procura e retorna o índice do nó com a chave 'key' na árvore (0, o nó nil, se a chave não for encontrada).
+        """
+        keys, left, right = self.key, self.left, self.right  # Referências locais para os arrays
+        x = self.root  # Inicializa 'x' como a raiz da árvore
+        while x != 0:  # Enquanto 'x' não for o nó nil
+            xk = keys[x]  # Chave de 'x'
+            if key < xk:  # Se a chave for menor que a chave de 'x'
+                x = left[x]  # 'x' se move para o filho esquerdo
+            elif key > xk:  # Se a chave for maior que a chave de 'x'
+                x = right[x]  # 'x' se move para o filho direito
+            else:
+                break  # A chave foi encontrada
+        return x  # Retorna o índice encontrado ou o nó nil se a chave não for encontrada
+
+    def inorder(self, node):
+        """
+        Realiza um percurso em ordem na subárvore enraizada em 'node', imprimindo as chaves dos nós e suas cores.
+        """
+        stack = []  # Pilha com os nós cujos filhos direitos ainda não foram visitados
+        while stack or node != 0:  # Enquanto houver nós a serem visitados
+            while node != 0:  # Desce pela esquerda empilhando os nós
+                stack.append(node)
+                node = self.left[node]
+            node = stack.pop()  # Visita o nó de menor chave ainda não visitado
+            print(self.key[node], "Red" if self.color[node] == self.RED else "Black")  # Imprime a chave e a cor do nó
+            node = self.right[node]  # Passa para a subárvore direita
+
+    def check_balanced(self):
+        """
+        Verifica se a árvore está balanceada, garantindo que todos os caminhos da raiz até as folhas contenham o mesmo número de nós pretos.
+        """
+        black_count = None  # Número de nós pretos do primeiro caminho encontrado
+        stack = [(self.root, 0)]  # Pilha com os nós e a quantidade de nós pretos acima deles
+        while stack:  # Enquanto houver nós a serem visitados
+            node, current_count = stack.pop()  # Retira o próximo nó da pilha
+            if self.color[node] == self.BLACK:  # Verifica se o nó é preto
+                current_count += 1  # Incrementa o contador de nós pretos no caminho atual
+            if node == 0:  # Se o caminho chegou ao nó nil
+                if black_count is None:  # Se este for o primeiro caminho
+                    black_count = current_count  # Guarda a quantidade de nós pretos do caminho
+                elif black_count != current_count:  # Se o caminho tiver uma quantidade diferente de nós pretos
+                    return False  # Retorna False, pois os caminhos não têm o mesmo número de nós pretos
+                continue
+            stack.append((self.left[node], current_count))  # Visita o filho esquerdo
+            stack.append((self.right[node], current_count))  # Visita o filho direito
+        return True  # Retorna True se todos os caminhos tiverem o mesmo número de nós pretos
+
+class FrozenNode:
+    """
+    Nó imutável da ConcurrentRedBlackTree. Não possui ponteiro para o pai, de modo que uma subárvore pode ser
+    compartilhada por várias versões da árvore; a ausência de filho é representada por None.
+    """
+    __slots__ = ("key", "left", "right", "color")  # Dispensa o __dict__ de cada nó para reduzir o uso de memória
+
+    def __init__(self, key, left, right, color):
+        """
+        Cria um nó com uma chave, seus dois filhos e uma cor. O nó não deve ser alterado depois de criado.
+        """
+        self.key = key  # Atribui o valor da chave ao nó
+        self.left = left  # Atribui o filho esquerdo
+        self.right = right  # Atribui o filho direito
+        self.color = color  # Atribui a cor do nó
+
+def _frozen_paint(node, color):
+    """
+    Retorna uma cópia de 'node' com a cor 'color' (ou o próprio nó, se ele já tiver essa cor).
+    """
+    if node.color == color:  # Nenhuma cópia é necessária
+        return node
+    return FrozenNode(node.key, node.left, node.right, color)  # Copia o nó com a nova cor
+
+def _frozen_balance(a, key, b):
+    """
+    Cria o nó preto (a, key, b), desfazendo um nó vermelho com filho vermelho em 'a' ou em 'b' por uma rotação
+    e recoloração (a função balance de Okasaki, na forma usada por Kahrs também na remoção).
+    """
+    if a is not None and a.color == "Red":  # O filho esquerdo é vermelho
+        if b is not None and b.color == "Red":  # Os dois filhos são vermelhos: apenas recolore
+            return FrozenNode(key, _frozen_paint(a, "Black"), _frozen_paint(b, "Black"), "Red")
+        if a.left is not None and a.left.color == "Red":  # Vermelho-vermelho à esquerda da esquerda
+            return FrozenNode(a.key, _frozen_paint(a.left, "Black"), FrozenNode(key, a.right, b, "Black"), "Red")
+        if a.right is not None and a.right.color == "Red":  # Vermelho-vermelho à direita da esquerda
+            m = a.right
+            return FrozenNode(m.key, FrozenNode(a.key, a.left, m.left, "Black"), FrozenNode(key, m.right, b, "Black"), "Red")
+    if b is not None and b.color == "Red":  # O filho direito é vermelho
+        if b.right is not None and b.right.color == "Red":  # Vermelho-vermelho à direita da direita
+            return FrozenNode(b.key, FrozenNode(key, a, b.left, "Black"), _frozen_paint(b.right, "Black"), "Red")
+        if b.left is not None and b.left.color == "Red":  # Vermelho-vermelho à esquerda da direita
+            m = b.left
+            return FrozenNode(m.key, FrozenNode(key, a, m.left, "Black"), FrozenNode(b.key, m.right, b.right, "Black"), "Red")
+    return FrozenNode(key, a, b, "Black")  # Nenhuma violação
+
+def _frozen_insert(node, key):
+    """
+    Retorna a raiz de uma nova versão da subárvore 'node' com a chave 'key', que não pode estar presente.
+    Apenas os nós do caminho de busca são copiados; as demais subárvores são compartilhadas com a versão anterior.
+    """
+    if node is None:  # Posição da nova chave
+        return FrozenNode(key, None, None, "Red")
+    if key < node.key:  # Copia o caminho pela esquerda
+        if node.color == "Black":
+            return _frozen_balance(_frozen_insert(node.left, key), node.key, node.right)
+        return FrozenNode(node.key, _frozen_insert(node.left, key), node.right, "Red")
+    if node.color == "Black":  # Copia o caminho pela direita
+        return _frozen_balance(node.left, node.key, _frozen_insert(node.right, key))
+    return FrozenNode(node.key, node.left, _frozen_insert(node.right, key), "Red")
+
+def _frozen_balance_left(a, key, b):
+    """
+    Cria o nó (a, key, b) quando a altura negra de 'a' diminuiu em 1 após uma remoção, restaurando a altura.
+    """
+    if a is not None and a.color == "Red":  # Basta pintar 'a' de preto
+        return FrozenNode(key, _frozen_paint(a, "Black"), b, "Red")
+    if b.color == "Black":  # Pinta o irmão de vermelho e rebalanceia
+        return _frozen_balance(a, key, _frozen_paint(b, "Red"))
+    m = b.left  # O irmão é vermelho e seu filho esquerdo é preto
+    return FrozenNode(m.key, FrozenNode(key, a, m.left, "Black"),
+                      _frozen_balance(m.right, b.key, _frozen_paint(b.right, "Red")), "Red")
+
+def _frozen_balance_right(a, key, b):
+    """
+    Cria o nó (a, key, b) quando a altura negra de 'b' diminuiu em 1 após uma remoção, restaurando a altura.
+    """
+    if b is not None and b.color == "Red":  # Basta pintar 'b' de preto
+        return FrozenNode(key, a, _frozen_paint(b, "Black"), "Red")
+    if a.color == "Black":  # Pinta o irmão de vermelho e rebalanceia
+        return _frozen_balance(_frozen_paint(a, "Red"), key, b)
+    m = a.right  # O irmão é vermelho e seu filho direito é preto
+    return FrozenNode(m.key, _frozen_balance(_frozen_paint(a.left, "Red"), a.key, m.left),
+                      FrozenNode(key, m.right, b, "Black"), "Red")
+
+def _frozen_append(a, b):
+    """
+    Junta as subárvores irmãs 'a' e 'b' (todas as chaves de 'a' menores que as de 'b') depois da remoção do pai.
+    """
+    if a is None:  # Se um dos lados for vazio, o resultado é o outro
+        return b
+    if b is None:
+        return a
+    if a.color == "Red" and b.color == "Red":  # Dois nós vermelhos
+        m = _frozen_append(a.right, b.left)
+        if m is not None and m.color == "Red":
+            return FrozenNode(m.key, FrozenNode(a.key, a.left, m.left, "Red"), FrozenNode(b.key, m.right, b.right, "Red"), "Red")
+        return FrozenNode(a.key, a.left, FrozenNode(b.key, m, b.right, "Red"), "Red")
+    if a.color == "Black" and b.color == "Black":  # Dois nós pretos
+        m = _frozen_append(a.right, b.left)
+        if m is not None and m.color == "Red":
+            return FrozenNode(m.key, FrozenNode(a.key, a.left, m.left, "Black"), FrozenNode(b.key, m.right, b.right, "Black"), "Red")
+        return _frozen_balance_left(a.left, a.key, FrozenNode(b.key, m, b.right, "Black"))
+    if b.color == "Red":  # Apenas 'b' é vermelho
+        return FrozenNode(b.key, _frozen_append(a, b.left), b.right, "Red")
+    return FrozenNode(a.key, a.left, _frozen_append(a.right, b), "Red")  # Apenas 'a' é vermelho
+
+def _frozen_delete(node, key):
+    """
+    Retorna a raiz de uma nova versão da subárvore 'node' sem a chave 'key', que deve estar presente
+    (remoção de Kahrs). Assim como na inserção, apenas os nós do caminho são copiados.
+    """
+    if key < node.key:  # A chave está à esquerda
+        if node.left.color == "Black":  # A altura negra da esquerda diminui
+            return _frozen_balance_left(_frozen_delete(node.left, key), node.key, node.right)
+        return FrozenNode(node.key, _frozen_delete(node.left, key), node.right, "Red")
+    if node.key < key:  # A chave está à direita
+        if node.right.color == "Black":  # A altura negra da direita diminui
+            return _frozen_balance_right(node.left, node.key, _frozen_delete(node.right, key))
+        return FrozenNode(node.key, node.left, _frozen_delete(node.right, key), "Red")
+    return _frozen_append(node.left, node.right)  # Remove o nó juntando seus filhos
+
+class TreeSnapshot:
+    """
+    Versão imutável de uma ConcurrentRedBlackTree. Como nenhum nó é alterado depois de publicado, buscas e varreduras
+    sobre um snapshot não precisam de trava e enxergam sempre o mesmo conjunto de chaves, mesmo durante escritas.
+    """
+    __slots__ = ("root", "count")  # Raiz da versão e número de chaves
+
+    def __init__(self, root, count):
+        """
+        Cria o snapshot com a raiz 'root' (None se vazio) e 'count' chaves.
+        """
+        self.root = root  # Raiz da versão
+        self.count = count  # Número de chaves da versão
+
+    def __len__(self):
+        """
+        Retorna o número de chaves do snapshot.
+        """
+        return self.count
+
+    def search(self, key):
+        """
+        Procura e retorna o nó com a chave 'key' no snapshot, ou None se a chave não estiver presente.
+        """
+        x = self.root  # Começa pela raiz
+        while x is not None:  # Desce até uma folha
+            if key < x.key:
+                x = x.left
+            elif x.key < key:
+                x = x.right
+            else:
+                return x  # Retorna o nó encontrado
+        return None  # A chave não está presente
+
+    def __contains__(self, key):
+        """
+        Verifica se a chave 'key' está no snapshot.
+        """
+        return self.search(key) is not None
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera as chaves do intervalo fechado [lo, hi] (None indica sem limite) em ordem crescente,
+        ou decrescente se 'reverse' for True, com custo O(log n + k).
+        """
+        stack = []  # Pilha com os ancestrais ainda não visitados
+        x = self.root  # Começa pela raiz
+        while True:
+            while x is not None:  # Desce em direção à primeira chave do intervalo
+                if not reverse:
+                    if lo is not None and x.key < lo:  # x e sua subárvore esquerda estão antes do intervalo
+                        x = x.right
+                    else:
+                        stack.append(x)
+                        x = x.left
+                else:
+                    if hi is not None and hi < x.key:  # x e sua subárvore direita estão depois do intervalo
+                        x = x.left
+                    else:
+                        stack.append(x)
+                        x = x.right
+            if not stack:  # Não há mais chaves
+                return
+            x = stack.pop()  # Próxima chave em ordem
+            if (hi is not None and not reverse and hi < x.key) or (lo is not None and reverse and x.key < lo):
+                return  # Saiu do intervalo
+            yield x.key
+            x = x.left if reverse else x.right  # Passa para a subárvore seguinte
+
+    def keys(self):
+        """
+        Gera as chaves do snapshot em ordem crescente.
+        """
+        return self.iter_range()
+
+    def __iter__(self):
+        """
+        Permite iterar diretamente sobre as chaves do snapshot em ordem crescente.
+        """
+        return self.iter_range()
+
+    def validate(self):
+        """
+        Verifica, sem recursão, a ordem das chaves, a raiz preta, a ausência de nó vermelho com filho vermelho,
+        a mesma altura negra em todos os caminhos e o número de chaves.
+        Retorna None se o snapshot for válido, ou uma tupla (nó, motivo) com o primeiro nó que viola alguma propriedade.
+        """
+        if self.root is not None and self.root.color != "Black":  # A raiz é preta
+            return self.root, "a raiz não é preta"
+        count = 0  # Quantidade de nós visitados
+        heights = []  # Alturas negras das subárvores já verificadas
+        stack = [(self.root, None, None, False)]  # Pilha com (nó, limite inferior, limite superior, filhos já verificados)
+        while stack:  # Percorre a árvore em pós-ordem
+            node, lo, hi, done = stack.pop()
+            if node is None:  # Uma folha tem altura negra 0
+                heights.append(0)
+                continue
+            if not done:  # Primeira visita: verifica as propriedades locais e agenda os filhos
+                if (lo is not None and not lo < node.key) or (hi is not None and not node.key < hi):
+                    return node, f"a chave {node.key} está fora do intervalo ({lo}, {hi}) imposto pelos ancestrais"
+                if node.color == "Red" and any(c is not None and c.color == "Red" for c in (node.left, node.right)):
+                    return node, "nó vermelho com filho vermelho"
+                count += 1
+                stack.append((node, lo, hi, True))
+                stack.append((node.right, node.key, hi, False))
+                stack.append((node.left, lo, node.key, False))
+            else:  # Segunda visita: compara as alturas negras dos filhos
+                right = heights.pop()
+                left = heights.pop()
+                if left != right:
+                    return node, f"alturas negras diferentes nas subárvores esquerda ({left}) e direita ({right})"
+                heights.append(left + (node.color == "Black"))
+        if count != self.count:  # O contador deve corresponder aos nós
+            return self.root, f"o snapshot contém {count} nós, mas o contador indica {self.count}"
+        return None  # O snapshot é válido
+
+class ConcurrentRedBlackTree:
+    """
+    Árvore Rubro-Negra para uso compartilhado entre threads, com cópia de caminho (path copying).
+    Os nós são imutáveis: insert e remove copiam apenas os O(log n) nós do caminho alterado, compartilham o restante
+    com a versão anterior e publicam a nova versão trocando uma única referência. As escritas são serializadas por uma
+    trava, mas as leituras não usam trava: snapshot() retorna a versão atual, que nunca é alterada, e search e
+    iter_range sobre ela não são bloqueadas por escritas nem enxergam uma escrita pela metade.
+    """
+
+    def __init__(self):
+        """
+        Cria a árvore vazia.
+        """
+        self._lock = threading.Lock()  # Trava que serializa as escritas
+        self._snapshot = TreeSnapshot(None, 0)  # Versão publicada da árvore
+
+    @classmethod
+    def from_iterable(cls, keys):
+        """
+        Cria uma árvore perfeitamente balanceada, em tempo linear, a partir de um iterável de chaves.
+        """
+        keys = sorted(set(keys))  # Remove as duplicatas e ordena as chaves uma única vez
+        red_depth = (len(keys) + 1).bit_length() - 1  # Profundidade do último nível incompleto, como em _build_balanced
+
+        def build(lo, hi, depth):  # A recursão tem profundidade O(log n)
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2  # A chave do meio se torna a raiz da subárvore
+            return FrozenNode(keys[mid], build(lo, mid, depth + 1), build(mid + 1, hi, depth + 1),
+                              "Red" if depth == red_depth else "Black")
+
+        tree = cls()  # Cria a árvore vazia
+        gc_enabled = gc.isenabled()  # Guarda o estado do coletor de lixo
+        gc.disable()  # Evita coletas repetidas durante a criação dos nós
+        try:
+            tree._snapshot = TreeSnapshot(build(0, len(keys), 0), len(keys))  # Publica a versão construída
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return tree  # Retorna a árvore construída
+
+    def snapshot(self):
+        """
+        Retorna a versão atual da árvore (TreeSnapshot), sem trava. A leitura de um atributo é atômica,
+        e a versão retornada permanece válida e inalterada independentemente das escritas seguintes.
+        """
+        return self._snapshot
+
+    def insert(self, key):
+        """
+        Insere a chave 'key' e publica a nova versão. Retorna False, sem alterar a árvore, se a chave já existir.
+        """
+        with self._lock:  # Uma escrita por vez
+            current = self._snapshot  # Versão sobre a qual a escrita é feita
+            if current.search(key) is not None:  # A chave já existe
+                return False
+            root = _frozen_paint(_frozen_insert(current.root, key), "Black")  # Copia o caminho e pinta a raiz de preto
+            self._snapshot = TreeSnapshot(root, current.count + 1)  # Publica a nova versão de uma só vez
+            return True
+
+    def remove(self, key):
+        """
+        Remove a chave 'key' e publica a nova versão. Retorna False, sem alterar a árvore, se a chave não existir.
+        """
+        with self._lock:  # Uma escrita por vez
+            current = self._snapshot  # Versão sobre a qual a escrita é feita
+            if current.search(key) is None:  # A remoção de Kahrs exige que a chave esteja presente
+                return False
+            root = _frozen_delete(current.root, key)  # Copia o caminho sem a chave
+            if root is not None:
+                root = _frozen_paint(root, "Black")  # A raiz é sempre preta
+            self._snapshot = TreeSnapshot(root, current.count - 1)  # Publica a nova versão de uma só vez
+            return True
+
+    def __len__(self):
+        """
+        Retorna o número de chaves da versão atual.
+        """
+        return len(self._snapshot)
+
+    def __contains__(self, key):
+        """
+        Verifica, sem trava, se a chave 'key' está na versão atual.
+        """
+        return key in self._snapshot
+
+    def search(self, key):
+        """
+        Procura, sem trava, o nó com a chave 'key' na versão atual e o retorna (ou None).
+        """
+        return self._snapshot.search(key)
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera, sem trava, as chaves do intervalo fechado [lo, hi] da versão atual no momento da chamada.
+        """
+        return self._snapshot.iter_range(lo, hi, reverse)
+
+    def __iter__(self):
+        """
+        Permite iterar sobre as chaves da versão atual no momento da chamada.
+        """
+        return self._snapshot.iter_range()
+
+def layout(tree, max_depth=None):
+    """
+    Calcula a disposição da árvore para a plotagem em uma única passada iterativa em ordem, sem recursão.
+    A coordenada x de cada nó é sua posição no percurso em ordem e a coordenada y é o oposto de sua profundidade,
+    de modo que a largura cresce linearmente com o número de nós. Se 'max_depth' for informado, as subárvores abaixo
+    dessa profundidade são resumidas em um único nó cinza rotulado com a quantidade de nós que contém.
+    Retorna um dicionário com as listas 'x', 'y', 'colors', 'labels' e 'edges' (pares de índices pai e filho).
+    """
+    nil = tree.nil  # Referência local para o nó nil
+    xs, ys, colors, labels, edges = [], [], [], [], []  # Dados de cada nó desenhado
+    slot = 0  # Próxima posição horizontal livre
+    stack = []  # Pilha com (nó, profundidade, índice) dos nós cuja subárvore direita ainda não foi visitada
+    node, depth, parent = tree.root, 0, -1  # Começa pela raiz da árvore
+    while True:
+        while node != nil:  # Desce pela esquerda registrando os nós
+            i = len(xs)  # Índice do nó nos dados da disposição
+            xs.append(0)  # A posição horizontal é definida quando o nó é visitado em ordem
+            ys.append(-depth)  # A posição vertical é o oposto da profundidade
+            if parent >= 0:  # Liga o nó ao seu pai
+                edges.append((parent, i))
+            if max_depth is not None and depth >= max_depth and (node.left != nil or node.right != nil):  # Subárvore resumida
+                xs[i] = slot  # O resumo ocupa uma única posição horizontal
+                slot += 1
+                colors.append("lightgray")  # Nós de resumo são cinza
+                labels.append(f"+{_subtree_size(tree, node)}")  # Rotula o resumo com a quantidade de nós
+                node = nil  # Não desce na subárvore resumida
+                break
+            colors.append("red" if node.color == "Red" else "black")  # Cor do nó na plotagem
+            labels.append(str(node.key))  # Rótulo com a chave do nó
+            stack.append((node, depth, i))  # Guarda o nó para visitá-lo após a subárvore esquerda
+            node, depth, parent = node.left, depth + 1, i  # Passa para o filho esquerdo
+        if not stack:  # Todos os nós foram visitados
+            break
+        visited, visited_depth, i = stack.pop()  # Visita o nó de menor chave ainda não visitado
+        xs[i] = slot  # Define sua posição horizontal pela ordem do percurso
+        slot += 1
+        node, depth, parent = visited.right, visited_depth + 1, i  # Passa para a subárvore direita
+    return {"x": xs, "y": ys, "colors": colors, "labels": labels, "edges": edges}
+
+def _subtree_size(tree, node):
+    """
+    Retorna a quantidade de nós da subárvore enraizada em 'node' (em O(1) se a árvore mantiver estatísticas de ordem).
+    """
+    if tree.order_statistics:  # O tamanho da subárvore já é mantido no nó
+        return node.size
+    count = 0  # Quantidade de nós encontrados
+    stack = [node]  # Pilha com os nós a serem contados
+    while stack:  # Enquanto houver nós a serem contados
+        x = stack.pop()
+        if x != tree.nil:  # Ignora o nó nil
+            count += 1
+            stack.append(x.left)
+            stack.append(x.right)
+    return count  # Retorna a quantidade de nós
+
+def _draw(ax, positions, labels=None):
+    """
+    Desenha a disposição calculada por 'layout' nos eixos 'ax'. Se 'labels' for None, os rótulos só são desenhados
+    em árvores com até 100 nós.
+    """
+    from matplotlib.collections import LineCollection  # O Matplotlib só é importado quando a árvore é desenhada
+    n = len(positions["x"])  # Quantidade de nós desenhados
+    x = np.asarray(positions["x"], dtype=float)  # Posições horizontais
+    y = np.asarray(positions["y"], dtype=float)  # Posições verticais
+    if positions["edges"]:  # Desenha todas as arestas de uma só vez
+        edges = np.asarray(positions["edges"])  # Pares de índices pai e filho
+        segments = np.stack([np.column_stack([x[edges[:, 0]], y[edges[:, 0]]]),
+                             np.column_stack([x[edges[:, 1]], y[edges[:, 1]]])], axis=1)  # Segmentos das arestas
+        ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.5 if n > 1000 else 1, zorder=1))
+    node_size = 500 if n <= 100 else max(1, 50000 / n)  # Tamanho dos nós, reduzido em árvores grandes
+    ax.scatter(x, y, s=node_size, c=positions["colors"], edgecolors="black" if n <= 1000 else "none", zorder=2)
+    if labels is None:  # Por padrão, rotula apenas árvores pequenas
+        labels = n <= 100
+    if labels:  # Desenha o rótulo de cada nó
+        for xi, yi, label, color in zip(x, y, positions["labels"], positions["colors"]):
+            ax.text(xi, yi, label, ha="center", va="center", fontsize=8,
+                    color="black" if color == "lightgray" else "white", zorder=3)
+    ax.set_title("Árvore Rubro-Negra")  # Define o título da plotagem
+    ax.set_axis_off()  # Esconde os eixos
+    ax.autoscale_view()  # Ajusta os limites aos nós desenhados
+
+def plot(tree, path=None, max_depth=None, labels=None, dpi=100):
+    """
+    Função para plotar a árvore Rubro-Negra usando o Matplotlib.
+    Se 'path' for informado, a imagem é gravada diretamente no arquivo (o formato, como PNG ou SVG, vem da extensão)
+    sem abrir janelas, o que permite usá-la em servidores sem display. Caso contrário, a plotagem é exibida.
+    'max_depth' limita a profundidade desenhada, resumindo as subárvores mais profundas (veja 'layout').
+    """
+    positions = layout(tree, max_depth)  # Calcula a disposição dos nós
+    width = min(max(6, len(positions["x"]) * 0.3), 200)  # Largura da figura proporcional à quantidade de nós
+    height = min(max(4, (1 - min(positions["y"], default=0)) * 0.8), 50)  # Altura proporcional à profundidade
+    if path is not None:  # Grava a imagem sem usar o pyplot, que depende de um display
+        from matplotlib.figure import Figure  # O Matplotlib só é importado quando a árvore é desenhada
+        fig = Figure(figsize=(width, height))  # Cria a figura
+        _draw(fig.add_subplot(), positions, labels)  # Desenha a árvore
+        fig.savefig(path, dpi=dpi, bbox_inches="tight")  # Grava a imagem
+        return
+    import matplotlib.pyplot as plt  # O pyplot só é importado quando a plotagem é exibida
+    fig = plt.figure(figsize=(min(width, 20), min(height, 12)))  # Cria a figura interativa
+    _draw(fig.add_subplot(), positions, labels)  # Desenha a árvore
+    plt.show()  # Exibe a plotagem
+
+def interface():
+    """
+    Função para interagir com a árvore Rubro-Negra, permitindo ao usuário inserir e remover nós, verificar se a árvore está balanceada e plotar a árvore.
+    """
+    rb_tree = RedBlackTree()  # Cria uma nova instância da classe RedBlackTree
+    while True:  # Loop infinito
+        print("\nÁrvore Rubro-Negra:")
+        rb_tree.inorder(rb_tree.root)  # Realiza um percurso em ordem na árvore e imprime as chaves e cores dos nós
+        print("\n1 - Inserir nó")
+        print("2 - Remover nó")
+        print("3 - Verificar se a árvore está balanceada")
+        print("4 - Plotar a árvore Rubro-Negra")
+        print("5 - Sair")
+        option = input("Escolha uma opção: ")  # Solicita ao usuário que escolha uma opção
+        if option == "1":  # Se a opção escolhida for inserir um nó
+            key = int(input("Digite a chave do nó a ser inserido: "))  # Solicita ao usuário que digite a chave do nó a ser inserido
+            rb_tree.insert(key)  # Insere o nó com a chave digitada na árvore
+        elif option == "2":  # Se a opção escolhida for remover um nó
+            key = int(input("Digite a chave do nó a ser removido: "))  # Solicita ao usuário que digite a chave do nó a ser removido
+            rb_tree.remove(key)  # Remove o nó com a chave digitada da árvore
+        elif option == "3":  # Se a opção escolhida for verificar se a árvore está balanceada
+            print("A árvore está balanceada:", rb_tree.check_balanced())  # Verifica se a árvore está balanceada e imprime o resultado
+        elif option == "4":  # Se a opção escolhida for plotar a árvore Rubro-Negra
+            plot(rb_tree)  # Chama a função para plotar a árvore
+        elif option == "5":  # Se a opção escolhida for sair
+            break  # Sai do loop
+        else:
+            print("Opção inválida. Tente novamente.")  # Imprime uma mensagem de erro se a opção escolhida for inválida
+
+def _parse_key(token):
+    """
+    Converte o texto 'token' em uma chave inteira ou, se não for um inteiro, de ponto flutuante.
+    """
+    try:
+        return int(token)  # Chaves inteiras, como na interface interativa
+    except ValueError:
+        pass
+    try:
+        return float(token)  # Chaves de ponto flutuante
+    except ValueError:
+        raise ValueError(f"chave inválida {token!r}") from None
+
+def run_script(lines, tree=None, out=None, flush_every=4096):
+    """
+    Executa sobre 'tree' (uma nova RedBlackTree se for None) as operações de 'lines', uma por linha:
+    "insert K", "remove K", "search K" (escreve True ou False), "range LO HI" (escreve as chaves do intervalo
+    fechado, separadas por espaços) e "balanced" (escreve o resultado de check_balanced). Linhas vazias e
+    iniciadas por '#' são ignoradas, e inserções de chaves já presentes são descartadas sem mensagem.
+    Ao contrário da interface, a árvore não é impressa a cada operação, e as respostas são escritas em 'out'
+    (a saída padrão se for None) em blocos de 'flush_every' linhas. Lança ValueError indicando a linha inválida.
+    Retorna a árvore.
+    """
+    tree = RedBlackTree() if tree is None else tree  # Árvore sobre a qual as operações são executadas
+    out = sys.stdout if out is None else out  # Destino das respostas
+    nil = tree.nil  # Referência local para o nó nil
+    pending = []  # Respostas ainda não escritas
+    for number, line in enumerate(lines, 1):  # Lê as operações uma a uma, sem carregar o arquivo inteiro
+        parts = line.split()  # Separa o comando dos argumentos
+        if not parts or parts[0].startswith("#"):  # Ignora linhas vazias e comentários
+            continue
+        command = parts[0]
+        try:
+            if command == "insert" and len(parts) == 2:  # Inserção em uma única descida, sem mensagem para duplicatas
+                key = _parse_key(parts[1])
+                x, parent, left = tree._locate(key)
+                if x == nil:
+                    tree._attach(tree.NODE(key), parent, left)
+            elif command == "remove" and len(parts) == 2:
+                tree.remove(_parse_key(parts[1]))
+            elif command == "search" and len(parts) == 2:
+                pending.append("True" if tree.search(_parse_key(parts[1])) != nil else "False")
+            elif command == "range" and len(parts) == 3:
+                pending.append(" ".join(map(str, tree.iter_range(_parse_key(parts[1]), _parse_key(parts[2])))))
+            elif command == "balanced" and len(parts) == 1:
+                pending.append(str(tree.check_balanced()))
+            else:
+                raise ValueError(f"comando inválido {line.strip()!r}")
+        except ValueError as error:  # Indica a linha da operação inválida
+            raise ValueError(f"Linha {number}: {error}") from None
+        if len(pending) >= flush_every:  # Escreve as respostas em blocos
+            out.write("\n".join(pending) + "\n")
+            pending.clear()
+    if pending:  # Escreve as respostas restantes
+        out.write("\n".join(pending) + "\n")
+    return tree  # Retorna a árvore
+
+def main(argv=None):
+    """
+    Ponto de entrada da linha de comando: sem argumentos, inicia a interface interativa; com '--script ARQUIVO'
+    (ou '--script -' para a entrada padrão), executa as operações do arquivo com run_script.
+    """
+    parser = argparse.ArgumentParser(description="Árvore Rubro-Negra: interface interativa ou execução de um script de operações.")
+    parser.add_argument("--script", metavar="ARQUIVO",
+                        help="arquivo com uma operação por linha (insert K, remove K, search K, range LO HI, balanced); "
+                             "'-' lê da entrada padrão")
+    args = parser.parse_args(argv)
+    if args.script is None:  # Sem script, usa a interface interativa
+        interface()
+        return 0
+    source = sys.stdin if args.script == "-" else open(args.script)  # Arquivo de operações
+    try:
+        run_script(source)  # Executa as operações
+    except ValueError as error:  # Informa a linha inválida
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
 
-interface()  # Chama a função 'interface' para iniciar a interação com a árvore Rubro-Negra
\ No newline at end of file
+if __name__ == "__main__":  # Executa a linha de comando apenas quando o arquivo é executado diretamente
+    sys.exit(main())  # Chama a função 'main' e usa o seu retorno como código de saída